@@ -0,0 +1,64 @@
+"""
+Compares the decoders of `pyergast.decode` on a synthetic page of 1000 race results, the largest page
+the API serves: time to decode, and peak memory of the body and the decoded payload together.
+Run with `python benchmarks/bench_decode.py`.
+"""
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import payloads  # noqa: E402
+from pyergast import decode  # noqa: E402
+
+
+def page(rows=1000):
+    payload = payloads.races('Results', seasons=1, rounds=rows // 20)
+    payload['MRData'].update({'limit': str(rows), 'offset': '0', 'total': str(rows)})
+    return json.dumps(payload).encode()
+
+
+def buffered(name):
+    # The whole body is held in memory, then decoded in one go
+    def parse(body):
+        return decode.DECODERS[name](bytes(body))
+    return parse
+
+
+def streamed(body):
+    # The body is read in small chunks, as from the socket of a response
+    return decode.stream(io.BytesIO(body))
+
+
+def measure(parse, body, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(body)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def main(repeat=20):
+    body = page()
+    cases = [(name, buffered(name)) for name in decode.DECODERS]
+    if decode.ijson is not None:
+        cases.append(('ijson stream', streamed))
+    print('page of 1000 results, {:.1f} MB'.format(len(body) / 2 ** 20))
+    print('{:<14} {:>8} {:>10}'.format('decoder', 'ms', 'peak MB'))
+    for name, parse in cases:
+        best, peak = measure(parse, body, repeat)
+        print('{:<14} {:>8.1f} {:>10.1f}'.format(name, best * 1000, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Compares the columnar flattener of `pyergast.flatten` and the typed frames of `pyergast.schema` with the
+row-by-row parsing into string columns they replaced, on synthetic multi-season payloads.
+Run with `python benchmarks/bench_flatten.py`.
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import payloads  # noqa: E402
+from pyergast import pyergast, schema  # noqa: E402
+
+
+def legacy_races(payload, key):
+    result_dict = []
+    for race in payload["MRData"]['RaceTable']['Races']:
+        for driver in race[key]:
+            drive_dict = pyergast.unpack_lists(driver)
+            driver_info = drive_dict[0]
+            constructor_info = drive_dict[1]
+            driver['season'] = int(race['season'])
+            driver['round'] = int(race['round'])
+            driver['driver'] = driver_info['givenName'] + ' ' + driver_info['familyName']
+            driver['driverID'] = driver_info['driverId']
+            driver['nationality'] = driver_info['nationality']
+            driver['constructor'] = constructor_info['name']
+            driver['constructorID'] = constructor_info['constructorId']
+            result_dict.append(driver)
+    return result_dict
+
+
+def legacy_race_result(payload):
+    cols = ['season', 'round', 'number', 'position', 'positionText', 'grid', 'points', 'driverID', 'driver',
+            'nationality', 'constructorID', 'constructor', 'laps', 'status', 'Time']
+    return pd.DataFrame(legacy_races(payload, 'Results'), columns=cols)
+
+
+def legacy_qualifying_result(payload):
+    result_dict = legacy_races(payload, 'QualifyingResults')
+    cols = ['season', 'round', 'number', 'position', 'driverID', 'driver', 'nationality', 'constructorID',
+            'constructor', 'Q1']
+    if any('Q2' in driver for driver in result_dict):
+        cols.append('Q2')
+    if any('Q3' in driver for driver in result_dict):
+        cols.append('Q3')
+    return pd.DataFrame(result_dict, columns=cols)
+
+
+def legacy_query_driver(payload):
+    seasons = payload['MRData']['StandingsTable']['StandingsLists']
+    for season in seasons:
+        for key, value in season['DriverStandings'][0].items():
+            season[key] = value
+        season['driver'] = season['Driver']['givenName'] + ' ' + season['Driver']['familyName']
+        season['nationality'] = season['Driver']['nationality']
+        season['constructorID'] = season['Constructors'][0]['constructorId']
+        season['constructor'] = season['Constructors'][0]['name']
+        del season['DriverStandings']
+        del season['Driver']
+        del season['Constructors']
+    return pd.DataFrame(seasons)
+
+
+def typed(frame, dataset):
+    # The legacy frame with the types of the current one, to check that both hold the same values
+    if 'Time' in frame:
+        frame = frame.assign(Time=frame['Time'].map(lambda time: time['millis'] if isinstance(time, dict) else None))
+    return schema.apply(frame, dataset)
+
+
+CASES = [
+    ('race results, 70 seasons', 'results', payloads.races('Results', seasons=70), legacy_race_result,
+     lambda payload: pyergast._race_result_frame(payload, season=True)),
+    ('qualifying, 25 seasons', 'qualifying', payloads.races('QualifyingResults', seasons=25),
+     legacy_qualifying_result, lambda payload: pyergast._qualifying_result_frame(payload, season=True)),
+    ('driver history, 50 seasons', 'driver_standings', payloads.driver_history(50), legacy_query_driver,
+     pyergast._query_driver_frame),
+]
+
+
+def best(parse, payload, repeat):
+    # Best time of `repeat` runs, each on a fresh copy of the payload, excluding the copy
+    times = []
+    for _ in range(repeat):
+        fresh = payloads.fresh(payload)
+        start = time.perf_counter()
+        frame = parse(fresh)
+        times.append(time.perf_counter() - start)
+    return min(times), frame
+
+
+def main(repeat=5):
+    print('{:<28} {:>10} {:>12} {:>8} {:>10} {:>10}'.format('case', 'legacy ms', 'columnar ms', 'speedup',
+                                                             'legacy MB', 'typed MB'))
+    for name, dataset, payload, legacy, columnar in CASES:
+        before, expected = best(legacy, payload, repeat)
+        after, frame = best(columnar, payload, repeat)
+        pd.testing.assert_frame_equal(frame, typed(expected, dataset))
+        memory = [frame.memory_usage(deep=True).sum() / 2 ** 20 for frame in (expected, frame)]
+        print('{:<28} {:>10.1f} {:>12.1f} {:>7.1f}x {:>10.1f} {:>10.1f}'.format(
+            name, before * 1000, after * 1000, before / after, *memory))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Synthetic Ergast payloads, shaped like the API responses, for benchmarking without network access.
+"""
+import copy
+
+
+def driver(number):
+    return {'driverId': 'driver{}'.format(number), 'permanentNumber': str(number), 'code': 'D{:02d}'.format(number),
+            'url': 'http://en.wikipedia.org/wiki/Driver_{}'.format(number), 'givenName': 'Given{}'.format(number),
+            'familyName': 'Family{}'.format(number), 'dateOfBirth': '1985-01-07', 'nationality': 'British'}
+
+
+def constructor(number):
+    return {'constructorId': 'team{}'.format(number), 'url': 'http://en.wikipedia.org/wiki/Team_{}'.format(number),
+            'name': 'Team {}'.format(number), 'nationality': 'British'}
+
+
+def result(position):
+    result = {'number': str(position), 'position': str(position), 'positionText': str(position),
+              'points': str(max(26 - position, 0)), 'Driver': driver(position),
+              'Constructor': constructor(position // 2), 'grid': str(position), 'laps': '58', 'status': 'Finished',
+              'FastestLap': {'rank': str(position), 'lap': '42', 'Time': {'time': '1:25.580'},
+                             'AverageSpeed': {'units': 'kph', 'speed': '223.075'}}}
+    if position <= 10:
+        result['Time'] = {'millis': str(5373283 + position * 1000), 'time': '+{}.000'.format(position)}
+    return result
+
+
+def qualifying(position):
+    result = {'number': str(position), 'position': str(position), 'Driver': driver(position),
+              'Constructor': constructor(position // 2), 'Q1': '1:23.{:03d}'.format(position)}
+    if position <= 15:
+        result['Q2'] = '1:22.{:03d}'.format(position)
+    if position <= 10:
+        result['Q3'] = '1:21.{:03d}'.format(position)
+    return result
+
+
+def races(key, seasons=10, rounds=20, drivers=20):
+    """
+    A RaceTable payload with `seasons * rounds` races of `drivers` results each, under `key`
+    ('Results' or 'QualifyingResults').
+    """
+    record = result if key == 'Results' else qualifying
+    races = [{'season': str(2000 + season), 'round': str(race), 'raceName': 'Grand Prix {}'.format(race),
+              key: [record(position) for position in range(1, drivers + 1)]}
+             for season in range(seasons) for race in range(1, rounds + 1)]
+    return {'MRData': {'total': str(len(races) * drivers), 'RaceTable': {'Races': races}}}
+
+
+def driver_standings(drivers=20):
+    standings = [{'position': str(position), 'positionText': str(position), 'points': str(300 - position),
+                  'wins': '0', 'Driver': driver(position), 'Constructors': [constructor(position // 2)]}
+                 for position in range(1, drivers + 1)]
+    return {'MRData': {'StandingsTable': {'StandingsLists': [{'season': '2020', 'round': '17',
+                                                              'DriverStandings': standings}]}}}
+
+
+def driver_history(seasons=50):
+    lists = [{'season': str(1970 + season), 'round': '16',
+              'DriverStandings': driver_standings(1)['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']}
+             for season in range(seasons)]
+    return {'MRData': {'StandingsTable': {'StandingsLists': lists}}}
+
+
+def constructor_history(seasons=70):
+    lists = [{'season': str(1950 + season), 'round': '16',
+              'ConstructorStandings': [{'position': '1', 'positionText': '1', 'points': '150', 'wins': '6',
+                                        'Constructor': constructor(1)}]}
+             for season in range(seasons)]
+    return {'MRData': {'total': str(seasons), 'StandingsTable': {'StandingsLists': lists}}}
+
+
+def drivers(count=850):
+    return {'MRData': {'total': str(count), 'DriverTable': {'Drivers': [driver(number) for number in range(count)]}}}
+
+
+def laps(count=60, drivers=20):
+    """
+    A RaceTable payload with a single race of `count` laps, timed for `drivers` drivers each.
+    """
+    laps = [{'number': str(lap), 'Timings': [{'driverId': 'driver{}'.format(position), 'position': str(position),
+                                              'time': '1:{:02d}.{:03d}'.format(30 + position, lap)}
+                                             for position in range(1, drivers + 1)]}
+            for lap in range(1, count + 1)]
+    return {'MRData': {'total': str(count * drivers),
+                       'RaceTable': {'Races': [{'season': '2019', 'round': '1', 'Laps': laps}]}}}
+
+
+def pit_stops(drivers=20, stops=3):
+    stops = [{'driverId': 'driver{}'.format(position), 'lap': str(stop * 15 + position % 5), 'stop': str(stop),
+              'time': '15:{:02d}:{:02d}'.format(stop * 15, position), 'duration': '2{}.{:03d}'.format(stop, position)}
+             for stop in range(1, stops + 1) for position in range(1, drivers + 1)]
+    return {'MRData': {'total': str(len(stops)),
+                       'RaceTable': {'Races': [{'season': '2019', 'round': '1', 'PitStops': stops}]}}}
+
+
+def fresh(payload):
+    """
+    A deep copy of a payload, since the legacy parsers modify the payload they are given.
+    """
+    return copy.deepcopy(payload)
@@ -0,0 +1,192 @@
+"""
+Benchmarks of the public functions, stage by stage, from a single round up to the full history.
+Requires pytest-benchmark: `pip install pytest-benchmark`.
+
+Each endpoint is timed separately for
+    decode: the JSON body to Python objects, see `pyergast.decode`
+    normalize: the decoded payload to one list of values per column, see `pyergast.flatten`
+    frame: the columns to a typed DataFrame, see `pyergast.schema`
+and the peak memory of the three stages together is recorded in the `peak_mb` extra info.
+`test_fetch` times each function end to end against the recording served by `pyergast.replay`.
+
+Compare the working tree against the committed baseline, failing on a 10% slowdown:
+    pytest benchmarks --benchmark-compare=benchmarks/baseline.json --benchmark-compare-fail=mean:10%
+or, on another machine, record a baseline of its own first:
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+import json
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import pandas as pd  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import payloads  # noqa: E402
+from pyergast import decode, flatten, pyergast, reference, replay, schema  # noqa: E402
+
+
+def races(key, spec, dataset, optional=(), season=True):
+    # A single round is built without the season and round columns, like the functions do
+    parent_spec = pyergast._RACE_COLUMNS if season else None
+
+    def normalize(payload):
+        return flatten.nested_columns(payload['MRData']['RaceTable']['Races'], key, spec, parent_spec)
+
+    def frame(columns):
+        return flatten._frame(columns, optional, dataset)
+    return normalize, frame
+
+
+def laps():
+    def normalize(payload):
+        laps = payload['MRData']['RaceTable']['Races'][0]['Laps']
+        return flatten.nested_columns(laps, 'Timings', pyergast._TIMING_COLUMNS, pyergast._LAP_COLUMNS)
+
+    def frame(columns):
+        columns = schema.columns(columns, 'laps')
+        return pd.DataFrame({name: columns[name] for name in ('driverID', 'lap', 'position', 'milliseconds')})
+    return normalize, frame
+
+
+def pit_stops():
+    def normalize(payload):
+        races = payload['MRData']['RaceTable']['Races']
+        return flatten.nested_columns(races, 'PitStops', pyergast._PIT_STOP_COLUMNS)
+
+    def frame(columns):
+        return flatten._frame(columns, (), 'pit_stops')
+    return normalize, frame
+
+
+def driver_standings():
+    def normalize(payload):
+        standings = payload['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
+        return flatten.columns(standings, pyergast._DRIVER_STANDING_COLUMNS)
+
+    def frame(columns):
+        return flatten._frame(columns, (), 'driver_standings')
+    return normalize, frame
+
+
+def query_driver():
+    spec = flatten.prefix(pyergast._DRIVER_STANDING_COLUMNS, 'DriverStandings[0]')
+    del spec['driverID']
+
+    def normalize(payload):
+        return flatten.columns(payload['MRData']['StandingsTable']['StandingsLists'],
+                               {**pyergast._RACE_COLUMNS, **spec})
+
+    def frame(columns):
+        return flatten._frame(columns, (), 'driver_standings')
+    return normalize, frame
+
+
+def query_constructor():
+    spec = flatten.prefix(pyergast._CONSTRUCTOR_STANDING_COLUMNS, 'ConstructorStandings[0]')
+    spec = {('constructor' if name == 'name' else name): path for name, path in spec.items()}
+
+    def normalize(payload):
+        return flatten.columns(payload['MRData']['StandingsTable']['StandingsLists'],
+                               {**pyergast._RACE_COLUMNS, **spec})
+
+    def frame(columns):
+        return flatten._frame(columns, (), 'constructor_standings')
+    return normalize, frame
+
+
+def drivers():
+    def normalize(payload):
+        return payload['MRData']['DriverTable']['Drivers']
+
+    def frame(rows):
+        return schema.apply(pd.DataFrame(rows), 'drivers')
+    return normalize, frame
+
+
+# Endpoint and scale: the payload, the normalize and frame stages, and the builder they are checked against
+CASES = {
+    'get_race_result-round': (payloads.races('Results', seasons=1, rounds=1),
+                              races('Results', pyergast._RESULT_COLUMNS, 'results', season=False),
+                              lambda payload: pyergast._race_result_frame(payload, season=False)),
+    'get_race_result-season': (payloads.races('Results', seasons=1),
+                               races('Results', pyergast._RESULT_COLUMNS, 'results'),
+                               lambda payload: pyergast._race_result_frame(payload, season=True)),
+    'get_race_result-history': (payloads.races('Results', seasons=70),
+                                races('Results', pyergast._RESULT_COLUMNS, 'results'),
+                                lambda payload: pyergast._race_result_frame(payload, season=True)),
+    'get_qualifying_result-round': (payloads.races('QualifyingResults', seasons=1, rounds=1),
+                                    races('QualifyingResults', pyergast._QUALIFYING_COLUMNS, 'qualifying',
+                                          ('Q2', 'Q3'), season=False),
+                                    lambda payload: pyergast._qualifying_result_frame(payload, season=False)),
+    'get_qualifying_result-history': (payloads.races('QualifyingResults', seasons=25),
+                                      races('QualifyingResults', pyergast._QUALIFYING_COLUMNS, 'qualifying',
+                                            ('Q2', 'Q3')),
+                                      lambda payload: pyergast._qualifying_result_frame(payload, season=True)),
+    'get_lap_times-round': (payloads.laps(), laps(), lambda payload: pyergast._lap_times_frame([payload])),
+    'get_pit_stops-round': (payloads.pit_stops(), pit_stops(), pyergast._pit_stops_frame),
+    'driver_standings-round': (payloads.driver_standings(), driver_standings(), pyergast._driver_standings_frame),
+    'query_driver-history': (payloads.driver_history(70), query_driver(), pyergast._query_driver_frame),
+    'query_constructor-history': (payloads.constructor_history(70), query_constructor(),
+                                  pyergast._query_constructor_frame),
+    'get_drivers-history': (payloads.drivers(), drivers(), pyergast._drivers_frame),
+}
+
+
+def peak_memory(body, normalize, frame):
+    # Peak of the three stages together, in MB
+    tracemalloc.start()
+    try:
+        frame(normalize(decode.loads(body)))
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('stage', ['decode', 'normalize', 'frame'])
+@pytest.mark.parametrize('case', list(CASES))
+def test_stage(benchmark, case, stage):
+    payload, (normalize, frame), build = CASES[case]
+    body = json.dumps(payload).encode()
+    columns = normalize(decode.loads(body))
+    # The stages must add up to what the function does
+    pd.testing.assert_frame_equal(frame(dict(columns) if isinstance(columns, dict) else columns),
+                                  build(decode.loads(body)))
+    benchmark.group = case
+    benchmark.extra_info['peak_mb'] = peak_memory(body, normalize, frame)
+    if stage == 'decode':
+        benchmark(decode.loads, body)
+    elif stage == 'normalize':
+        benchmark(normalize, decode.loads(body))
+    else:
+        # Building a frame may consume its columns, so each round gets a fresh mapping
+        benchmark(lambda: frame(dict(columns) if isinstance(columns, dict) else columns))
+
+
+@pytest.fixture(scope='module')
+def server():
+    reference.clear()
+    with replay.serve() as server:
+        yield server
+    reference.clear()
+
+
+CALLS = [
+    ('get_drivers', ()), ('get_constructors', ()), ('get_circuits', ()), ('get_schedule', (2014,)),
+    ('get_race_result', (2014, 1)), ('get_race_result', (2014,)), ('get_qualifying_result', (2014, 1)),
+    ('get_lap_times', (2014, 1)), ('get_pit_stops', (2014, 1)), ('driver_standings', (2014,)),
+    ('constructor_standings', (2014,)), ('query_driver', ('hamilton',)), ('query_constructor', ('mercedes',)),
+]
+
+
+@pytest.mark.parametrize('name,args', CALLS, ids=['{}{}'.format(name, list(args)) for name, args in CALLS])
+def test_fetch(benchmark, server, name, args):
+    benchmark.group = 'fetch'
+    frame = benchmark(getattr(pyergast, name), *args)
+    assert not frame.empty
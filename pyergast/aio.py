@@ -0,0 +1,460 @@
+"""
+Awaitable equivalents of the pyergast functions, for use inside an asyncio event loop.
+
+Requests go through a pooled `aiohttp` session. At most `concurrency` requests are in flight at
+once, and every function can be cancelled like any other coroutine.
+
+Example
+-------
+>>> from pyergast import aio
+>>> results = await asyncio.gather(*(aio.get_race_result(2019, race) for race in range(1, 22)))
+>>> await aio.close()
+"""
+import asyncio
+import copy
+import functools
+import time
+
+from pyergast import bulk, cache, decode, metrics, pagination, pyergast, ratelimit, reference, revalidate, transport
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Settings of the asynchronous session, changed through `configure`
+_settings = {
+    'concurrency': 10,
+}
+
+_session = None
+_semaphore = None
+_loop = None
+
+# Requests in flight, by event loop and normalized URL, and the number of coroutines waiting for each, see `get_json`
+_flights = {}
+_waiters = {}
+
+
+def configure(concurrency=None):
+    """
+    Changes the settings of the asynchronous session. Pool size, timeout and retries are shared
+    with the synchronous functions, see `pyergast.transport.configure`.
+
+    Parameters
+    ----------
+    concurrency: int
+        An optional parameter that specifies the maximum number of requests in flight at once.
+
+    Returns
+    -------
+    dict
+        The settings now in effect.
+    """
+    global _semaphore
+    if concurrency is not None:
+        _settings['concurrency'] = concurrency
+        _semaphore = None
+    return dict(_settings)
+
+
+def _client():
+    global _session, _semaphore, _loop
+    assert aiohttp is not None, 'pyergast.aio requires aiohttp, install it with `pip install aiohttp`'
+    loop = asyncio.get_event_loop()
+    settings = transport.settings()
+    if _session is None or _session.closed or _loop is not loop:
+        connector = aiohttp.TCPConnector(limit=settings['pool_size'])
+        timeout = aiohttp.ClientTimeout(total=settings['timeout'])
+        _session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        _semaphore = None
+        _loop = loop
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(_settings['concurrency'])
+    return _session, _semaphore
+
+
+async def close():
+    """
+    Closes the asynchronous session. A new one is created on the next request.
+    """
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def _request(url, headers=None):
+    # Returns the status, body and headers of a response, and the outcome of the request to be recorded,
+    # see `pyergast.metrics`. A 304 is returned as is, for conditional requests.
+    settings = transport.settings()
+    session, semaphore = _client()
+    outcome = {'cache': 'off' if cache.active() is None else 'miss', 'wait': 0}
+    for attempt in range(settings['max_retries'] + 1):
+        status, retry_after, body, validators = None, None, None, {}
+        delay = ratelimit.reserve()
+        outcome['wait'] += delay
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Not sent, so the token goes back for the requests still waiting
+            ratelimit.refund()
+            raise
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with session.get(url, headers=headers) as r:
+                    status = r.status
+                    retry_after = r.headers.get('Retry-After')
+                    validators = {name: r.headers[name] for name in ('ETag', 'Last-Modified') if name in r.headers}
+                    body = await r.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == settings['max_retries']:
+                    outcome.update(latency=time.perf_counter() - start, retries=attempt)
+                    metrics.request(url, **outcome)
+                    raise
+            outcome.update(latency=time.perf_counter() - start, retries=attempt)
+        if status is not None and status not in transport.RETRY_STATUSES:
+            break
+        if attempt < settings['max_retries']:
+            await asyncio.sleep(transport.retry_delay(attempt, retry_after, settings['backoff_factor']))
+    # A 304 is only expected in answer to a conditional request
+    expected = status == 200 or (status == 304 and bool(headers))
+    if not expected:
+        metrics.request(url, status, len(body or b''), **outcome)
+    assert expected, 'Cannot connect to Ergast API. Check your inputs.'
+    return status, body, validators, outcome
+
+
+async def get_json(url):
+    """
+    Awaitable equivalent of `pyergast.transport.get_json`. Coroutines asking for the same URL at the same time
+    share a single request, and each get their own decoded copy of the response.
+    """
+    body = cache.get(url)
+    if body is not None:
+        outcome, validators = {'cache': 'hit'}, {}
+    else:
+        key = (asyncio.get_event_loop(), cache.normalize_url(url))
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = asyncio.ensure_future(_fetch(url))
+            flight.add_done_callback(functools.partial(_landed, key))
+        # Shielded, so that a cancelled caller does not cancel the request shared with the others,
+        # which is only cancelled with the last of them
+        _waiters[flight] = _waiters.get(flight, 0) + 1
+        try:
+            body, stored, validators, outcome = await asyncio.shield(flight)
+        except asyncio.CancelledError:
+            if _waiters[flight] == 1:
+                flight.cancel()
+            raise
+        finally:
+            _waiters[flight] -= 1
+            if not _waiters[flight]:
+                del _waiters[flight]
+        if not leader:
+            # Only the payload of the coroutine that sent the request is kept for revalidation
+            outcome, validators = {'cache': outcome['cache'], 'coalesced': True}, {}
+        if body is None:
+            # Not modified, the payload decoded before is reused, see `pyergast.revalidate`
+            metrics.request(url, 304, **outcome)
+            return stored if leader else copy.deepcopy(stored)
+    start = time.perf_counter()
+    payload = decode.loads(body)
+    metrics.request(url, 200, len(body), decode=time.perf_counter() - start, **outcome)
+    revalidate.store(url, validators, payload)
+    return payload
+
+
+async def _fetch(url):
+    # Returns the body of a response, or None and the payload decoded before when it has not changed,
+    # the validators of the response and the outcome of the request
+    headers, stored = revalidate.conditional(url)
+    status, body, validators, outcome = await _request(url, headers)
+    if status == 304:
+        return None, stored, validators, outcome
+    cache.put(url, body)
+    return body, None, validators, outcome
+
+
+def _landed(key, flight):
+    del _flights[key]
+    if not flight.cancelled():
+        # Retrieved so that a failure nobody waits for any more is not reported as never retrieved
+        flight.exception()
+
+
+async def gather(*aws):
+    """
+    Like `asyncio.gather`, but cancels the remaining awaitables as soon as one of them fails.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def get_all(url, limit=None):
+    """
+    Awaitable equivalent of `pyergast.pagination.get_all`. The remaining pages are fetched
+    concurrently, bounded by the `concurrency` setting.
+    """
+    limit = limit or pagination.configure()['limit']
+    first = await get_json(pagination.page_url(url, 0, limit))
+    offsets = range(limit, int(first['MRData'].get('total', 0)), limit)
+    if not offsets:
+        return first
+    pages = await gather(*(get_json(pagination.page_url(url, offset, limit)) for offset in offsets))
+    return pagination.merge([first] + list(pages))
+
+
+def _local(function):
+    # Answers from the local source set with `pyergast.use_source`, when there is one, and is traced in either case
+    @metrics.traced
+    @functools.wraps(function)
+    async def wrapper(*args, output='frame', **kwargs):
+        if pyergast._source is not None:
+            return getattr(pyergast, function.__name__)(*args, output=output, **kwargs)
+        pyergast._check_output(output)
+        return await function(*args, output=output, **kwargs)
+    return wrapper
+
+
+async def _reference(name, loader, output):
+    # Loads a reference table without blocking the event loop, so that the find_* functions only search.
+    # Records are searched in the records of the table unless its frame is loaded, see `pyergast._index`.
+    table = reference.table(name)
+    if table.loaded():
+        return
+    if output == 'records':
+        table = reference.table(name + '.records')
+        if not table.loaded():
+            table.set(await loader(output='records'))
+        return
+    table.set(await loader())
+
+
+@_local
+async def get_drivers(year=None, race=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_drivers`.
+    """
+    return pyergast._drivers_frame(await get_all(pyergast._drivers_url(year, race)), output)
+
+
+@_local
+async def get_constructors(year=None, race=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_constructors`.
+    """
+    return pyergast._constructors_frame(await get_all(pyergast._constructors_url(year, race)), output)
+
+
+@_local
+async def get_circuits(year=None, race=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_circuits`.
+    """
+    return pyergast._circuits_frame(await get_all(pyergast._circuits_url(year, race)), output)
+
+
+@metrics.traced
+async def find_driverid(firstname, lastname, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.find_driverid`.
+    """
+    await _reference('drivers', get_drivers, output)
+    return pyergast.find_driverid(firstname, lastname, output=output)
+
+
+@metrics.traced
+async def find_constructorid(name, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.find_constructorid`.
+    """
+    await _reference('constructors', get_constructors, output)
+    return pyergast.find_constructorid(name, output=output)
+
+
+@metrics.traced
+async def find_circuitid(circuit, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.find_circuitid`.
+    """
+    await _reference('circuits', get_circuits, output)
+    return pyergast.find_circuitid(circuit, output=output)
+
+
+@metrics.traced
+async def resolve_many(names, table='drivers', threshold=0.5, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.resolve_many`.
+    """
+    loaders = {'drivers': get_drivers, 'constructors': get_constructors, 'circuits': get_circuits}
+    await _reference(table, loaders[table], output)
+    return pyergast.resolve_many(names, table, threshold, output=output)
+
+
+@_local
+async def get_race_result(year=None, race=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_race_result`.
+    """
+    payload = await get_all(pyergast._race_result_url(year, race))
+    return pyergast._race_result_frame(payload, season=bool(year and not race), output=output)
+
+
+@_local
+async def get_qualifying_result(year=None, race=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_qualifying_result`.
+    """
+    payload = await get_all(pyergast._qualifying_result_url(year, race))
+    return pyergast._qualifying_result_frame(payload, season=bool(year and not race), output=output)
+
+
+@_local
+async def get_lap_times(year, race, driver=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_lap_times`.
+    """
+    return pyergast._lap_times_frame([await get_all(pyergast._lap_times_url(year, race, driver))], output)
+
+
+@_local
+async def get_pit_stops(year, race, driver=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_pit_stops`.
+    """
+    return pyergast._pit_stops_frame(await get_all(pyergast._pit_stops_url(year, race, driver)), output)
+
+
+@_local
+async def get_schedule(year=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_schedule`.
+    """
+    return pyergast._schedule_frame(await get_all(pyergast._schedule_url(year)), output)
+
+
+@_local
+async def driver_standings(year=None, race=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.driver_standings`.
+    """
+    return pyergast._driver_standings_frame(await get_all(pyergast._driver_standings_url(year, race)), output)
+
+
+@_local
+async def constructor_standings(year=None, race=None, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.constructor_standings`.
+    """
+    payload = await get_all(pyergast._constructor_standings_url(year, race))
+    return pyergast._constructor_standings_frame(payload, output)
+
+
+@_local
+async def query_driver(driverid, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.query_driver`.
+    """
+    return pyergast._query_driver_frame(await get_all(pyergast._query_driver_url(driverid)), output)
+
+
+@_local
+async def query_constructor(constructorid, *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.query_constructor`.
+    """
+    payload = await get_all(pyergast._query_constructor_url(constructorid))
+    return pyergast._query_constructor_frame(payload, output)
+
+
+async def _fan_out(fetch, items, max_workers, errors, output):
+    # Awaitable equivalent of `pyergast.bulk.fan_out`, with at most `max_workers` items fetched at once
+    assert errors in ('raise', 'warn', 'ignore'), "errors must be one of 'raise', 'warn' or 'ignore'"
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def item(season, race):
+        async with semaphore:
+            return await fetch(season, race)
+
+    fetches = [item(season, race) for season, race in items]
+    if errors == 'raise':
+        results = await gather(*fetches)
+    else:
+        results = await asyncio.gather(*fetches, return_exceptions=True)
+    return bulk.join(items, results, errors, output)
+
+
+async def _season_rounds(years, rounds, output):
+    # Awaitable equivalent of `pyergast.bulk.season_rounds`, reading the rounds of each season from its schedule
+    years = [years] if isinstance(years, int) else list(years)
+    if rounds is not None:
+        return bulk.season_rounds(years, rounds, None)
+    schedules = await gather(*(get_schedule(year, output='frame' if output == 'frame' else 'records')
+                               for year in years))
+    return bulk.schedule_rounds(years, schedules)
+
+
+@metrics.traced
+async def get_race_results(years, rounds=None, max_workers=bulk.MAX_WORKERS, errors='warn', *, output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_race_results`, with `max_workers` rounds in flight at once.
+    """
+    fetch = pyergast._with_output(get_race_result, output)
+    items = bulk.seasons(years) if rounds is None else await _season_rounds(years, rounds, output)
+    return await _fan_out(fetch, items, max_workers, errors, output)
+
+
+@metrics.traced
+async def get_qualifying_results(years, rounds=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                                 output='frame'):
+    """
+    Awaitable equivalent of `pyergast.get_qualifying_results`, with `max_workers` rounds in flight at once.
+    """
+    years = [year for year, race in bulk.seasons(years) if year >= 1996]
+    fetch = pyergast._with_output(get_qualifying_result, output)
+    items = bulk.seasons(years) if rounds is None else await _season_rounds(years, rounds, output)
+    return await _fan_out(fetch, items, max_workers, errors, output)
+
+
+@metrics.traced
+async def driver_standings_history(years, rounds=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                                   output='frame'):
+    """
+    Awaitable equivalent of `pyergast.driver_standings_history`, with `max_workers` rounds in flight at once.
+    """
+    fetch = pyergast._with_output(driver_standings, output)
+    items = await _season_rounds(years, rounds, output)
+    return await _fan_out(fetch, items, max_workers, errors, output)
+
+
+@metrics.traced
+async def lap_times_history(years, rounds=None, driver=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                            output='frame'):
+    """
+    Awaitable equivalent of `pyergast.lap_times_history`, with `max_workers` races in flight at once.
+    """
+    years = [year for year, race in bulk.seasons(years) if year >= 1996]
+    fetch = pyergast._with_output(functools.partial(get_lap_times, driver=driver), output)
+    items = await _season_rounds(years, rounds, output)
+    return await _fan_out(fetch, items, max_workers, errors, output)
+
+
+@metrics.traced
+async def pit_stops_history(years, rounds=None, driver=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                            output='frame'):
+    """
+    Awaitable equivalent of `pyergast.pit_stops_history`, with `max_workers` races in flight at once.
+    """
+    years = [year for year, race in bulk.seasons(years) if year >= 2011]
+    fetch = pyergast._with_output(functools.partial(get_pit_stops, driver=driver), output)
+    items = await _season_rounds(years, rounds, output)
+    return await _fan_out(fetch, items, max_workers, errors, output)
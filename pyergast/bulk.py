@@ -0,0 +1,182 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from pyergast import lazy, metrics, schema
+
+# Imported on first use, see `pyergast.lazy`
+pd = lazy.module('pandas')
+pa = lazy.module('pyarrow')
+
+MAX_WORKERS = 8
+
+
+def fan_out(fetch, items, max_workers=MAX_WORKERS, errors='warn', output='frame'):
+    """
+    Calls `fetch(season, round)` for every item on a bounded thread pool and
+    concatenates the frames, in the order of the items, with `season` and `round` columns in front.
+    Frames of season-wide queries, whose round is None, are expected to carry these columns already.
+
+    Parameters
+    ----------
+    fetch: callable
+        A function taking a season and a round and returning a pandas.DataFrame.
+    items: list
+        The (season, round) pairs to be fetched.
+    max_workers: int
+        The number of items fetched concurrently.
+    errors: str
+        What to do when an item fails: 'raise' the error, 'warn' and skip it, or 'ignore' it silently.
+        The failed items are listed in the `failures` entry of the `attrs` of the result.
+    output: str
+        'records' when `fetch` returns lists of dicts, which are joined into a single list instead,
+        with `season` and `round` keys in front. Failed items are then only reported according to `errors`.
+        'arrow' when `fetch` returns pyarrow.Tables, which are concatenated the same way into one table
+        with unified dictionaries, and 'polars' to hand that table over to Polars at the end.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+    """
+    assert errors in ('raise', 'warn', 'ignore'), "errors must be one of 'raise', 'warn' or 'ignore'"
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(metrics.in_context(fetch), season, race) for season, race in items]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:
+                if errors == 'raise':
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                results.append(error)
+    return join(items, results, errors, output)
+
+
+def join(items, results, errors='warn', output='frame'):
+    """
+    Concatenates what was fetched for every item, as `fan_out` does, e.g. for `pyergast.aio`.
+
+    Parameters
+    ----------
+    items: list
+        The (season, round) pairs fetched.
+    results: list
+        For each item, the frame, records or table fetched, or the exception it failed with.
+    errors: str
+        What to do with the failed items: 'warn' and skip them, or 'ignore' them silently.
+    output: str
+        What the results are, see `fan_out`.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+    """
+    frames, failures = [], []
+    for (season, race), frame in zip(items, results):
+        if isinstance(frame, BaseException):
+            failures.append((season, race, repr(frame)))
+            if errors == 'warn':
+                warnings.warn('Skipping season {} round {}: {!r}'.format(season, race, frame))
+            continue
+        if output == 'records':
+            frames.extend(row if 'season' in row else {'season': season, 'round': race, **row} for row in frame)
+            continue
+        if output in ('arrow', 'polars'):
+            if 'season' not in frame.column_names:
+                frame = frame.add_column(0, 'round', pa.array([race] * len(frame), pa.int64()))
+                frame = frame.add_column(0, 'season', pa.array([season] * len(frame), pa.int64()))
+            frames.append(frame)
+            continue
+        if 'season' not in frame:
+            frame = frame.copy()
+            frame.insert(0, 'round', race)
+            frame.insert(0, 'season', season)
+        frames.append(frame)
+    if output == 'records':
+        return frames
+    if output in ('arrow', 'polars'):
+        result = _concat_tables(frames)
+        return schema.to_polars(result) if output == 'polars' else result
+    result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['season', 'round'])
+    # Categories differing between frames are concatenated as strings, make them categorical again
+    for column in (frames[0].select_dtypes('category').columns if frames else []):
+        result[column] = result[column].astype('category')
+    result.attrs['failures'] = failures
+    return result
+
+
+def _concat_tables(tables):
+    # Columns missing from some tables, e.g. Q3 before 2006, are filled with nulls as pandas.concat does
+    if not tables:
+        return pa.table({'season': pa.array([], pa.int64()), 'round': pa.array([], pa.int64())})
+    names = dict.fromkeys(name for table in tables for name in table.column_names)
+    types = {field.name: field.type for table in tables for field in table.schema}
+    tables = [pa.table({name: table[name] if name in table.column_names else pa.nulls(len(table), types[name])
+                        for name in names}) for table in tables]
+    return pa.concat_tables(tables).unify_dictionaries()
+
+
+def seasons(years):
+    """
+    Expands seasons into (season, None) pairs, for fetchers with a season-wide query.
+
+    Parameters
+    ----------
+    years: int or list
+        The seasons.
+
+    Returns
+    -------
+    list of tuple
+    """
+    years = [years] if isinstance(years, int) else list(years)
+    return [(year, None) for year in years]
+
+
+def season_rounds(years, rounds, schedule, max_workers=MAX_WORKERS):
+    """
+    Expands seasons and rounds into (season, round) pairs.
+    When `rounds` is None every round of each season is used, read from the schedules fetched concurrently.
+
+    Parameters
+    ----------
+    years: int or list
+        The seasons.
+    rounds: int or list
+        The rounds of each season, or None for all of them.
+    schedule: callable
+        A function returning the schedule of a season, as a frame or records, e.g. `get_schedule`.
+    max_workers: int
+        The number of schedules fetched concurrently.
+
+    Returns
+    -------
+    list of tuple
+    """
+    years = [years] if isinstance(years, int) else list(years)
+    if rounds is not None:
+        rounds = [rounds] if isinstance(rounds, int) else list(rounds)
+        return [(year, race) for year in years for race in rounds]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        schedules = list(executor.map(metrics.in_context(schedule), years))
+    return schedule_rounds(years, schedules)
+
+
+def schedule_rounds(years, schedules):
+    """
+    Expands seasons into (season, round) pairs for every round of their schedules.
+
+    Parameters
+    ----------
+    years: list
+        The seasons.
+    schedules: list
+        The schedule of each season, as a frame or records.
+
+    Returns
+    -------
+    list of tuple
+    """
+    return [(year, int(race)) for year, frame in zip(years, schedules)
+            for race in ([row['round'] for row in frame] if isinstance(frame, list) else frame['round'])]
@@ -0,0 +1,344 @@
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Seconds to keep `current`/`last` URLs and the running season
+LIVE_TTL = 300
+# Seconds to keep URLs that are not tied to a season, e.g. the list of all drivers
+DEFAULT_TTL = 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+)
+"""
+
+_active = None
+
+
+def default_path():
+    """
+    Returns the default location of the cache database, inside `$XDG_CACHE_HOME` or `~/.cache`.
+
+    Returns
+    -------
+    str
+    """
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'pyergast', 'responses.sqlite')
+
+
+def normalize_url(url):
+    """
+    Normalizes a URL so that equivalent requests share a cache entry.
+    The scheme and host are lowercased, the query parameters are sorted and trailing slashes are dropped.
+
+    Parameters
+    ----------
+    url: str
+        The URL to be normalized.
+
+    Returns
+    -------
+    str
+
+    Example
+    -------
+    >>> pyergast.cache.normalize_url('HTTP://Ergast.com/api/f1/2014/4/results.json?offset=0&limit=30')
+    'http://ergast.com/api/f1/2014/4/results.json?limit=30&offset=0'
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def ttl_for(url, live_ttl=LIVE_TTL, default_ttl=DEFAULT_TTL):
+    """
+    Picks how long the response of a URL may be cached for, based on the era it covers.
+
+    Completed seasons never change and are kept forever. `current`/`last` URLs and the running
+    season get `live_ttl`, and URLs that are not tied to a season get `default_ttl`.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the request.
+    live_ttl: float
+        Seconds to keep live data.
+    default_ttl: float
+        Seconds to keep data that is not tied to a season.
+
+    Returns
+    -------
+    float or None
+        None means the response never expires.
+    """
+    if is_live(url):
+        return live_ttl
+    segments = [s.split('.')[0] for s in urlsplit(url).path.split('/')]
+    if not any(re.fullmatch(r'\d{4}', s) for s in segments):
+        return default_ttl
+    return None
+
+
+def is_live(url):
+    """
+    Returns whether the response of a URL can still change: `current`/`last` URLs and the running season.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the request.
+
+    Returns
+    -------
+    bool
+    """
+    segments = [s.split('.')[0] for s in urlsplit(url).path.split('/')]
+    if 'current' in segments or 'last' in segments:
+        return True
+    years = [int(s) for s in segments if re.fullmatch(r'\d{4}', s)]
+    return bool(years) and max(years) >= datetime.date.today().year
+
+
+class ResponseCache:
+    """
+    Persistent cache of raw API responses stored in a SQLite database, keyed by normalized URL.
+
+    Parameters
+    ----------
+    path: str
+        Location of the database file. Defaults to `default_path()`.
+    live_ttl: float
+        Seconds to keep `current`/`last` URLs and the running season.
+    default_ttl: float
+        Seconds to keep URLs that are not tied to a season.
+    max_size: int
+        Optional cap on the total size of the cached bodies in bytes.
+        The least recently used entries are evicted once it is exceeded.
+    """
+
+    def __init__(self, path=None, live_ttl=LIVE_TTL, default_ttl=DEFAULT_TTL, max_size=None):
+        self.path = path or default_path()
+        self.live_ttl = live_ttl
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(_SCHEMA)
+
+    def get(self, url):
+        """
+        Returns the cached body of a URL, or None if it is missing or has expired.
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT body, expires FROM responses WHERE url = ?', (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute('DELETE FROM responses WHERE url = ?', (key,))
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET accessed = ? WHERE url = ?', (now, key))
+            self.hits += 1
+            return bytes(row[0])
+
+    def put(self, url, body):
+        """
+        Stores the body of a URL, then evicts least recently used entries if `max_size` is exceeded.
+        """
+        key = normalize_url(url)
+        now = time.time()
+        ttl = ttl_for(key, self.live_ttl, self.default_ttl)
+        expires = None if ttl is None else now + ttl
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                               (key, sqlite3.Binary(body), len(body), now, expires, now))
+            if self.max_size is not None:
+                self._evict(self.max_size)
+
+    def _evict(self, max_size):
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= max_size:
+            return
+        rows = self._conn.execute('SELECT url, size FROM responses ORDER BY accessed').fetchall()
+        for url, size in rows:
+            if total <= max_size:
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+
+    def resize(self, max_size):
+        """
+        Changes the size cap in bytes and evicts least recently used entries down to it.
+        """
+        with self._lock:
+            self.max_size = max_size
+            if max_size is not None:
+                self._evict(max_size)
+
+    def invalidate(self, pattern=None):
+        """
+        Removes the entries whose normalized URL contains `pattern`, or every entry if it is None.
+
+        Returns
+        -------
+        int
+            The number of entries removed.
+        """
+        with self._lock:
+            if pattern is None:
+                cursor = self._conn.execute('DELETE FROM responses')
+            else:
+                cursor = self._conn.execute('DELETE FROM responses WHERE instr(url, ?) > 0', (pattern,))
+            return cursor.rowcount
+
+    def entries(self):
+        """
+        Lists the cached entries, least recently used first.
+
+        Returns
+        -------
+        list of dict
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, size, stored, expires, accessed FROM responses ORDER BY accessed').fetchall()
+        keys = ('url', 'size', 'stored', 'expires', 'accessed')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def info(self):
+        """
+        Summarizes the cache.
+
+        Returns
+        -------
+        dict
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return {'path': self.path, 'entries': entries, 'size': size, 'max_size': self.max_size,
+                'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def enable(path=None, live_ttl=LIVE_TTL, default_ttl=DEFAULT_TTL, max_size=None):
+    """
+    Turns on the persistent response cache for every pyergast function.
+
+    Parameters
+    ----------
+    path: str
+        Location of the database file. Defaults to `default_path()`.
+    live_ttl: float
+        Seconds to keep `current`/`last` URLs and the running season.
+    default_ttl: float
+        Seconds to keep URLs that are not tied to a season.
+    max_size: int
+        Optional cap on the total size of the cache in bytes, enforced with LRU eviction.
+
+    Returns
+    -------
+    ResponseCache
+
+    Example
+    -------
+    >>> pyergast.cache.enable(max_size=200 * 1024 ** 2)
+    >>> pyergast.get_race_result(2014, 4)  # downloaded once, then read from disk
+    """
+    global _active
+    disable()
+    _active = ResponseCache(path, live_ttl, default_ttl, max_size)
+    return _active
+
+
+def disable():
+    """
+    Turns off the response cache. The database is kept on disk.
+    """
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def active():
+    """
+    Returns the enabled `ResponseCache`, or None if caching is off.
+    """
+    return _active
+
+
+def get(url):
+    """
+    Returns the cached body of a URL, or None if caching is off or the entry is missing.
+    """
+    if _active is None:
+        return None
+    return _active.get(url)
+
+
+def put(url, body):
+    """
+    Stores the body of a URL if caching is on.
+    """
+    if _active is not None:
+        _active.put(url, body)
+
+
+def info():
+    """
+    Summarizes the enabled cache, see `ResponseCache.info`.
+    """
+    assert _active is not None, 'The cache is not enabled'
+    return _active.info()
+
+
+def entries():
+    """
+    Lists the entries of the enabled cache, see `ResponseCache.entries`.
+    """
+    assert _active is not None, 'The cache is not enabled'
+    return _active.entries()
+
+
+def invalidate(pattern=None):
+    """
+    Removes entries of the enabled cache, see `ResponseCache.invalidate`.
+
+    Example
+    -------
+    >>> pyergast.cache.invalidate('/current/')
+    3
+    """
+    assert _active is not None, 'The cache is not enabled'
+    return _active.invalidate(pattern)
+
+
+def resize(max_size):
+    """
+    Changes the size cap of the enabled cache, see `ResponseCache.resize`.
+    """
+    assert _active is not None, 'The cache is not enabled'
+    _active.resize(max_size)
@@ -0,0 +1,166 @@
+"""
+Decoding of the JSON bodies returned by the API.
+
+Bodies are decoded with `orjson` when it is installed, and with the standard library otherwise.
+Large responses of known size can instead be parsed incrementally with `ijson` straight from the socket,
+so that the raw body is never buffered in full alongside the decoded payload.
+
+Example
+-------
+>>> from pyergast import decode
+>>> decode.configure(decoder='json', stream_threshold=None)
+{'decoder': 'json', 'stream_threshold': None}
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Functions decoding a whole body, by name
+DECODERS = {'json': json.loads}
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+# Settings of the decoder, changed through `configure`
+_settings = {
+    'decoder': 'orjson' if orjson is not None else 'json',
+    'stream_threshold': 4 * 1024 ** 2,
+}
+
+
+def configure(decoder=None, stream_threshold=False):
+    """
+    Changes how the bodies returned by the API are decoded.
+
+    Parameters
+    ----------
+    decoder: str or callable
+        An optional parameter that specifies the decoder of whole bodies: a name from `DECODERS`,
+        or a function taking the body as bytes and returning the payload, which is registered under its name.
+    stream_threshold: int
+        An optional parameter that specifies the size in bytes above which a response is parsed incrementally
+        with `ijson`. Responses of unknown size, chunked or compressed, are decoded whole, so while streaming is
+        on, uncached requests ask the API for uncompressed responses, see `streaming`. `None` turns streaming off,
+        and lets the API compress its responses again.
+
+    Returns
+    -------
+    dict
+        The settings now in effect.
+
+    Example
+    -------
+    >>> pyergast.decode.configure(stream_threshold=1024 ** 2)
+    {'decoder': 'orjson', 'stream_threshold': 1048576}
+    """
+    if callable(decoder):
+        DECODERS[decoder.__name__] = decoder
+        decoder = decoder.__name__
+    if decoder is not None:
+        assert decoder in DECODERS, 'Unknown decoder {}, install it or use one of {}'.format(decoder, list(DECODERS))
+        _settings['decoder'] = decoder
+    if stream_threshold is not False:
+        assert stream_threshold is None or ijson is not None, \
+            'Streaming requires ijson, install it with `pip install ijson`'
+        _settings['stream_threshold'] = stream_threshold
+    return dict(_settings)
+
+
+def loads(body):
+    """
+    Decodes a whole JSON body with the configured decoder.
+
+    Parameters
+    ----------
+    body: bytes
+        The body of a response.
+
+    Returns
+    -------
+    dict
+    """
+    return DECODERS[_settings['decoder']](body)
+
+
+def streaming():
+    """
+    Tells whether large responses are parsed incrementally, in which case they must be requested
+    uncompressed for their size to be known, see `should_stream`.
+
+    Returns
+    -------
+    bool
+    """
+    return _settings['stream_threshold'] is not None and ijson is not None
+
+
+def should_stream(size):
+    """
+    Tells whether a response is large enough to be parsed incrementally, see `configure`.
+
+    Parameters
+    ----------
+    size: int
+        The size of the decoded body in bytes, from its `Content-Length`, or None when it is unknown,
+        e.g. for chunked or compressed responses, which are then decoded whole.
+
+    Returns
+    -------
+    bool
+    """
+    if not streaming() or size is None:
+        return False
+    return size > _settings['stream_threshold']
+
+
+def stream(fileobj):
+    """
+    Parses a JSON body incrementally from a file-like object, such as the raw socket of a response,
+    reading it in small chunks. Numbers are decoded as floats, like the standard library does.
+    Only the rows of the table being queried, e.g. `MRData.RaceTable.Races`, are built one at a time;
+    the envelope around them is put back together from its scalar fields.
+
+    Parameters
+    ----------
+    fileobj: file-like object
+        The body, opened in binary mode.
+
+    Returns
+    -------
+    dict
+    """
+    # Every Ergast payload is a single MRData object, whose bulk is the list of rows of its *Table entry.
+    # The maps of the envelope by prefix, e.g. 'MRData.RaceTable', then the list of rows and the row being built.
+    envelope = {'': {}}
+    rows = item = None
+    builder = None
+    for prefix, event, value in ijson.parse(fileobj, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == item and event in ('end_map', 'end_array'):
+                rows.append(builder.value)
+                builder = None
+        elif prefix == item:
+            if event in ('start_map', 'start_array'):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            else:
+                rows.append(value)
+        elif prefix and event != 'map_key' and not event.startswith('end_'):
+            parent, _, key = prefix.rpartition('.')
+            if event == 'start_map':
+                value = envelope[prefix] = {}
+            elif event == 'start_array':
+                value = rows = []
+                item = prefix + '.item'
+            envelope[parent][key] = value
+    if 'MRData' not in envelope['']:
+        raise ValueError('Not an Ergast API response')
+    return envelope['']
@@ -0,0 +1,295 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from pyergast import local, pyergast, schema, search
+
+# Columns read from each CSV file of the dump. Keys used for joins are integers, everything else is kept
+# as text so that values come out exactly as the API returns them.
+COLUMNS = {
+    'drivers': {'driverId': 'int32', 'driverRef': str, 'number': str, 'code': str, 'forename': str,
+                'surname': str, 'dob': str, 'nationality': str, 'url': str},
+    'constructors': {'constructorId': 'int32', 'constructorRef': str, 'name': str, 'nationality': str, 'url': str},
+    'circuits': {'circuitId': 'int32', 'circuitRef': str, 'name': str, 'location': str, 'country': str,
+                 'lat': str, 'lng': str, 'url': str},
+    'races': {'raceId': 'int32', 'year': 'int16', 'round': 'int16', 'circuitId': 'int32', 'name': str,
+              'date': str, 'time': str, 'url': str},
+    'status': {'statusId': 'int32', 'status': str},
+    'results': {'raceId': 'int32', 'driverId': 'int32', 'constructorId': 'int32', 'number': str, 'grid': str,
+                'positionText': str, 'positionOrder': 'int16', 'points': str, 'laps': str, 'milliseconds': str,
+                'statusId': 'int32'},
+    'qualifying': {'raceId': 'int32', 'driverId': 'int32', 'constructorId': 'int32', 'number': str,
+                   'position': str, 'q1': str, 'q2': str, 'q3': str},
+    'driver_standings': {'raceId': 'int32', 'driverId': 'int32', 'points': str, 'position': str,
+                         'positionText': str, 'wins': str},
+    'constructor_standings': {'raceId': 'int32', 'constructorId': 'int32', 'points': str, 'position': str,
+                              'positionText': str, 'wins': str},
+    'lap_times': {'raceId': 'int32', 'driverId': 'int32', 'lap': 'int16', 'position': 'int16',
+                  'milliseconds': 'Int32'},
+    'pit_stops': {'raceId': 'int32', 'driverId': 'int32', 'stop': 'int16', 'lap': 'int16', 'time': str,
+                  'milliseconds': 'Int32'},
+}
+
+
+def read_csv(archive, name):
+    """
+    Reads a CSV file of the dump, parsing only the columns pyergast needs with compact dtypes.
+    The dump spells missing values `\\N`; they are read as NaN, and so are empty strings.
+
+    Parameters
+    ----------
+    archive: zipfile.ZipFile
+        The dump archive.
+    name: str
+        The name of the file without extension, e.g. 'results'.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    dtypes = COLUMNS[name]
+    with archive.open(name + '.csv') as file:
+        return pd.read_csv(file, usecols=list(dtypes), dtype=dtypes, na_values=['\\N', ''],
+                           keep_default_na=False)
+
+
+def _records(frame, columns):
+    # Builds a frame from records omitting missing values, like the API omits missing keys,
+    # so that columns come out in the same order
+    records = []
+    for row in frame[list(columns.values())].itertuples(index=False):
+        records.append({key: value for key, value in zip(columns, row) if isinstance(value, str)})
+    return pd.DataFrame(records)
+
+
+class DumpStore(local.LocalSource):
+    """
+    In-memory store of the Ergast database dump, answering the pyergast functions without any network I/O.
+
+    The CSV files are parsed once, joined into frames shaped and typed like the ones returned by the API,
+    and indexed by season and round so that each query is a slice.
+
+    Parameters
+    ----------
+    path: str
+        The location of the dump archive, e.g. `f1db_csv.zip` downloaded from http://ergast.com/mrd/db/.
+    """
+
+    def __init__(self, path):
+        with zipfile.ZipFile(path) as archive:
+            tables = {name: read_csv(archive, name) for name in COLUMNS}
+        self._frames = {}
+        self._index = {}
+        self._build(tables)
+
+    def _build(self, tables):
+        # The API orders drivers and constructors by name ignoring accents and case, e.g. Räikkönen between
+        # Hamilton and Ricciardo, and circuits by ID
+        drivers = tables['drivers'].sort_values(['surname', 'driverRef'], kind='stable',
+                                                key=lambda column: column.map(search.collate))
+        self._frames['drivers'] = _records(drivers, {
+            'driverId': 'driverRef', 'permanentNumber': 'number', 'code': 'code', 'url': 'url',
+            'givenName': 'forename', 'familyName': 'surname', 'dateOfBirth': 'dob', 'nationality': 'nationality'})
+
+        constructors = tables['constructors'].sort_values(['name', 'constructorRef'], kind='stable',
+                                                          key=lambda column: column.map(search.collate))
+        self._frames['constructors'] = pd.DataFrame({
+            'constructorId': constructors['constructorRef'].values, 'url': constructors['url'].values,
+            'name': constructors['name'].values, 'nationality': constructors['nationality'].values})
+
+        circuits = tables['circuits'].sort_values('circuitRef', kind='stable')
+        self._frames['circuits'] = pd.DataFrame({
+            'circuitId': circuits['circuitRef'].values, 'url': circuits['url'].values,
+            'circuitName': circuits['name'].values, 'Latitude': circuits['lat'].values,
+            'Longtitude': circuits['lng'].values, 'Locality': circuits['location'].values,
+            'Country': circuits['country'].values})
+
+        # Lookups from the integer keys of the dump to the columns of the API
+        driver = tables['drivers'].set_index('driverId')
+        driver = pd.DataFrame({'driverID': driver['driverRef'], 'driver': driver['forename'] + ' ' + driver['surname'],
+                               'nationality': driver['nationality']})
+        constructor = tables['constructors'].set_index('constructorId')
+        constructor = pd.DataFrame({'constructorID': constructor['constructorRef'],
+                                    'constructor': constructor['name'], 'constructorNationality': constructor['nationality']})
+        circuit = tables['circuits'].set_index('circuitId')
+        races = tables['races'].set_index('raceId')
+
+        schedule = races.join(circuit, on='circuitId', rsuffix='Circuit').sort_values(['year', 'round'])
+        self._frames['schedule'] = pd.DataFrame({
+            'season': schedule['year'].astype(str).values, 'round': schedule['round'].astype(str).values,
+            'url': schedule['url'].values, 'raceName': schedule['name'].values, 'date': schedule['date'].values,
+            'time': (schedule['time'] + 'Z').values, 'circuitID': schedule['circuitRef'].values,
+            'circuitName': schedule['nameCircuit'].values, 'locality': schedule['location'].values,
+            'country': schedule['country'].values})
+        self._index['schedule'] = _index(schedule['year'].values, None)
+
+        status = tables['status'].set_index('statusId')['status']
+        results = self._with_race(tables['results'], races, ['positionOrder'])
+        self._frames['results'] = self._rows(results, driver, constructor, {
+            'number': results['number'], 'position': results['positionOrder'].astype(str),
+            'positionText': results['positionText'], 'grid': results['grid'], 'points': results['points']},
+            {'laps': results['laps'], 'status': results['statusId'].map(status), 'Time': results['milliseconds']})
+        self._index['results'] = _index(results['season'].values, results['round'].values)
+
+        qualifying = tables['qualifying'].assign(order=pd.to_numeric(tables['qualifying']['position']))
+        qualifying = self._with_race(qualifying, races, ['order'])
+        self._frames['qualifying'] = self._rows(qualifying, driver, constructor, {
+            'number': qualifying['number'], 'position': qualifying['position']},
+            {'Q1': qualifying['q1'], 'Q2': qualifying['q2'], 'Q3': qualifying['q3']})
+        self._index['qualifying'] = _index(qualifying['season'].values, qualifying['round'].values)
+
+        # The dump does not tell which constructor a standing belongs to,
+        # so drivers are credited with the constructor of their latest result of the season
+        latest = results[['season', 'round', 'driverId', 'constructorId']].sort_values('round')
+        standings = tables['driver_standings'].assign(order=pd.to_numeric(tables['driver_standings']['position']))
+        standings = self._with_race(standings, races, ['order']).sort_values('round', kind='stable')
+        standings = pd.merge_asof(standings, latest, on='round', by=['season', 'driverId'])
+        standings = standings.sort_values(['season', 'round', 'order'], kind='stable').reset_index(drop=True)
+        self._frames['driver_standings'] = self._rows(standings, driver, constructor, {
+            'position': standings['position'], 'positionText': standings['positionText'],
+            'points': standings['points'], 'wins': standings['wins']}, {})
+        self._index['driver_standings'] = _index(standings['season'].values, standings['round'].values)
+
+        standings = tables['constructor_standings'].assign(
+            order=pd.to_numeric(tables['constructor_standings']['position']))
+        standings = self._with_race(standings, races, ['order'])
+        joined = constructor.reindex(standings['constructorId'])
+        self._frames['constructor_standings'] = pd.DataFrame({
+            'season': standings['season'].values, 'round': standings['round'].values,
+            'position': standings['position'].values, 'positionText': standings['positionText'].values,
+            'points': standings['points'].values, 'wins': standings['wins'].values,
+            'constructorID': joined['constructorID'].values, 'name': joined['constructor'].values,
+            'nationality': joined['constructorNationality'].values})
+        self._index['constructor_standings'] = _index(standings['season'].values, standings['round'].values)
+
+        laps = self._with_race(tables['lap_times'], races, ['lap', 'position'])
+        self._frames['laps'] = pd.DataFrame({
+            'season': laps['season'].values, 'round': laps['round'].values,
+            'driverID': driver['driverID'].reindex(laps['driverId']).values, 'lap': laps['lap'].values,
+            'position': laps['position'].values, 'milliseconds': laps['milliseconds'].array})
+        self._index['laps'] = _index(laps['season'].values, laps['round'].values)
+
+        stops = self._with_race(tables['pit_stops'], races, ['time'])
+        self._frames['pit_stops'] = pd.DataFrame({
+            'season': stops['season'].values, 'round': stops['round'].values,
+            'driverID': driver['driverID'].reindex(stops['driverId']).values, 'stop': stops['stop'].values,
+            'lap': stops['lap'].values, 'time': stops['time'].values, 'milliseconds': stops['milliseconds'].array})
+        self._index['pit_stops'] = _index(stops['season'].values, stops['round'].values)
+
+        self._frames = {dataset: schema.apply(frame, dataset) for dataset, frame in self._frames.items()}
+
+    @staticmethod
+    def _with_race(frame, races, order):
+        # Adds integer season and round columns and sorts the rows the way the API does
+        race = races.reindex(frame['raceId'])
+        frame = frame.assign(season=race['year'].values.astype(int), round=race['round'].values.astype(int))
+        return frame.sort_values(['season', 'round'] + order, kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def _rows(frame, driver, constructor, before, after):
+        # Columns of a per-driver frame: season, round, `before`, the driver and constructor, then `after`
+        drivers = driver.reindex(frame['driverId'])
+        constructors = constructor.reindex(frame['constructorId'])
+        columns = {'season': frame['season'].values, 'round': frame['round'].values}
+        columns.update({key: np.asarray(value, dtype=object) for key, value in before.items()})
+        columns.update({'driverID': drivers['driverID'].values, 'driver': drivers['driver'].values,
+                        'nationality': drivers['nationality'].values,
+                        'constructorID': constructors['constructorID'].values,
+                        'constructor': constructors['constructor'].values})
+        columns.update({key: np.asarray(value, dtype=object) for key, value in after.items()})
+        return pd.DataFrame(columns)
+
+    def partitions(self, dataset):
+        return sorted(self._index[dataset], key=lambda key: (key[0], key[1] or 0))
+
+    def read(self, dataset, season=None, round=None):
+        frame = self._frames[dataset]
+        if dataset in local.REFERENCE_DATASETS:
+            return frame.copy()
+        keys = [key for key in self.partitions(dataset)
+                if (season is None or key[0] == season) and (round is None or key[1] == round)]
+        assert keys, 'No {} in the dump for season {} round {}'.format(dataset, season, round)
+        start, stop = self._index[dataset][keys[0]][0], self._index[dataset][keys[-1]][1]
+        rows = frame.iloc[start:stop].reset_index(drop=True)
+        if dataset == 'schedule' and rows['time'].isna().all():
+            rows = rows.drop(columns=['time'])
+        return rows
+
+    def export(self, path):
+        """
+        Writes the store into a local Parquet dataset, see `pyergast.warehouse.Warehouse`.
+
+        Parameters
+        ----------
+        path: str
+            The root directory of the dataset.
+
+        Returns
+        -------
+        pyergast.warehouse.Warehouse
+        """
+        from pyergast import warehouse
+
+        store = warehouse.Warehouse(path)
+        for dataset in local.REFERENCE_DATASETS:
+            store.write(dataset, self.read(dataset))
+        for season, race in self.partitions('schedule'):
+            store.write('schedule', self.read('schedule', season), season)
+        for dataset in local.ROUND_DATASETS:
+            for season, race in self.partitions(dataset):
+                store.write(dataset, self.read(dataset, season, race), season, race)
+            if self.partitions(dataset):
+                store.set_mark(dataset, *self.partitions(dataset)[-1])
+        return store
+
+
+def _index(seasons, rounds):
+    # Maps each (season, round) to the slice of rows holding it; the rows must be sorted by season and round
+    index = {}
+    if rounds is None:
+        rounds = [None] * len(seasons)
+    for position, key in enumerate(zip(seasons, rounds)):
+        key = (int(key[0]), None if key[1] is None else int(key[1]))
+        start, stop = index.get(key, (position, position))
+        index[key] = (start, position + 1)
+    return index
+
+
+def load(path):
+    """
+    Parses the Ergast database dump into an in-memory store.
+
+    Parameters
+    ----------
+    path: str
+        The location of the dump archive, e.g. `f1db_csv.zip`.
+
+    Returns
+    -------
+    DumpStore
+    """
+    return DumpStore(path)
+
+
+def use(path):
+    """
+    Makes every pyergast function answer from the Ergast database dump, see `pyergast.use_source`.
+
+    Parameters
+    ----------
+    path: str
+        The location of the dump archive, e.g. `f1db_csv.zip`.
+
+    Returns
+    -------
+    DumpStore
+
+    Example
+    -------
+    >>> pyergast.dump.use('f1db_csv.zip')
+    >>> pyergast.driver_standings(1978)  # read from the dump, no network I/O
+    """
+    store = DumpStore(path)
+    pyergast.use_source(store)
+    return store
@@ -0,0 +1,221 @@
+from itertools import repeat
+from operator import itemgetter
+
+from pyergast import lazy, metrics, schema
+
+# Imported on first use, see `pyergast.lazy`
+pd = lazy.module('pandas')
+
+# Value of a column when its path is missing from a record
+MISSING = float('nan')
+
+
+def parse_path(path):
+    """
+    Splits a path such as 'Constructors[0].name' into the keys leading to its value in a record.
+
+    Parameters
+    ----------
+    path: str
+        Keys separated by dots, with list indices in brackets.
+
+    Returns
+    -------
+    tuple
+
+    Examples
+    --------
+    >>> parse_path('Constructors[0].name')
+    ('Constructors', 0, 'name')
+    """
+    keys = []
+    for part in path.split('.'):
+        name, _, indices = part.partition('[')
+        keys.append(name)
+        keys.extend(int(index) for index in indices.rstrip(']').split('][') if index)
+    return tuple(keys)
+
+
+@metrics.flattening
+def columns(records, spec):
+    """
+    Extracts the columns of a frame from a list of JSON records, one list of values per column.
+    Values missing from a record are `MISSING`.
+
+    Parameters
+    ----------
+    records: list of dict
+        The records, e.g. the `Results` of a race.
+    spec: dict
+        Maps each column to the path of its value, see `parse_path`. A tuple of paths
+        joins their values with spaces, e.g. `('Driver.givenName', 'Driver.familyName')`.
+
+    Returns
+    -------
+    dict
+    """
+    # Values are pulled one path step at a time for all records with C-level itemgetters,
+    # and the intermediate lists, e.g. the `Driver` of every record, are shared between columns
+    cache = {}
+    result = {}
+    for name, path in spec.items():
+        if isinstance(path, tuple):
+            parts = [_extract(records, parse_path(part), cache) for part in path]
+            try:
+                result[name] = list(map(' '.join, zip(*parts)))
+            except TypeError:
+                result[name] = [' '.join(values) if all(isinstance(value, str) for value in values) else MISSING
+                                for values in zip(*parts)]
+        else:
+            result[name] = _extract(records, parse_path(path), cache)
+    return result
+
+
+def _extract(records, keys, cache):
+    if keys not in cache:
+        parents = records if len(keys) == 1 else _extract(records, keys[:-1], cache)
+        key = keys[-1]
+        try:
+            if isinstance(key, str):
+                cache[keys] = list(map(dict.get, parents, repeat(key), repeat(MISSING)))
+            else:
+                cache[keys] = list(map(itemgetter(key), parents))
+        except (KeyError, IndexError, TypeError):
+            cache[keys] = [_get(parent, key) for parent in parents]
+    return cache[keys]
+
+
+def _get(record, key):
+    try:
+        return record[key]
+    except (KeyError, IndexError, TypeError):
+        return MISSING
+
+
+def prefix(spec, path):
+    """
+    Returns a copy of `spec` with every path starting from `path`, for records nested one level deeper.
+
+    Parameters
+    ----------
+    spec: dict
+        The columns and the paths of their values, see `columns`.
+    path: str
+        The path of the nested record, e.g. 'DriverStandings[0]'.
+
+    Returns
+    -------
+    dict
+    """
+    def join(value):
+        return tuple(map(join, value)) if isinstance(value, tuple) else path + '.' + value
+    return {name: join(value) for name, value in spec.items()}
+
+
+def frame(records, spec, optional=(), dataset=None, output='frame'):
+    """
+    Builds a frame from a list of JSON records in one go, with the columns of `spec` in order.
+
+    Parameters
+    ----------
+    records: list of dict
+        The records.
+    spec: dict
+        The columns and the paths of their values, see `columns`.
+    optional: tuple
+        Columns left out when no record has them, e.g. Q3 before 2006.
+    dataset: str
+        An optional dataset whose types the columns are converted to before the frame is built, see `pyergast.schema`.
+    output: str
+        'frame' for a pandas.DataFrame, or 'records', 'arrow' or 'polars' for a list of dicts,
+        a pyarrow.Table or a polars.DataFrame built without a pandas.DataFrame, see `pyergast.schema.build`.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+    """
+    return _frame(columns(records, spec), optional, dataset, output)
+
+
+def nested(parents, key, spec, parent_spec=None, convert=None, optional=(), dataset=None, output='frame'):
+    """
+    Builds a frame from the records nested under `key` in each parent, e.g. the `Results` of each race.
+    Columns of `parent_spec` come first and are repeated for each nested record.
+
+    Parameters
+    ----------
+    parents: list of dict
+        The parent records.
+    key: str
+        The key of the list of nested records in each parent.
+    spec: dict
+        The columns taken from the nested records, see `columns`.
+    parent_spec: dict
+        The columns taken from the parents.
+    convert: dict
+        Functions converting the values of parent columns, e.g. `{'season': int}`.
+    optional: tuple
+        Columns left out when no record has them.
+    dataset: str
+        An optional dataset whose types the columns are converted to, see `frame`.
+    output: str
+        'frame', 'records', 'arrow' or 'polars', see `frame`.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+    """
+    return _frame(nested_columns(parents, key, spec, parent_spec, convert), optional, dataset, output)
+
+
+@metrics.flattening
+def nested_columns(parents, key, spec, parent_spec=None, convert=None):
+    """
+    Extracts the columns of the records nested under `key` in each parent, without building a frame.
+    See `nested` for the parameters.
+
+    Returns
+    -------
+    dict
+    """
+    children = [child for parent in parents for child in parent.get(key, ())]
+    result = {}
+    if parent_spec:
+        counts = [len(parent.get(key, ())) for parent in parents]
+        for name, values in columns(parents, parent_spec).items():
+            if convert and name in convert:
+                values = [convert[name](value) for value in values]
+            result[name] = [value for value, count in zip(values, counts) for _ in range(count)]
+    result.update(columns(children, spec))
+    return result
+
+
+def concat(chunks):
+    """
+    Joins the columns extracted from several pages, e.g. by `columns`, into a single set of columns.
+    Categorical columns are joined into one categorical with the categories of every page.
+
+    Parameters
+    ----------
+    chunks: list of dict
+        The columns of each page, all with the same names.
+
+    Returns
+    -------
+    dict
+    """
+    result = {}
+    for name in chunks[0]:
+        values = [chunk[name] for chunk in chunks]
+        if isinstance(values[0], pd.Categorical):
+            result[name] = pd.api.types.union_categoricals(values)
+        else:
+            result[name] = pd.concat([pd.Series(value) for value in values], ignore_index=True).array
+    return result
+
+
+def _frame(data, optional, dataset, output='frame'):
+    for name in optional:
+        if all(value is MISSING for value in data[name]):
+            del data[name]
+    return schema.build(data, dataset, output)
@@ -0,0 +1,65 @@
+"""
+Deferred imports of the heavy dependencies, so that importing pyergast costs little and pandas, numpy and
+requests are only loaded by the first function that needs them.
+
+Example
+-------
+>>> from pyergast import lazy
+>>> pd = lazy.module('pandas')  # nothing is imported yet
+>>> pd.DataFrame  # pandas is imported here
+<class 'pandas.core.frame.DataFrame'>
+"""
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module until one of its attributes is read, then imports it and takes on its attributes.
+
+    Parameters
+    ----------
+    name: str
+        The full name of the module, e.g. 'pandas' or 'urllib3.util.retry'.
+    """
+
+    def __getattr__(self, attribute):
+        # Only called for attributes missing from the stand-in: the first time, and for attributes the
+        # module itself creates on demand. Imports are serialized by the import lock of the module.
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+
+def module(name):
+    """
+    Returns a module to be imported on first use, or the module itself when it is already imported.
+
+    Parameters
+    ----------
+    name: str
+        The full name of the module.
+
+    Returns
+    -------
+    module
+    """
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def available(name):
+    """
+    Returns whether a module can be imported, without importing it, e.g. to check an optional dependency.
+
+    Parameters
+    ----------
+    name: str
+        The full name of the module.
+
+    Returns
+    -------
+    bool
+    """
+    return name in sys.modules or importlib.util.find_spec(name) is not None
@@ -0,0 +1,133 @@
+from pyergast import schema
+
+# Datasets kept by a local source, and how they are partitioned
+REFERENCE_DATASETS = ('drivers', 'constructors', 'circuits')
+SEASON_DATASETS = ('schedule',)
+ROUND_DATASETS = ('results', 'qualifying', 'laps', 'pit_stops', 'driver_standings', 'constructor_standings')
+
+
+class LocalSource:
+    """
+    Answers the pyergast functions from locally stored datasets instead of the API.
+
+    Subclasses provide the storage through `read` and `partitions`. The datasets hold the frames returned by
+    the pyergast functions: 'drivers', 'constructors' and 'circuits' as returned by `get_drivers()` and co,
+    'schedule' partitioned by season, and 'results', 'qualifying', 'laps', 'pit_stops', 'driver_standings' and
+    'constructor_standings' partitioned by season and round, with integer `season` and `round` columns in front.
+    Frames are returned with the types of `pyergast.schema`, which are restored after rows of several
+    partitions are put together.
+    """
+
+    def read(self, dataset, season=None, round=None):
+        """
+        Returns the rows of a dataset, optionally restricted to a season or a round.
+        """
+        raise NotImplementedError
+
+    def partitions(self, dataset):
+        """
+        Returns the sorted (season, round) pairs stored for a dataset. Round is None for seasonal datasets.
+        """
+        raise NotImplementedError
+
+    def _last(self, dataset, season=None):
+        keys = [key for key in self.partitions(dataset) if season is None or key[0] == season]
+        assert keys, 'No {} stored locally{}'.format(dataset, '' if season is None else ' for ' + str(season))
+        return keys[-1]
+
+    def _round(self, dataset, season, race):
+        # Rows of a single round without the partition columns, like the API returns them
+        frame = self._read(dataset, season, race)
+        return frame.drop(columns=['season', 'round']).reset_index(drop=True)
+
+    def _read(self, dataset, season=None, round=None):
+        return schema.apply(self.read(dataset, season, round), dataset)
+
+    def _participants(self, table, column, key, year, race):
+        frame = self._read(table)
+        if not year:
+            return frame
+        if table == 'circuits':
+            source = self.read('schedule', year)
+            if race:
+                source = source[source['round'].astype(int) == race]
+        else:
+            source = self.read('results', year, race)
+        return frame[frame[key].isin(source[column])].reset_index(drop=True)
+
+    def get_drivers(self, year=None, race=None):
+        return self._participants('drivers', 'driverID', 'driverId', year, race)
+
+    def get_constructors(self, year=None, race=None):
+        return self._participants('constructors', 'constructorID', 'constructorId', year, race)
+
+    def get_circuits(self, year=None, race=None):
+        return self._participants('circuits', 'circuitID', 'circuitId', year, race)
+
+    def get_race_result(self, year=None, race=None):
+        if year and race:
+            return self._round('results', year, race)
+        if year:
+            return self._read('results', year)
+        assert not race, 'You must specify a year along with a race'
+        return self._round('results', *self._last('results'))
+
+    def get_qualifying_result(self, year=None, race=None):
+        if year:
+            assert year >= 1996, 'Qualifying data only available starting from 1996'
+        if year and race:
+            frame = self._round('qualifying', year, race)
+        elif year:
+            frame = self._read('qualifying', year)
+        else:
+            frame = self._round('qualifying', *self._last('qualifying'))
+        # Drop the sessions that did not exist yet, as the API does
+        return frame.drop(columns=[c for c in ('Q2', 'Q3') if c in frame and frame[c].isna().all()])
+
+    def get_lap_times(self, year, race, driver=None):
+        assert year >= 1996, 'Lap times only available starting from 1996'
+        frame = self._round('laps', year, race)
+        if driver:
+            frame = frame[frame['driverID'] == driver].reset_index(drop=True)
+        return frame
+
+    def get_pit_stops(self, year, race, driver=None):
+        assert year >= 2011, 'Pit stops only available starting from 2011'
+        frame = self._round('pit_stops', year, race)
+        if driver:
+            frame = frame[frame['driverID'] == driver].reset_index(drop=True)
+        return frame
+
+    def get_schedule(self, year=None):
+        if not year:
+            year = self._last('schedule')[0]
+        return self._read('schedule', year)
+
+    def _standings(self, dataset, year, race):
+        if not race:
+            year, race = self._last(dataset, year or None)
+        return self._round(dataset, year, race)
+
+    def driver_standings(self, year=None, race=None):
+        return self._standings('driver_standings', year, race)
+
+    def constructor_standings(self, year=None, race=None):
+        if year:
+            assert year >= 1958, 'Constructor standings only available starting 1958'
+        return self._standings('constructor_standings', year, race)
+
+    def _final_standings(self, dataset, column, value):
+        # End-of-season standings of one driver or constructor, one row per season
+        finals = dict(self.partitions(dataset))
+        frame = self._read(dataset)
+        frame = frame[frame[column] == value]
+        frame = frame[frame['round'] == frame['season'].map(finals)]
+        return frame.reset_index(drop=True)
+
+    def query_driver(self, driverid):
+        frame = self._final_standings('driver_standings', 'driverID', driverid)
+        return frame.drop(columns=['driverID'])
+
+    def query_constructor(self, constructorid):
+        frame = self._final_standings('constructor_standings', 'constructorID', constructorid)
+        return frame.rename(columns={'name': 'constructor'})
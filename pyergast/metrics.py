@@ -0,0 +1,313 @@
+"""
+Instrumentation of the requests sent to the API and of the frames built from their responses.
+
+Every request, sync or async, fires an event with its URL, status, size, network latency, decode time,
+cache outcome, retries and rate limiter wait; every frame built fires an event with its normalization time.
+Events go to the hooks registered with `add_hook`, and are aggregated into counters and histograms that can
+be read with `snapshot` or exported in the Prometheus text format with `prometheus`.
+Each event carries the path of pyergast functions it was fired under, see `traced` and `pyergast.profiling`.
+
+Example
+-------
+>>> from pyergast import metrics
+>>> metrics.add_hook(lambda event: print(event['url'], event.get('latency')))
+>>> print(metrics.prometheus())
+# TYPE pyergast_requests_total counter
+pyergast_requests_total{cache="off",status="200"} 3
+...
+"""
+import contextvars
+import functools
+import inspect
+import math
+import threading
+import time
+import warnings
+
+# Upper bounds of the histogram buckets, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, math.inf)
+
+_hooks = []
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+# The pyergast functions being run, outermost first, see `traced`
+_path = contextvars.ContextVar('pyergast_path', default=())
+
+# Time spent flattening records in each thread, see `flattening`
+_flatten = threading.local()
+
+
+def add_hook(callback):
+    """
+    Registers a function called with the event of every request and every frame built.
+
+    Request events are dicts with `kind` 'request', `url`, `status` (None when no response came back),
+    `bytes`, `latency` and `wait` (network time and rate limiter wait, 0 when no request was sent),
+    `decode`, `cache` ('hit', 'miss' or 'off'), `coalesced` (True when the response of a concurrent
+    identical request was shared) and `retries`. Frame events have `kind` 'normalize', `function`,
+    `seconds`, the part of it spent in `flatten` and `rows`. Call events, fired when a function decorated
+    with `traced` returns, have `kind` 'call', `function` and `seconds`. Every event has the `path` of
+    the functions it was fired under, outermost first. Times are in seconds.
+
+    Parameters
+    ----------
+    callback: callable
+        A function taking an event. Hooks run in the thread or event loop of the request, so they should be quick.
+    """
+    with _lock:
+        _hooks.append(callback)
+
+
+def remove_hook(callback):
+    """
+    Unregisters a function registered with `add_hook`.
+    """
+    with _lock:
+        _hooks.remove(callback)
+
+
+def request(url, status=None, size=0, latency=0, decode=0, cache='off', coalesced=False, retries=0, wait=0):
+    """
+    Records a request, see `add_hook` for the parameters.
+    """
+    event = {'kind': 'request', 'url': url, 'status': status, 'bytes': size, 'latency': latency,
+             'decode': decode, 'cache': cache, 'coalesced': coalesced, 'retries': retries, 'wait': wait,
+             'path': _path.get()}
+    sent = cache != 'hit' and not coalesced
+    with _lock:
+        _count('pyergast_requests_total', {'status': str(status), 'cache': cache})
+        _count('pyergast_response_bytes_total', {}, size)
+        _observe('pyergast_decode_seconds', {}, decode)
+        if coalesced:
+            _count('pyergast_coalesced_total', {})
+        if sent:
+            _count('pyergast_retries_total', {}, retries)
+            _observe('pyergast_request_seconds', {}, latency)
+            _observe('pyergast_ratelimit_wait_seconds', {}, wait)
+        hooks = list(_hooks)
+    _fire(hooks, event)
+
+
+def normalize(function, seconds, rows, flatten=0):
+    """
+    Records the building of a frame, see `add_hook` for the parameters.
+    """
+    event = {'kind': 'normalize', 'function': function, 'seconds': seconds, 'flatten': flatten, 'rows': rows,
+             'path': _path.get()}
+    with _lock:
+        _observe('pyergast_normalize_seconds', {'function': function}, seconds)
+        _observe('pyergast_flatten_seconds', {'function': function}, flatten)
+        _count('pyergast_rows_total', {'function': function}, rows)
+        hooks = list(_hooks)
+    _fire(hooks, event)
+
+
+def timed(function):
+    """
+    Decorator recording the time a frame builder takes, e.g. `_race_result_frame` as 'race_result'.
+    """
+    name = function.__name__.strip('_')
+    name = name[:-len('_frame')] if name.endswith('_frame') else name
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        flattened = flatten_time()
+        start = time.perf_counter()
+        frame = function(*args, **kwargs)
+        normalize(name, time.perf_counter() - start, len(frame), flatten_time() - flattened)
+        return frame
+    return wrapper
+
+
+def flattening(function):
+    """
+    Decorator adding the time a function takes to the flattening time of its thread, see `flatten_time`.
+    Calls nested in another flattening function are counted once.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if getattr(_flatten, 'running', False):
+            return function(*args, **kwargs)
+        _flatten.running = True
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _flatten.seconds = flatten_time() + time.perf_counter() - start
+            _flatten.running = False
+    return wrapper
+
+
+def flatten_time():
+    """
+    Returns the seconds the current thread has spent flattening records, see `flattening`.
+    """
+    return getattr(_flatten, 'seconds', 0.0)
+
+
+def traced(function):
+    """
+    Decorator adding a pyergast function, or coroutine function, to the `path` of the events fired
+    while it runs, and firing a call event with its duration when it returns.
+    """
+    def enter():
+        return _path.set(_path.get() + (function.__name__,)), time.perf_counter()
+
+    def leave(token, start):
+        event = {'kind': 'call', 'function': function.__name__, 'seconds': time.perf_counter() - start,
+                 'path': _path.get()}
+        _path.reset(token)
+        with _lock:
+            hooks = list(_hooks)
+        _fire(hooks, event)
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def coroutine(*args, **kwargs):
+            token, start = enter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                leave(token, start)
+        return coroutine
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        token, start = enter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            leave(token, start)
+    return wrapper
+
+
+def in_context(function):
+    """
+    Wraps a function to be run on worker threads, so that its events keep the `path` of the caller.
+
+    Parameters
+    ----------
+    function: callable
+        The function submitted to the threads, e.g. of a `concurrent.futures.ThreadPoolExecutor`.
+
+    Returns
+    -------
+    callable
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # A context cannot be entered by two threads at once, so each call runs in its own copy
+        return context.copy().run(function, *args, **kwargs)
+    return wrapper
+
+
+def _fire(hooks, event):
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception as error:
+            warnings.warn('Metrics hook {!r} failed: {!r}'.format(hook, error))
+
+
+def _series(name, labels):
+    if not labels:
+        return name
+    return '{}{{{}}}'.format(name, ','.join('{}="{}"'.format(key, labels[key]) for key in sorted(labels)))
+
+
+def _count(name, labels, value=1):
+    key = (name, _series(name, labels))
+    _counters[key] = _counters.get(key, 0) + value
+
+
+def _observe(name, labels, value):
+    key = (name, tuple(sorted(labels.items())))
+    histogram = _histograms.get(key)
+    if histogram is None:
+        histogram = _histograms[key] = {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0}
+    for index, bound in enumerate(BUCKETS):
+        if value <= bound:
+            histogram['buckets'][index] += 1
+            break
+    histogram['sum'] += value
+    histogram['count'] += 1
+
+
+def snapshot():
+    """
+    Returns the counters and histograms recorded since the last `reset`.
+
+    Returns
+    -------
+    dict
+        'counters' maps each series, e.g. 'pyergast_requests_total{cache="off",status="200"}', to its value.
+        'histograms' maps each series to its 'sum', 'count' and the cumulative count of each bucket, by upper bound.
+
+    Example
+    -------
+    >>> pyergast.metrics.snapshot()['histograms']['pyergast_request_seconds']['count']
+    3
+    """
+    with _lock:
+        counters = {series: value for (name, series), value in sorted(_counters.items())}
+        histograms = {}
+        for (name, labels), histogram in sorted(_histograms.items()):
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(BUCKETS, histogram['buckets']):
+                cumulative += count
+                buckets[bound] = cumulative
+            histograms[_series(name, dict(labels))] = {'sum': histogram['sum'], 'count': histogram['count'],
+                                                       'buckets': buckets}
+    return {'counters': counters, 'histograms': histograms}
+
+
+def prometheus():
+    """
+    Exports the counters and histograms in the Prometheus text format, e.g. to be served on a `/metrics` endpoint.
+
+    Returns
+    -------
+    str
+    """
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, dict(histogram, buckets=list(histogram['buckets'])))
+                            for key, histogram in _histograms.items())
+    lines = []
+    typed = set()
+    for (name, series), value in counters:
+        if name not in typed:
+            lines.append('# TYPE {} counter'.format(name))
+            typed.add(name)
+        lines.append('{} {}'.format(series, _number(value)))
+    for (name, labels), histogram in histograms:
+        if name not in typed:
+            lines.append('# TYPE {} histogram'.format(name))
+            typed.add(name)
+        labels = dict(labels)
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram['buckets']):
+            cumulative += count
+            le = '+Inf' if bound == math.inf else _number(bound)
+            lines.append('{} {}'.format(_series(name + '_bucket', dict(labels, le=le)), cumulative))
+        lines.append('{} {}'.format(_series(name + '_sum', labels), _number(histogram['sum'])))
+        lines.append('{} {}'.format(_series(name + '_count', labels), histogram['count']))
+    return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def reset():
+    """
+    Clears the counters and histograms. Hooks stay registered.
+    """
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
@@ -0,0 +1,196 @@
+import collections
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from pyergast import metrics, revalidate, transport
+
+# Settings of the paginated fetches, changed through `configure`
+_settings = {
+    'limit': 1000,
+    'max_workers': 4,
+}
+
+
+def configure(limit=None, max_workers=None):
+    """
+    Changes how results spanning several pages are fetched.
+
+    Parameters
+    ----------
+    limit: int
+        An optional parameter that specifies the number of rows requested per page. Ergast caps it at 1000.
+    max_workers: int
+        An optional parameter that specifies how many pages are fetched concurrently.
+
+    Returns
+    -------
+    dict
+        The settings now in effect.
+    """
+    if limit is not None:
+        _settings['limit'] = limit
+    if max_workers is not None:
+        _settings['max_workers'] = max_workers
+    return dict(_settings)
+
+
+def page_url(url, offset, limit):
+    """
+    Returns the URL of a page of a query, replacing any `offset` and `limit` already in it.
+
+    Example
+    -------
+    >>> pyergast.pagination.page_url('http://ergast.com/api/f1/2014/results.json', 30, 30)
+    'http://ergast.com/api/f1/2014/results.json?limit=30&offset=30'
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ('limit', 'offset')]
+    query += [('limit', str(limit)), ('offset', str(offset))]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+def _identity(item):
+    # Races and standings lists are identified by season and round, laps by their number
+    if 'season' in item and 'round' in item:
+        return item['season'], item['round']
+    if 'number' in item and 'Timings' in item:
+        return item['number']
+    return None
+
+
+def _extend(target, items):
+    # A race or lap split between two pages is merged back into a single item
+    for item in items:
+        key = _identity(item) if target else None
+        if key is not None and key == _identity(target[-1]):
+            last = target[-1]
+            for name, value in item.items():
+                if isinstance(value, list) and isinstance(last.get(name), list):
+                    _extend(last[name], value)
+        else:
+            target.append(item)
+
+
+def _table(payload):
+    # The single list inside the *Table entry of MRData, e.g. RaceTable.Races
+    mrdata = payload['MRData']
+    for name, table in mrdata.items():
+        if name.endswith('Table'):
+            for key, value in table.items():
+                if isinstance(value, list):
+                    return value
+    return None
+
+
+def merge(pages):
+    """
+    Stitches pages of a query together, in order, into a single response.
+    Races, standings lists and laps split between two pages are merged back together.
+
+    Parameters
+    ----------
+    pages: list
+        The decoded pages, first page first.
+
+    Returns
+    -------
+    dict
+        The first page, with the rows of every page. Pages kept for revalidation give the same payload
+        for as long as they do not change, see `pyergast.revalidate.merged`.
+    """
+    return revalidate.merged(pages, _merge)
+
+
+def _merge(pages):
+    # Pages kept for revalidation are shared, the rows are stitched together in copies of them
+    pages = [copy.deepcopy(page) if revalidate.stored(page) else page for page in pages]
+    result = pages[0]
+    rows = _table(result)
+    for page in pages[1:]:
+        _extend(rows, _table(page))
+    result['MRData']['offset'] = '0'
+    result['MRData']['limit'] = result['MRData'].get('total', str(len(rows)))
+    return result
+
+
+def _total(payload):
+    return int(payload['MRData'].get('total', 0))
+
+
+def iter_pages(url, limit=None, max_workers=1):
+    """
+    Fetches the pages of a query in order, so that large results can be processed as they arrive
+    and never need to be held in memory all at once.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the query, without `limit` and `offset`.
+    limit: int
+        An optional parameter that specifies the number of rows per page.
+    max_workers: int
+        An optional parameter that specifies how many pages are fetched ahead of the one being processed.
+
+    Yields
+    ------
+    dict
+        Each decoded page, first page first.
+
+    Example
+    -------
+    >>> for page in pyergast.pagination.iter_pages('http://ergast.com/api/f1/2019/1/laps.json', limit=100):
+    ...     print(page['MRData']['offset'])
+    0
+    100
+    ...
+    """
+    limit = limit or _settings['limit']
+    first = transport.get_json(page_url(url, 0, limit))
+    yield first
+    urls = [page_url(url, offset, limit) for offset in range(limit, _total(first), limit)]
+    if max_workers <= 1:
+        for page in urls:
+            yield transport.get_json(page)
+        return
+    # At most `max_workers` pages are in flight or waiting to be processed
+    fetch = metrics.in_context(transport.get_json)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+        for page in urls:
+            pending.append(executor.submit(fetch, page))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def get_all(url, limit=None, max_workers=None):
+    """
+    Fetches every page of a query and stitches them together.
+    The first page tells how many rows there are, the remaining pages are then fetched concurrently.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the query, without `limit` and `offset`.
+    limit: int
+        An optional parameter that specifies the number of rows per page.
+    max_workers: int
+        An optional parameter that specifies how many pages are fetched concurrently.
+
+    Returns
+    -------
+    dict
+        The decoded response holding every row, see `merge`.
+    """
+    limit = limit or _settings['limit']
+    max_workers = max_workers or _settings['max_workers']
+    first = transport.get_json(page_url(url, 0, limit))
+    offsets = range(limit, _total(first), limit)
+    if not offsets:
+        return first
+    urls = [page_url(url, offset, limit) for offset in offsets]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        pages = list(executor.map(metrics.in_context(transport.get_json), urls))
+    return merge([first] + pages)
@@ -0,0 +1,188 @@
+"""
+Breakdown of the time pyergast functions spend in each stage of their pipeline, built from the events
+of `pyergast.metrics`.
+
+Inside a `profile` block, the time of every call is split by function into
+    network: waiting for responses, see `pyergast.transport`
+    ratelimit: waiting for the rate limiter, see `pyergast.ratelimit`
+    decode: decoding JSON bodies, see `pyergast.decode`
+    flatten: extracting columns from the decoded records, see `pyergast.flatten`
+    frame: converting the columns and building DataFrames, see `pyergast.schema`
+    other: the rest of the time of the function itself
+Functions run on worker threads, e.g. by `get_race_results`, are nested under the function that started them.
+Calls made by other threads or coroutines while the block runs are left out of it, see `profile`.
+
+Example
+-------
+>>> with pyergast.profile() as p:
+...     pyergast.get_race_results(2014)
+>>> p.report()
+                  calls     total   network  ratelimit    decode   flatten     frame     other
+function
+get_race_results      1  5.203188  0.000000   0.000000  0.000000  0.000000  0.000000  0.001544
+get_race_result      19  5.106914  4.810247   0.000000  0.021840  0.121802  0.132573  0.020452
+get_schedule          1  0.095105  0.089310   0.000000  0.001210  0.000845  0.002612  0.001128
+>>> p.flamegraph('profile.folded')  # e.g. `flamegraph.pl profile.folded > profile.svg`
+"""
+import contextlib
+import contextvars
+import threading
+
+from pyergast import lazy, metrics
+
+# Imported on first use, see `pyergast.lazy`
+pd = lazy.module('pandas')
+
+STAGES = ('network', 'ratelimit', 'decode', 'flatten', 'frame')
+
+# Function of the events fired outside any pyergast function, e.g. by `pyergast.transport.get_json`
+UNTRACED = '<untraced>'
+
+# The profiles of the `profile` blocks being run, outermost first
+_active = contextvars.ContextVar('pyergast_profiles', default=())
+
+
+class Profile:
+    """
+    The time spent in each stage by the pyergast functions called inside a `profile` block.
+    Times of concurrent calls add up, so the total of a function can exceed the duration of the block.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # By path of functions, outermost first: the calls and their seconds, and the seconds of each stage
+        self._calls = {}
+        self._stages = {}
+
+    def record(self, event):
+        """
+        Adds an event of `pyergast.metrics` to the profile, see `pyergast.metrics.add_hook`.
+        """
+        path = event['path'] or (UNTRACED,)
+        with self._lock:
+            if event['kind'] == 'call':
+                calls = self._calls.setdefault(path, [0, 0.0])
+                calls[0] += 1
+                calls[1] += event['seconds']
+                return
+            stages = self._stages.setdefault(path, dict.fromkeys(STAGES, 0.0))
+            if event['kind'] == 'request':
+                stages['network'] += event['latency']
+                stages['ratelimit'] += event['wait']
+                stages['decode'] += event['decode']
+            elif event['kind'] == 'normalize':
+                stages['flatten'] += event['flatten']
+                stages['frame'] += event['seconds'] - event['flatten']
+
+    def _paths(self):
+        # Calls, total and seconds of each stage of every path, the rest of the time of the path itself as 'other'
+        with self._lock:
+            calls = {path: list(value) for path, value in self._calls.items()}
+            stages = {path: dict(value) for path, value in self._stages.items()}
+        result = {}
+        for path in set(calls) | set(stages):
+            count, total = calls.get(path, (0, None))
+            seconds = stages.get(path, dict.fromkeys(STAGES, 0.0))
+            if total is None:
+                total = sum(seconds.values())
+            children = sum(value[1] for child, value in calls.items() if child[:-1] == path)
+            other = max(total - sum(seconds.values()) - children, 0.0)
+            result[path] = dict(calls=count, total=total, **seconds, other=other)
+        return result
+
+    def report(self, sort='total'):
+        """
+        Returns the time spent by each function, summed over every path it was called from.
+
+        Parameters
+        ----------
+        sort: str
+            The column the functions are sorted by, in descending order.
+
+        Returns
+        -------
+        pandas.DataFrame
+
+        Index:
+            function: str
+
+        Columns:
+            calls: int
+            total: float
+            network: float
+            ratelimit: float
+            decode: float
+            flatten: float
+            frame: float
+            other: float
+        """
+        columns = ['calls', 'total', *STAGES, 'other']
+        rows = [dict(values, function=path[-1]) for path, values in self._paths().items()]
+        if not rows:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name='function'))
+        frame = pd.DataFrame(rows).groupby('function')[columns].sum()
+        return frame.sort_values(sort, ascending=False, kind='stable')
+
+    def flamegraph(self, path=None):
+        """
+        Returns the profile in the folded stack format read by flame graph tools, e.g. flamegraph.pl or speedscope.
+        Each line is a path of functions ending with a stage, and its time in microseconds.
+
+        Parameters
+        ----------
+        path: str
+            An optional file the profile is written to.
+
+        Returns
+        -------
+        str
+        """
+        lines = []
+        for functions, values in sorted(self._paths().items()):
+            for stage in STAGES + ('other',):
+                microseconds = round(values[stage] * 1e6)
+                if microseconds:
+                    lines.append('{} {}'.format(';'.join(functions + (stage,)), microseconds))
+        text = '\n'.join(lines) + '\n' if lines else ''
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+        return text
+
+    def __str__(self):
+        return self.report().to_string()
+
+
+@contextlib.contextmanager
+def profile():
+    """
+    Profiles every pyergast function called inside a `with` block.
+
+    Hooks of `pyergast.metrics` see the events of the whole process, so the events of the block are told apart
+    by their context: calls made by the block itself, by the worker threads of pyergast functions and by the
+    coroutines it runs are profiled, while those of other threads are not. Threads the block starts on its
+    own are only profiled when their functions are wrapped with `pyergast.metrics.in_context`.
+
+    Yields
+    ------
+    Profile
+
+    Example
+    -------
+    >>> with pyergast.profiling.profile() as p:
+    ...     pyergast.get_lap_times(2019, 1)
+    >>> print(p)
+    """
+    result = Profile()
+
+    def record(event):
+        if result in _active.get():
+            result.record(event)
+
+    token = _active.set(_active.get() + (result,))
+    metrics.add_hook(record)
+    try:
+        yield result
+    finally:
+        metrics.remove_hook(record)
+        _active.reset(token)
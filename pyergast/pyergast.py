@@ -1,8 +1,113 @@
-import requests
-import pandas as pd
+import functools
+import time
 
+from pyergast import (bulk, flatten, lazy, metrics, pagination, profiling, reference, revalidate, schema, search,
+                      transport)
 
-def get_drivers(year=None, race=None):
+# Imported on first use, see `pyergast.lazy`
+pd = lazy.module('pandas')
+pa = lazy.module('pyarrow')
+
+# Local source answering the functions instead of the API, see `use_source`
+_source = None
+
+
+def use_source(source):
+    """
+    Makes every function answer from a local source instead of the API, without any network I/O.
+    Pass None to query the API again.
+
+    Parameters
+    ----------
+    source: pyergast.local.LocalSource
+        The local source, e.g. a `pyergast.warehouse.Warehouse`.
+
+    Example
+    -------
+    >>> from pyergast import warehouse
+    >>> pyergast.use_source(warehouse.Warehouse('~/ergast'))
+    >>> pyergast.get_race_result(2014, 4)  # read from the local Parquet dataset
+    """
+    global _source
+    _source = source
+    reference.clear()
+
+
+def profile():
+    """
+    Breaks down the time spent by every function called inside a `with` block into network, rate limiter wait,
+    JSON decoding, flattening and DataFrame construction, see `pyergast.profiling`.
+
+    Returns
+    -------
+    pyergast.profiling.Profile
+        As the target of the `with` statement.
+
+    Example
+    -------
+    >>> with pyergast.profile() as p:
+    ...     pyergast.get_race_results(2014)
+    >>> p.report()
+    >>> p.flamegraph('profile.folded')
+    """
+    return profiling.profile()
+
+
+def _local(function):
+    # Answers from the local source set with `use_source`, when there is one, and is traced in either case
+    @metrics.traced
+    @functools.wraps(function)
+    def wrapper(*args, output='frame', **kwargs):
+        _check_output(output)
+        if _source is not None:
+            frame = getattr(_source, function.__name__)(*args, **kwargs)
+            return _convert(frame, output)
+        return function(*args, output=output, **kwargs)
+    return wrapper
+
+
+def _check_output(output):
+    assert output in ('frame', 'records', 'arrow', 'polars'), \
+        "output must be one of 'frame', 'records', 'arrow' or 'polars'"
+
+
+def _convert(frame, output):
+    # A frame built by pandas anyway, e.g. read from a local source, in the output asked for,
+    # with records of the same types as those built without pandas
+    if output == 'records':
+        return schema.frame_records(frame)
+    if output in ('arrow', 'polars'):
+        assert lazy.available('pyarrow'), \
+            "output='{}' requires pyarrow, install it with `pip install pyarrow`".format(output)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        return schema.to_polars(table) if output == 'polars' else table
+    return frame
+
+
+def _with_output(function, output):
+    # The fetcher of a bulk query, only given `output` when it is not a frame.
+    # Rounds are fetched as Arrow tables for Polars, see `pyergast.bulk.fan_out`.
+    _check_output(output)
+    if output == 'frame':
+        return function
+    return functools.partial(function, output='arrow' if output == 'polars' else output)
+
+
+def _schedule(output):
+    # The schedule fetcher of a bulk query, only reading the rounds, so records unless a frame is asked for
+    return _with_output(get_schedule, 'frame' if output == 'frame' else 'records')
+
+
+def _rows_frame(rows, dataset, output):
+    # A column per key of the JSON records, in order of appearance, as pandas builds a frame from a list of dicts
+    if output != 'frame':
+        names = dict.fromkeys(name for row in rows for name in row)
+        return schema.build({name: [row.get(name) for row in rows] for name in names}, dataset, output)
+    return schema.apply(pd.DataFrame(rows), dataset)
+
+
+@_local
+def get_drivers(year=None, race=None, *, output='frame'):
     """
     Queries the API to obtain the list of drivers in a pandas dataframe format.
     By default, this function returns the list of all drivers who have ever driven in F1.
@@ -15,10 +120,14 @@ def get_drivers(year=None, race=None):
         An optional parameter that specifies the year to be queried.
     race: int
         An optional parameter that specifies the round of a year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -30,8 +139,8 @@ def get_drivers(year=None, race=None):
         url: str
         givenName: str
         familyName: str
-        dateOfBirth: str
-        nationality: str
+        dateOfBirth: datetime
+        nationality: category
 
     Example
     -------
@@ -64,22 +173,28 @@ def get_drivers(year=None, race=None):
 
     [24 rows x 8 columns]
     """
+    url = _drivers_url(year, race)
+    return _drivers_frame(pagination.get_all(url), output)
+
+
+def _drivers_url(year, race):
     if year and race:
-        url = 'http://ergast.com/api/f1/{}/drivers.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/{}/drivers.json'.format(year, race))
     elif year:
-        url = 'http://ergast.com/api/f1/{}/drivers.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/drivers.json'.format(year))
     else:
-        url = 'http://ergast.com/api/f1/drivers.json?limit=1000'
-    r = requests.get(url)
+        url = transport.api_url('drivers.json')
+    return url
 
-    assert r.status_code == 200, 'Cannot connect to Ergast API'
-    drivers = r.json()
-    result = pd.DataFrame(drivers["MRData"]["DriverTable"]['Drivers'])
 
-    return result
+@revalidate.memo
+@metrics.timed
+def _drivers_frame(payload, output='frame'):
+    return _rows_frame(payload["MRData"]["DriverTable"]['Drivers'], 'drivers', output)
 
 
-def get_constructors(year=None, race=None):
+@_local
+def get_constructors(year=None, race=None, *, output='frame'):
     """
     Queries the API to obtain the list of constructors in a pandas dataframe format.
     By default, this function returns the list of all constructors who have ever driven in F1.
@@ -92,10 +207,14 @@ def get_constructors(year=None, race=None):
         An optional parameter that specifies the year to be queried.
     race: int
         An optional parameter that specifies the round of a year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -104,7 +223,7 @@ def get_constructors(year=None, race=None):
         constructorId: str
         url: str
         name: str
-        nationality: str
+        nationality: category
 
     Example
     -------
@@ -121,22 +240,28 @@ def get_constructors(year=None, race=None):
     8        toyota         http://en.wikipedia.org/wiki/Toyota_Racing    Toyota    Japanese
     9      williams  http://en.wikipedia.org/wiki/Williams_Grand_Pr...  Williams     British
     """
+    url = _constructors_url(year, race)
+    return _constructors_frame(pagination.get_all(url), output)
+
+
+def _constructors_url(year, race):
     if year and race:
-        url = 'http://ergast.com/api/f1/{}/constructors.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/{}/constructors.json'.format(year, race))
     elif year:
-        url = 'http://ergast.com/api/f1/{}/constructors.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/constructors.json'.format(year))
     else:
-        url = 'http://ergast.com/api/f1/constructors.json?limit=1000'
+        url = transport.api_url('constructors.json')
+    return url
 
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    constructors = r.json()
-    result = pd.DataFrame(constructors["MRData"]["ConstructorTable"]['Constructors'])
 
-    return result
+@revalidate.memo
+@metrics.timed
+def _constructors_frame(payload, output='frame'):
+    return _rows_frame(payload["MRData"]["ConstructorTable"]['Constructors'], 'constructors', output)
 
 
-def get_circuits(year=None, race=None):
+@_local
+def get_circuits(year=None, race=None, *, output='frame'):
     """
     Queries the API to obtain the list of circuits in a pandas dataframe format.
     By default, this function returns the list of all circuits ever used in F1.
@@ -149,10 +274,14 @@ def get_circuits(year=None, race=None):
         An optional parameter that specifies the year to be queried.
     race: int
         An optional parameter that specifies the round of a year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -161,10 +290,10 @@ def get_circuits(year=None, race=None):
         circuitId: str
         url: str
         circuitName: str
-        Latitude: int
-        Longtitude: int
-        Locality: str
-        Country: str
+        Latitude: float
+        Longtitude: float
+        Locality: category
+        Country: category
 
     Example
     -------
@@ -189,37 +318,79 @@ def get_circuits(year=None, race=None):
 
     [16 rows x 7 columns]
     """
+    url = _circuits_url(year, race)
+    return _circuits_frame(pagination.get_all(url), output)
+
+
+def _circuits_url(year, race):
     if year and race:
-        url = 'http://ergast.com/api/f1/{}/circuits.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/{}/circuits.json'.format(year, race))
     elif year:
-        url = 'http://ergast.com/api/f1/{}/circuits.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/circuits.json'.format(year))
     else:
-        url = 'http://ergast.com/api/f1/circuits.json?limit=1000'
-
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    circuits = r.json()
-    result = pd.DataFrame(circuits["MRData"]["CircuitTable"]["Circuits"])
-
-    # Grabbing latitude, longtitude, locality and country separately
-    geo = result['Location']
-    latitude, longtitude, locality, country = ([] for i in range(4))
-    for track in geo:
-        latitude.append(track['lat'])
-        longtitude.append(track['long'])
-        locality.append(track['locality'])
-        country.append(track['country'])
-    result['Latitude'] = latitude
-    result['Longtitude'] = longtitude
-    result['Locality'] = locality
-    result['Country'] = country
-    result = result.drop('Location', axis=1)
-    return result
-
-
-def find_driverid(firstname, lastname):
+        url = transport.api_url('circuits.json')
+    return url
+
+
+# Columns of each frame and the paths of their values in the JSON records, see `pyergast.flatten`
+_CIRCUIT_COLUMNS = {'circuitId': 'circuitId', 'url': 'url', 'circuitName': 'circuitName',
+                    'Latitude': 'Location.lat', 'Longtitude': 'Location.long',
+                    'Locality': 'Location.locality', 'Country': 'Location.country'}
+_DRIVER_COLUMNS = {'driverID': 'Driver.driverId', 'driver': ('Driver.givenName', 'Driver.familyName'),
+                   'nationality': 'Driver.nationality'}
+_RACE_COLUMNS = {'season': 'season', 'round': 'round'}
+_RESULT_COLUMNS = {'number': 'number', 'position': 'position', 'positionText': 'positionText', 'grid': 'grid',
+                   'points': 'points', **_DRIVER_COLUMNS, 'constructorID': 'Constructor.constructorId',
+                   'constructor': 'Constructor.name', 'laps': 'laps', 'status': 'status', 'Time': 'Time.millis'}
+_QUALIFYING_COLUMNS = {'number': 'number', 'position': 'position', **_DRIVER_COLUMNS,
+                       'constructorID': 'Constructor.constructorId', 'constructor': 'Constructor.name',
+                       'Q1': 'Q1', 'Q2': 'Q2', 'Q3': 'Q3'}
+_LAP_COLUMNS = {'lap': 'number'}
+_TIMING_COLUMNS = {'driverID': 'driverId', 'position': 'position', 'milliseconds': 'time'}
+_PIT_STOP_COLUMNS = {'driverID': 'driverId', 'stop': 'stop', 'lap': 'lap', 'time': 'time', 'milliseconds': 'duration'}
+_STANDING_COLUMNS = {'position': 'position', 'positionText': 'positionText', 'points': 'points', 'wins': 'wins'}
+_DRIVER_STANDING_COLUMNS = {**_STANDING_COLUMNS, **_DRIVER_COLUMNS,
+                            'constructorID': 'Constructors[0].constructorId', 'constructor': 'Constructors[0].name'}
+_CONSTRUCTOR_STANDING_COLUMNS = {**_STANDING_COLUMNS, 'constructorID': 'Constructor.constructorId',
+                                 'name': 'Constructor.name', 'nationality': 'Constructor.nationality'}
+
+
+@revalidate.memo
+@metrics.timed
+def _circuits_frame(payload, output='frame'):
+    circuits = payload["MRData"]["CircuitTable"]["Circuits"]
+    return flatten.frame(circuits, _CIRCUIT_COLUMNS, dataset='circuits', output=output)
+
+
+# The full lists of drivers, constructors and circuits are downloaded once per process and shared by the find_* functions
+# as frames, and as records for searches with output='records' made before any frame is loaded, which need no pandas
+reference.register('drivers', get_drivers)
+reference.register('constructors', get_constructors)
+reference.register('circuits', get_circuits)
+reference.register('drivers.records', functools.partial(get_drivers, output='records'))
+reference.register('constructors.records', functools.partial(get_constructors, output='records'))
+reference.register('circuits.records', functools.partial(get_circuits, output='records'))
+
+
+def _index(name, output):
+    # The search index of a reference table, over its records when records are asked for and no frame is loaded
+    if output == 'records' and not reference.table(name).loaded():
+        return search.index(name + '.records')
+    return search.index(name)
+
+
+def _found(index, positions, output):
+    # The rows of a reference table at some positions, in order, in the output asked for
+    rows = index.rows(sorted(positions))
+    return rows if isinstance(rows, list) else _convert(rows, output)
+
+
+@metrics.traced
+def find_driverid(firstname, lastname, *, output='frame'):
     """
     Searches the list of all drivers to find ones that are the same or similar to the input.
+    Either name may match the driver id or the family name, ignoring case and accents.
+    The list is downloaded and indexed on the first search and reused afterwards, see `pyergast.search`.
 
     Parameters
     ----------
@@ -227,10 +398,13 @@ def find_driverid(firstname, lastname):
         The first name of the driver
     lastname: str
         The last name of the driver
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts instead of a dataframe.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -242,8 +416,8 @@ def find_driverid(firstname, lastname):
         url: str
         givenName: str
         familyName: str
-        dateOfBirth: str
-        nationality: str
+        dateOfBirth: datetime
+        nationality: category
 
     Example
     -------
@@ -256,24 +430,31 @@ def find_driverid(firstname, lastname):
 
     [4 rows x 8 columns]
     """
-    dfDrivers = get_drivers()
-    result = dfDrivers[
-        dfDrivers['driverId'].str.contains(firstname.lower()) | dfDrivers['driverId'].str.contains(lastname.lower())]
-    return result
+    _check_output(output)
+    index = _index('drivers', output)
+    fields = ['driverId', 'familyName']
+    rows = index.contains(firstname, fields) | index.contains(lastname, fields)
+    return _found(index, rows, output)
 
 
-def find_constructorid(name):
+@metrics.traced
+def find_constructorid(name, *, output='frame'):
     """
     Searches the list of all constructors to find ones that are the same or similar to the input.
+    The name may match the constructor id or the constructor name, ignoring case and accents.
+    The list is downloaded and indexed on the first search and reused afterwards, see `pyergast.search`.
 
     Parameters
     ----------
     name: str
         The name of the constructor
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts instead of a dataframe.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -282,7 +463,7 @@ def find_constructorid(name):
         constructorId: str
         url: str
         name: str
-        nationality: str
+        nationality: category
 
     Example
     -------
@@ -298,23 +479,28 @@ def find_constructorid(name):
     118        lotus-pw    http://en.wikipedia.org/wiki/Team_Lotus  Lotus-Pratt &amp; Whitney     British
     191      team_lotus    http://en.wikipedia.org/wiki/Team_Lotus                 Team Lotus     British
     """
-    dfConstructors = get_constructors()
-    result = dfConstructors[dfConstructors['constructorId'].str.contains(name.lower())]
-    return result
+    _check_output(output)
+    index = _index('constructors', output)
+    return _found(index, index.contains(name), output)
 
 
-def find_circuitid(circuit):
+@metrics.traced
+def find_circuitid(circuit, *, output='frame'):
     """
-    Searches the list of all the circuits that are similar to the input
+    Searches the list of all the circuits that are similar to the input, ignoring case and accents.
+    The list is downloaded and indexed on the first search and reused afterwards, see `pyergast.search`.
 
     Parameters
     ----------
     circuit: str
         The name of the circuit. Actual circuit name, locality, or country are all accepted.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts instead of a dataframe.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -323,10 +509,10 @@ def find_circuitid(circuit):
         circuitId: str
         url: str
         circuitName: str
-        Latitude: int
-        Longtitude: int
-        Locality: str
-        Country: str
+        Latitude: float
+        Longtitude: float
+        Locality: category
+        Country: category
 
     Example
     -------
@@ -337,18 +523,69 @@ def find_circuitid(circuit):
 
     [2 rows x 7 columns]
     """
-    dfCircuits = get_circuits()
-    result = dfCircuits[dfCircuits['circuitId'].str.lower().str.contains(circuit.lower()) |
-                        dfCircuits['circuitName'].str.lower().str.contains(circuit.lower()) |
-                        dfCircuits['Locality'].str.lower().str.contains(circuit.lower()) |
-                        dfCircuits['Country'].str.lower().str.contains(circuit.lower())]
-    return result
+    _check_output(output)
+    index = _index('circuits', output)
+    return _found(index, index.contains(circuit), output)
+
+
+@metrics.traced
+def resolve_many(names, table='drivers', threshold=0.5, *, output='frame'):
+    """
+    Resolves free-text names to ids in one batch, using the best fuzzy match of each name.
+    Matching ignores case, accents and punctuation, and tolerates small typos.
+
+    Parameters
+    ----------
+    names: list
+        The names to be resolved.
+    table: str
+        The table to search, one of 'drivers', 'constructors' or 'circuits'.
+    threshold: float
+        The minimum score, between 0 and 1, of a match. Names without such a match get no id.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts instead of a dataframe.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
+    Index:
+        RangeIndex
 
-def get_race_result(year=None, race=None):
+    Columns:
+        query: str
+        id: str
+        score: float
+
+    Example
+    -------
+    >>> pyergast.resolve_many(['Kimi Raikkonen', 'Gutierrez', 'Hamiltn', 'Nobody'])
+                query          id     score
+    0  Kimi Raikkonen   raikkonen  1.000000
+    1       Gutierrez   gutierrez  1.000000
+    2         Hamiltn    hamilton  0.727273
+    3          Nobody         NaN  0.000000
+    """
+    _check_output(output)
+    index = _index(table, output)
+    id_column = index.column(search.ID_COLUMNS[table])
+    ids, scores = [], []
+    for name in names:
+        best = index.resolve(name, threshold)
+        ids.append(id_column[best[0]] if best else None)
+        scores.append(best[1] if best else 0.0)
+    columns = {'query': list(names), 'id': ids, 'score': scores}
+    return schema.build(columns, output=output)
+
+
+@_local
+def get_race_result(year=None, race=None, *, output='frame'):
     """
     Queries the API to return race results in a pandas dataframe format.
-    By default this method returns the most recent result
+    By default this method returns the most recent result.
+    If only the year parameter is specified, the results of every race of that year are returned
+    from a single season-wide query, with `season` and `round` columns in front.
 
     Parameters
     ----------
@@ -356,88 +593,97 @@ def get_race_result(year=None, race=None):
         An optional parameter that specifies the year to be queried.
     race: int
         An optional parameter that specifies the round of a year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
 
     Columns:
+        season: int (season-wide queries only)
+        round: int (season-wide queries only)
         number: int
         position: int
-        positionText: str
+        positionText: category
         grid: int
-        points: int
-        driverID: str
-        driver: str
-        nationality: str
-        constructorID: str
-        constructor: str
+        points: float
+        driverID: category
+        driver: category
+        nationality: category
+        constructorID: category
+        constructor: category
         laps: int
-        status: str
-        Time: dict
+        status: category
+        Time: timedelta
 
     Example
     -------
     >>> pyergast.get_race_result()
-       number position positionText grid  ...   constructor laps        status                                          Time
-    0      33        1            1    1  ...      Red Bull   55      Finished  {'millis': '5788645', 'time': '1:36:28.645'}
-    1      77        2            2    2  ...      Mercedes   55      Finished      {'millis': '5804621', 'time': '+15.976'}
-    2      44        3            3    3  ...      Mercedes   55      Finished      {'millis': '5807060', 'time': '+18.415'}
-    3      23        4            4    5  ...      Red Bull   55      Finished      {'millis': '5808632', 'time': '+19.987'}
-    4       4        5            5    4  ...       McLaren   55      Finished    {'millis': '5849374', 'time': '+1:00.729'}
-    5      55        6            6    6  ...       McLaren   55      Finished    {'millis': '5854307', 'time': '+1:05.662'}
-    6       3        7            7   11  ...       Renault   55      Finished    {'millis': '5862393', 'time': '+1:13.748'}
-    7      10        8            8    9  ...    AlphaTauri   55      Finished    {'millis': '5878363', 'time': '+1:29.718'}
-    8      31        9            9   10  ...       Renault   55      Finished      {'millis': '5799996', 'time': '+11.351'}
-    9      18       10           10    8  ...  Racing Point   55      Finished       {'millis': '5790314', 'time': '+1.669'}
-    10     26       11           11    7  ...    AlphaTauri   54        +1 Lap                                           NaN
-    11      7       12           12   15  ...    Alfa Romeo   54        +1 Lap                                           NaN
-    12     16       13           13   12  ...       Ferrari   54        +1 Lap                                           NaN
-    13      5       14           14   13  ...       Ferrari   54        +1 Lap                                           NaN
-    14     63       15           15   16  ...      Williams   54        +1 Lap                                           NaN
-    15     99       16           16   14  ...    Alfa Romeo   54        +1 Lap                                           NaN
-    16      6       17           17   18  ...      Williams   54        +1 Lap                                           NaN
-    17     20       18           18   20  ...  Haas F1 Team   54        +1 Lap                                           NaN
-    18     51       19           19   17  ...  Haas F1 Team   53       +2 Laps                                           NaN
-    19     11       20            R   19  ...  Racing Point    8  Transmission                                           NaN
+       number position positionText grid  ...   constructor laps        status                 Time
+    0      33        1            1    1  ...      Red Bull   55      Finished  0 days 01:36:28.645
+    1      77        2            2    2  ...      Mercedes   55      Finished  0 days 01:36:44.621
+    2      44        3            3    3  ...      Mercedes   55      Finished  0 days 01:36:47.060
+    3      23        4            4    5  ...      Red Bull   55      Finished  0 days 01:36:48.632
+    4       4        5            5    4  ...       McLaren   55      Finished  0 days 01:37:29.374
+    5      55        6            6    6  ...       McLaren   55      Finished  0 days 01:37:34.307
+    6       3        7            7   11  ...       Renault   55      Finished  0 days 01:37:42.393
+    7      10        8            8    9  ...    AlphaTauri   55      Finished  0 days 01:37:58.363
+    8      31        9            9   10  ...       Renault   55      Finished  0 days 01:36:39.996
+    9      18       10           10    8  ...  Racing Point   55      Finished  0 days 01:36:30.314
+    10     26       11           11    7  ...    AlphaTauri   54        +1 Lap                  NaT
+    11      7       12           12   15  ...    Alfa Romeo   54        +1 Lap                  NaT
+    12     16       13           13   12  ...       Ferrari   54        +1 Lap                  NaT
+    13      5       14           14   13  ...       Ferrari   54        +1 Lap                  NaT
+    14     63       15           15   16  ...      Williams   54        +1 Lap                  NaT
+    15     99       16           16   14  ...    Alfa Romeo   54        +1 Lap                  NaT
+    16      6       17           17   18  ...      Williams   54        +1 Lap                  NaT
+    17     20       18           18   20  ...  Haas F1 Team   54        +1 Lap                  NaT
+    18     51       19           19   17  ...  Haas F1 Team   53       +2 Laps                  NaT
+    19     11       20            R   19  ...  Racing Point    8  Transmission                  NaT
 
     [20 rows x 13 columns]
     """
-    if year or race:
-        assert year and race, 'You must specify both a year and a race'
-        url = 'http://ergast.com/api/f1/{}/{}/results.json?limit=1000'.format(year, race)
+    url = _race_result_url(year, race)
+    return _race_result_frame(pagination.get_all(url), season=bool(year and not race), output=output)
+
+
+def _race_result_url(year, race):
+    if year and race:
+        url = transport.api_url('{}/{}/results.json'.format(year, race))
+    elif year:
+        url = transport.api_url('{}/results.json'.format(year))
     else:
-        url = 'http://ergast.com/api/f1/current/last/results.json?limit=1000'
+        assert not race, 'You must specify a year along with a race'
+        url = transport.api_url('current/last/results.json')
+    return url
+
 
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    race_result = r.json()
-    result_dict = race_result["MRData"]['RaceTable']['Races'][0]['Results']
+@revalidate.memo
+@metrics.timed
+def _race_result_frame(payload, season=False, output='frame'):
+    return _races_frame(payload, 'Results', _RESULT_COLUMNS, season, 'results', output=output)
 
-    # Unpack the lists of dicts in result_dict and reformat the result
-    for driver in result_dict:
-        drive_dict = unpack_lists(driver)
-        driver_info = drive_dict[0]
-        constructor_info = drive_dict[1]
-        driver['driver'] = driver_info['givenName'] + ' ' + driver_info['familyName']
-        driver['driverID'] = driver_info['driverId']
-        driver['nationality'] = driver_info['nationality']
-        driver['constructor'] = constructor_info['name']
-        driver['constructorID'] = constructor_info['constructorId']
 
-    # Select the columns that are relevant to the race result
-    cols = ['number', 'position', 'positionText', 'grid', 'points', 'driverID', 'driver',
-            'nationality', 'constructorID', 'constructor', 'laps', 'status', 'Time']
-    return pd.DataFrame(result_dict)[cols]
+def _races_frame(payload, key, spec, season, dataset, optional=(), output='frame'):
+    # Flatten the results of every race into a single typed frame, with season and round columns in front
+    races = payload["MRData"]['RaceTable']['Races']
+    return flatten.nested(races, key, spec, _RACE_COLUMNS if season else None, optional=optional, dataset=dataset,
+                          output=output)
 
 
-def get_qualifying_result(year=None, race=None):
+@_local
+def get_qualifying_result(year=None, race=None, *, output='frame'):
     """
     Queries the API to return qualifying results in a pandas dataframe format.
-    By default this method returns the most recent result
+    By default this method returns the most recent result.
+    If only the year parameter is specified, the results of every qualifying session of that year are returned
+    from a single season-wide query, with `season` and `round` columns in front.
 
     Parameters
     ----------
@@ -445,85 +691,239 @@ def get_qualifying_result(year=None, race=None):
         An optional parameter that specifies the year to be queried.
     race: int
         An optional parameter that specifies the round of a year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
 
     Columns:
+        season: int (season-wide queries only)
+        round: int (season-wide queries only)
         number: int
         position: int
-        driverID: str
-        driver: str
-        nationality: str
-        constructorID: str
-        constructor: str
-        Q1: str
-        Q2: str
-        Q3: str
+        driverID: category
+        driver: category
+        nationality: category
+        constructorID: category
+        constructor: category
+        Q1: timedelta
+        Q2: timedelta
+        Q3: timedelta
 
     Example
     -------
     >>> pyergast.get_qualifying_result()
-       number position           driverID              driver  ...   constructor        Q1        Q2        Q3
-    0      33        1     max_verstappen      Max Verstappen  ...      Red Bull  1:35.993  1:35.641  1:35.246
-    1      77        2             bottas     Valtteri Bottas  ...      Mercedes  1:35.699  1:35.527  1:35.271
-    2      44        3           hamilton      Lewis Hamilton  ...      Mercedes  1:35.528  1:35.466  1:35.332
-    3       4        4             norris        Lando Norris  ...       McLaren  1:36.016  1:35.849  1:35.497
-    4      23        5              albon     Alexander Albon  ...      Red Bull  1:36.106  1:35.654  1:35.571
-    5      55        6              sainz        Carlos Sainz  ...       McLaren  1:36.517  1:36.192  1:35.815
-    6      26        7              kvyat        Daniil Kvyat  ...    AlphaTauri  1:36.459  1:36.214  1:35.963
-    7      18        8             stroll        Lance Stroll  ...  Racing Point  1:36.502  1:36.143  1:36.046
-    8      16        9            leclerc     Charles Leclerc  ...       Ferrari  1:35.881  1:35.932  1:36.065
-    9      10       10              gasly        Pierre Gasly  ...    AlphaTauri  1:36.545  1:36.282  1:36.242
-    10     31       11               ocon        Esteban Ocon  ...       Renault  1:36.783  1:36.359       NaN
-    11      3       12          ricciardo    Daniel Ricciardo  ...       Renault  1:36.704  1:36.406       NaN
-    12      5       13             vettel    Sebastian Vettel  ...       Ferrari  1:36.655  1:36.631       NaN
-    13     99       14         giovinazzi  Antonio Giovinazzi  ...    Alfa Romeo  1:37.075  1:38.248       NaN
-    14     11       15              perez        Sergio Pérez  ...  Racing Point  1:36.034       NaN       NaN
-    15      7       16          raikkonen      Kimi Räikkönen  ...    Alfa Romeo  1:37.555       NaN       NaN
-    16     20       17    kevin_magnussen     Kevin Magnussen  ...  Haas F1 Team  1:37.863       NaN       NaN
-    17     63       18            russell      George Russell  ...      Williams  1:38.045       NaN       NaN
-    18     51       19  pietro_fittipaldi   Pietro Fittipaldi  ...  Haas F1 Team  1:38.173       NaN       NaN
-    19      6       20             latifi     Nicholas Latifi  ...      Williams  1:38.443       NaN       NaN
+       number position           driverID              driver  ...   constructor                   Q1                   Q2                   Q3
+    0      33        1     max_verstappen      Max Verstappen  ...      Red Bull  0 days 00:01:35.993  0 days 00:01:35.641  0 days 00:01:35.246
+    1      77        2             bottas     Valtteri Bottas  ...      Mercedes  0 days 00:01:35.699  0 days 00:01:35.527  0 days 00:01:35.271
+    2      44        3           hamilton      Lewis Hamilton  ...      Mercedes  0 days 00:01:35.528  0 days 00:01:35.466  0 days 00:01:35.332
+    3       4        4             norris        Lando Norris  ...       McLaren  0 days 00:01:36.016  0 days 00:01:35.849  0 days 00:01:35.497
+    4      23        5              albon     Alexander Albon  ...      Red Bull  0 days 00:01:36.106  0 days 00:01:35.654  0 days 00:01:35.571
+    5      55        6              sainz        Carlos Sainz  ...       McLaren  0 days 00:01:36.517  0 days 00:01:36.192  0 days 00:01:35.815
+    6      26        7              kvyat        Daniil Kvyat  ...    AlphaTauri  0 days 00:01:36.459  0 days 00:01:36.214  0 days 00:01:35.963
+    7      18        8             stroll        Lance Stroll  ...  Racing Point  0 days 00:01:36.502  0 days 00:01:36.143  0 days 00:01:36.046
+    8      16        9            leclerc     Charles Leclerc  ...       Ferrari  0 days 00:01:35.881  0 days 00:01:35.932  0 days 00:01:36.065
+    9      10       10              gasly        Pierre Gasly  ...    AlphaTauri  0 days 00:01:36.545  0 days 00:01:36.282  0 days 00:01:36.242
+    10     31       11               ocon        Esteban Ocon  ...       Renault  0 days 00:01:36.783  0 days 00:01:36.359                  NaT
+    11      3       12          ricciardo    Daniel Ricciardo  ...       Renault  0 days 00:01:36.704  0 days 00:01:36.406                  NaT
+    12      5       13             vettel    Sebastian Vettel  ...       Ferrari  0 days 00:01:36.655  0 days 00:01:36.631                  NaT
+    13     99       14         giovinazzi  Antonio Giovinazzi  ...    Alfa Romeo  0 days 00:01:37.075  0 days 00:01:38.248                  NaT
+    14     11       15              perez        Sergio Pérez  ...  Racing Point  0 days 00:01:36.034                  NaT                  NaT
+    15      7       16          raikkonen      Kimi Räikkönen  ...    Alfa Romeo  0 days 00:01:37.555                  NaT                  NaT
+    16     20       17    kevin_magnussen     Kevin Magnussen  ...  Haas F1 Team  0 days 00:01:37.863                  NaT                  NaT
+    17     63       18            russell      George Russell  ...      Williams  0 days 00:01:38.045                  NaT                  NaT
+    18     51       19  pietro_fittipaldi   Pietro Fittipaldi  ...  Haas F1 Team  0 days 00:01:38.173                  NaT                  NaT
+    19      6       20             latifi     Nicholas Latifi  ...      Williams  0 days 00:01:38.443                  NaT                  NaT
 
     [20 rows x 10 columns]
     """
-    if year and race:
+    url = _qualifying_result_url(year, race)
+    return _qualifying_result_frame(pagination.get_all(url), season=bool(year and not race), output=output)
+
+
+def _qualifying_result_url(year, race):
+    if year:
         assert year >= 1996, 'Qualifying data only available starting from 1996'
-        url = 'http://ergast.com/api/f1/{}/{}/qualifying.json?limit=1000'.format(year, race)
+    if year and race:
+        url = transport.api_url('{}/{}/qualifying.json'.format(year, race))
+    elif year:
+        url = transport.api_url('{}/qualifying.json'.format(year))
+    else:
+        url = transport.api_url('current/last/qualifying.json')
+    return url
+
+
+@revalidate.memo
+@metrics.timed
+def _qualifying_result_frame(payload, season=False, output='frame'):
+    # Q2 and Q3 are left out of the seasons before they existed
+    return _races_frame(payload, 'QualifyingResults', _QUALIFYING_COLUMNS, season, 'qualifying', ('Q2', 'Q3'), output)
+
+
+@_local
+def get_lap_times(year, race, driver=None, *, output='frame'):
+    """
+    Queries the API to return the time of every lap of a race in a compact pandas dataframe format.
+    Lap data is only available starting from 1996. Each page of the response is reduced to integer
+    columns as soon as it arrives, so the decoded JSON of the whole race is never held in memory.
+
+    Parameters
+    ----------
+    year: int
+        The year to be queried.
+    race: int
+        The round of the year to be queried.
+    driver: str
+        An optional parameter that specifies the driver id of a single driver. Use `find_driverid` to obtain it.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+
+    Index:
+        RangeIndex
+
+    Columns:
+        driverID: category
+        lap: int
+        position: int
+        milliseconds: int
+
+    Example
+    -------
+    >>> pyergast.get_lap_times(2019, 1)
+                driverID  lap  position  milliseconds
+    0             bottas    1         1         90968
+    1           hamilton    1         2         92443
+    2     max_verstappen    1         3         93375
+    3             vettel    1         4         94165
+    4            leclerc    1         5         94775
+    ...              ...  ...       ...           ...
+    1108          bottas   58         1         87056
+    1109        hamilton   58         2         88211
+    1110  max_verstappen   58         3         87711
+    1111         leclerc   58         4         86883
+    1112          vettel   58         5         88520
+
+    [1113 rows x 4 columns]
+    """
+    url = _lap_times_url(year, race, driver)
+    return _lap_times_frame(pagination.iter_pages(url, max_workers=pagination.configure()['max_workers']), output)
+
+
+def _lap_times_url(year, race, driver):
+    assert year >= 1996, 'Lap times only available starting from 1996'
+    if driver:
+        url = transport.api_url('{}/{}/drivers/{}/laps.json'.format(year, race, driver))
     else:
-        url = 'http://ergast.com/api/f1/current/last/qualifying.json?limit=1000'
-
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    race_result = r.json()
-    result_dict = race_result["MRData"]['RaceTable']['Races'][0]['QualifyingResults']
-
-    # Unpack the lists of dicts in result_dict and reformat the result
-    for driver in result_dict:
-        drive_dict = unpack_lists(driver)
-        driver_info = drive_dict[0]
-        constructor_info = drive_dict[1]
-        driver['driver'] = driver_info['givenName'] + ' ' + driver_info['familyName']
-        driver['driverID'] = driver_info['driverId']
-        driver['nationality'] = driver_info['nationality']
-        driver['constructor'] = constructor_info['name']
-        driver['constructorID'] = constructor_info['constructorId']
-
-    # Specify the columns to be returned, taking into account changing qualifying formats
-    cols = ['number', 'position', 'driverID', 'driver', 'nationality', 'constructorID', 'constructor', 'Q1']
-    if 'Q2' in result_dict[0].keys():
-        cols.append('Q2')
-    if 'Q3' in result_dict[0].keys():
-        cols.append('Q3')
-    return pd.DataFrame(result_dict)[cols]
-
-
-def get_schedule(year=None):
+        url = transport.api_url('{}/{}/laps.json'.format(year, race))
+    return url
+
+
+def _lap_times_frame(pages, output='frame'):
+    # Reduce each page to typed columns as it arrives, then join the columns of every page.
+    # Pages are fetched as they are iterated, so only the time spent on them is recorded.
+    names = ('driverID', 'lap', 'position', 'milliseconds')
+    chunks = []
+    # Without pandas, the raw values of every page are joined and converted at once
+    raw = {name: [] for name in names}
+    seconds = 0
+    flattened = metrics.flatten_time()
+    for page in pages:
+        start = time.perf_counter()
+        races = page['MRData']['RaceTable']['Races']
+        laps = races[0]['Laps'] if races else []
+        columns = flatten.nested_columns(laps, 'Timings', _TIMING_COLUMNS, _LAP_COLUMNS)
+        if output == 'frame':
+            chunks.append(schema.columns(columns, 'laps'))
+        else:
+            for name in names:
+                raw[name].extend(columns[name])
+        seconds += time.perf_counter() - start
+    start = time.perf_counter()
+    if output == 'frame':
+        columns = flatten.concat(chunks)
+        frame = pd.DataFrame({name: columns[name] for name in names})
+    else:
+        frame = schema.build(raw, 'laps', output)
+    metrics.normalize('lap_times', seconds + time.perf_counter() - start, len(frame), metrics.flatten_time() - flattened)
+    return frame
+
+
+@_local
+def get_pit_stops(year, race, driver=None, *, output='frame'):
+    """
+    Queries the API to return the pit stops of a race in a pandas dataframe format.
+    Pit stop data is only available starting from 2011. Rows can be joined to `get_race_result` on `driverID`.
+
+    Parameters
+    ----------
+    year: int
+        The year to be queried.
+    race: int
+        The round of the year to be queried.
+    driver: str
+        An optional parameter that specifies the driver id of a single driver. Use `find_driverid` to obtain it.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+
+    Index:
+        RangeIndex
+
+    Columns:
+        driverID: category
+        stop: int
+        lap: int
+        time: timedelta, local time of day
+        milliseconds: int, duration of the stop
+
+    Example
+    -------
+    >>> pyergast.get_pit_stops(2019, 1)
+              driverID  stop  lap            time  milliseconds
+    0         hulkenberg     1    9 0 days 16:28:48         20914
+    1       giovinazzi     1   12 0 days 16:33:02         22000
+    2          gasly     1   13 0 days 16:34:21         21592
+    ...
+    """
+    url = _pit_stops_url(year, race, driver)
+    return _pit_stops_frame(pagination.get_all(url), output)
+
+
+def _pit_stops_url(year, race, driver):
+    assert year >= 2011, 'Pit stops only available starting from 2011'
+    if driver:
+        url = transport.api_url('{}/{}/drivers/{}/pitstops.json'.format(year, race, driver))
+    else:
+        url = transport.api_url('{}/{}/pitstops.json'.format(year, race))
+    return url
+
+
+@revalidate.memo
+@metrics.timed
+def _pit_stops_frame(payload, output='frame'):
+    return _races_frame(payload, 'PitStops', _PIT_STOP_COLUMNS, False, 'pit_stops', output=output)
+
+
+@_local
+def get_schedule(year=None, *, output='frame'):
     """
     Queries the API to return the schedule of a specified season. Defaults to most recent season.
 
@@ -531,10 +931,14 @@ def get_schedule(year=None):
     ----------
     year: int
         An optional parameter that specifies the year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -544,11 +948,11 @@ def get_schedule(year=None):
         round: int
         url: str
         raceName: str
-        date: str
-        circuitId: str
+        date: datetime
+        circuitId: category
         circuitName: str
-        locality: str
-        country: str
+        locality: category
+        country: category
 
     Example
     -------
@@ -565,28 +969,38 @@ def get_schedule(year=None):
 
     [8 rows x 9 columns]
     """
+    url = _schedule_url(year)
+    return _schedule_frame(pagination.get_all(url), output)
+
+
+def _schedule_url(year):
     if year:
-        url = 'http://ergast.com/api/f1/{}.json?limit=1000'.format(year)
+        url = transport.api_url('{}.json'.format(year))
     else:
-        url = 'http://ergast.com/api/f1/current.json?limit=1000'
+        url = transport.api_url('current.json')
+    return url
+
 
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    schedule = r.json()['MRData']['RaceTable']['Races']
+@revalidate.memo
+@metrics.timed
+def _schedule_frame(payload, output='frame'):
+    schedule = []
 
-    # Unpack the lists of dicts in result_dict and reformat the result
-    for race in schedule:
+    # Unpack the lists of dicts in result_dict and reformat the result, leaving the payload untouched
+    for race in payload['MRData']['RaceTable']['Races']:
         circuit = unpack_lists(race)[0]
-        race['circuitID'] = circuit['circuitId']
-        race['circuitName'] = circuit['circuitName']
-        race['locality'] = circuit['Location']['locality']
-        race['country'] = circuit['Location']['country']
-        del race['Circuit']
+        row = {key: value for key, value in race.items() if key != 'Circuit'}
+        row['circuitID'] = circuit['circuitId']
+        row['circuitName'] = circuit['circuitName']
+        row['locality'] = circuit['Location']['locality']
+        row['country'] = circuit['Location']['country']
+        schedule.append(row)
 
-    return pd.DataFrame(schedule)
+    return _rows_frame(schedule, 'schedule', output)
 
 
-def driver_standings(year=None, race=None):
+@_local
+def driver_standings(year=None, race=None, *, output='frame'):
     """
     Fetch the driver standings after a specific race in a specific year. Defaults to latest standings
 
@@ -596,24 +1010,28 @@ def driver_standings(year=None, race=None):
         An optional parameter that specifies the year to be queried.
     race: int
         An optional parameter that specifies the round of a year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
 
     Columns:
         position: int
-        positionText: str
-        points: int
+        positionText: category
+        points: float
         wins: int
-        driverID: str
-        driver: str
-        nationality: str
-        constructorID: str
-        constructor: str
+        driverID: category
+        driver: category
+        nationality: category
+        constructorID: category
+        constructor: category
 
     Example
     -------
@@ -633,30 +1051,29 @@ def driver_standings(year=None, race=None):
 
     [62 rows x 9 columns]
     """
+    url = _driver_standings_url(year, race)
+    return _driver_standings_frame(pagination.get_all(url), output)
+
+
+def _driver_standings_url(year, race):
     if year and race:
-        url = 'http://ergast.com/api/f1/{}/{}/driverStandings.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/{}/driverStandings.json'.format(year, race))
     elif year:
-        url = 'http://ergast.com/api/f1/{}/driverStandings.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/driverStandings.json'.format(year, race))
     else:
-        url = 'http://ergast.com/api/f1/current/driverStandings.json?limit=1000'
+        url = transport.api_url('current/driverStandings.json')
+    return url
 
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    driverStandings = r.json()['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
 
-    for driver in driverStandings:
-        driver['driverID'] = driver['Driver']['driverId']
-        driver['driver'] = driver['Driver']['givenName'] + ' ' + driver['Driver']['familyName']
-        driver['nationality'] = driver['Driver']['nationality']
-        driver['constructorID'] = driver['Constructors'][0]['constructorId']
-        driver['constructor'] = driver['Constructors'][0]['name']
-        del driver['Driver']
-        del driver['Constructors']
+@revalidate.memo
+@metrics.timed
+def _driver_standings_frame(payload, output='frame'):
+    driverStandings = payload['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
+    return flatten.frame(driverStandings, _DRIVER_STANDING_COLUMNS, dataset='driver_standings', output=output)
 
-    return pd.DataFrame(driverStandings)
 
-
-def constructor_standings(year=None, race=None):
+@_local
+def constructor_standings(year=None, race=None, *, output='frame'):
     """
     Fetch the constructor standings after a specific race in a specific year. Defaults to latest standings
 
@@ -666,22 +1083,26 @@ def constructor_standings(year=None, race=None):
         An optional parameter that specifies the year to be queried.
     race: int
         An optional parameter that specifies the round of a year to be queried.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
 
     Columns:
         position: int
-        positionText: str
-        points: int
+        positionText: category
+        points: float
         wins: int
-        constructorID: str
-        constructor: str
-        nationality: str
+        constructorID: category
+        constructor: category
+        nationality: category
 
     Example
     -------
@@ -704,29 +1125,32 @@ def constructor_standings(year=None, race=None):
     14       15           15      0    0               re               RE      Rhodesian
     15       16           16      0    0  cooper-maserati  Cooper-Maserati        British
     """
+    url = _constructor_standings_url(year, race)
+    return _constructor_standings_frame(pagination.get_all(url), output)
+
+
+def _constructor_standings_url(year, race):
     if year and race:
         assert year >= 1958, 'Constructor standings only available starting 1958'
-        url = 'http://ergast.com/api/f1/{}/{}/constructorStandings.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/{}/constructorStandings.json'.format(year, race))
     elif year:
         assert year >= 1958, 'Constructor standings only available starting 1958'
-        url = 'http://ergast.com/api/f1/{}/constructorStandings.json?limit=1000'.format(year, race)
+        url = transport.api_url('{}/constructorStandings.json'.format(year, race))
     else:
-        url = 'http://ergast.com/api/f1/current/constructorStandings.json?limit=1000'
-
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    constructorStandings = r.json()['MRData']['StandingsTable']['StandingsLists'][0]['ConstructorStandings']
+        url = transport.api_url('current/constructorStandings.json')
+    return url
 
-    for constructor in constructorStandings:
-        constructor['constructorID'] = constructor['Constructor']['constructorId']
-        constructor['name'] = constructor['Constructor']['name']
-        constructor['nationality'] = constructor['Constructor']['nationality']
-        del constructor['Constructor']
 
-    return pd.DataFrame(constructorStandings)
+@revalidate.memo
+@metrics.timed
+def _constructor_standings_frame(payload, output='frame'):
+    constructorStandings = payload['MRData']['StandingsTable']['StandingsLists'][0]['ConstructorStandings']
+    return flatten.frame(constructorStandings, _CONSTRUCTOR_STANDING_COLUMNS, dataset='constructor_standings',
+                         output=output)
 
 
-def query_driver(driverid):
+@_local
+def query_driver(driverid, *, output='frame'):
     """
     Fetches the driver's historical driver standings position
 
@@ -734,10 +1158,14 @@ def query_driver(driverid):
     ----------
     driverid: str
         A string representing the driver id of the driver. Use `find_driverid` method to obtain constructorid
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -746,13 +1174,13 @@ def query_driver(driverid):
         season: int
         round: int
         position: int
-        positionText: str
-        points: int
+        positionText: category
+        points: float
         wins: int
-        driver: str
-        nationality: str
-        constructorID: str
-        constructor: str
+        driver: category
+        nationality: category
+        constructorID: category
+        constructor: category
 
     Example
     -------
@@ -777,27 +1205,27 @@ def query_driver(driverid):
     16   2019    21       12           12     43    0  Kimi Räikkönen     Finnish          alfa  Alfa Romeo
     17   2020    17       16           16      4    0  Kimi Räikkönen     Finnish          alfa  Alfa Romeo
     """
-    url = 'http://ergast.com/api/f1/drivers/{}/driverStandings.json?limit=1000'.format(driverid)
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    seasons = r.json()['MRData']['StandingsTable']['StandingsLists']
+    url = _query_driver_url(driverid)
+    return _query_driver_frame(pagination.get_all(url), output)
 
-    # Extracting data from json
-    for season in seasons:
-        for key, value in season['DriverStandings'][0].items():
-            season[key] = value
-        season['driver'] = season['Driver']['givenName'] + ' ' + season['Driver']['familyName']
-        season['nationality'] = season['Driver']['nationality']
-        season['constructorID'] = season['Constructors'][0]['constructorId']
-        season['constructor'] = season['Constructors'][0]['name']
-        del season['DriverStandings']
-        del season['Driver']
-        del season['Constructors']
 
-    return pd.DataFrame(seasons)
+def _query_driver_url(driverid):
+    url = transport.api_url('drivers/{}/driverStandings.json'.format(driverid))
+    return url
 
 
-def query_constructor(constructorid):
+@revalidate.memo
+@metrics.timed
+def _query_driver_frame(payload, output='frame'):
+    # One standing per season, taken from the end of the season
+    seasons = payload['MRData']['StandingsTable']['StandingsLists']
+    spec = flatten.prefix(_DRIVER_STANDING_COLUMNS, 'DriverStandings[0]')
+    del spec['driverID']
+    return flatten.frame(seasons, {**_RACE_COLUMNS, **spec}, dataset='driver_standings', output=output)
+
+
+@_local
+def query_constructor(constructorid, *, output='frame'):
     """
     Fetches the consturctor's historical constructor standings position
 
@@ -805,10 +1233,14 @@ def query_constructor(constructorid):
     ----------
     constructorid: str
         A string representing the constructor id of the constructor. Use `find_constructorid` function to obtain constructorid
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
 
     Index:
         RangeIndex
@@ -817,12 +1249,12 @@ def query_constructor(constructorid):
         season: int
         round: int
         position: int
-        positionText: str
-        points: int
+        positionText: category
+        points: float
         wins: int
-        constructorID: str
-        constructor: str
-        nationality: str
+        constructorID: category
+        constructor: category
+        nationality: category
 
     Example
     -------
@@ -840,22 +1272,267 @@ def query_constructor(constructorid):
     9    2019    21        8            8     57    0          alfa  Alfa Romeo     Italian
     10   2020    17        8            8      8    0          alfa  Alfa Romeo     Italian
     """
-    url = 'http://ergast.com/api/f1/constructors/{}/constructorStandings.json?limit=1000'.format(constructorid)
-    r = requests.get(url)
-    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
-    seasons = r.json()['MRData']['StandingsTable']['StandingsLists']
-
-    # Extracting data from json
-    for season in seasons:
-        for key, value in season['ConstructorStandings'][0].items():
-            season[key] = value
-        season['constructorID'] = season['Constructor']['constructorId']
-        season['constructor'] = season['Constructor']['name']
-        season['nationality'] = season['Constructor']['nationality']
-        del season['Constructor']
-        del season['ConstructorStandings']
-
-    return pd.DataFrame(seasons)
+    url = _query_constructor_url(constructorid)
+    return _query_constructor_frame(pagination.get_all(url), output)
+
+
+def _query_constructor_url(constructorid):
+    url = transport.api_url('constructors/{}/constructorStandings.json'.format(constructorid))
+    return url
+
+
+@revalidate.memo
+@metrics.timed
+def _query_constructor_frame(payload, output='frame'):
+    # One standing per season, taken from the end of the season
+    seasons = payload['MRData']['StandingsTable']['StandingsLists']
+    spec = flatten.prefix(_CONSTRUCTOR_STANDING_COLUMNS, 'ConstructorStandings[0]')
+    spec = {('constructor' if name == 'name' else name): path for name, path in spec.items()}
+    return flatten.frame(seasons, {**_RACE_COLUMNS, **spec}, dataset='constructor_standings', output=output)
+
+
+@metrics.traced
+def get_race_results(years, rounds=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                     output='frame'):
+    """
+    Fetches the race results of many rounds concurrently and returns them in a single pandas dataframe.
+    When rounds is not specified, each season is fetched with a single season-wide query.
+
+    Parameters
+    ----------
+    years: int or list
+        The season or seasons to be queried, e.g. `range(1950, 2021)`.
+    rounds: int or list
+        An optional parameter that specifies the rounds of each season to be queried. Defaults to every round.
+    max_workers: int
+        An optional parameter that specifies how many rounds are fetched concurrently.
+    errors: str
+        What to do when a round fails: 'raise' the error, 'warn' and skip it, or 'ignore' it silently.
+        The failed rounds are listed in `result.attrs['failures']`.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+
+    Index:
+        RangeIndex
+
+    Columns:
+        season: int
+        round: int
+        and the columns of `get_race_result`
+
+    See Also
+    --------
+    pyergast.ratelimit : the hourly request budget that bounds bulk queries
+
+    Example
+    -------
+    >>> pyergast.get_race_results(range(2018, 2021))
+         season  round number position  ...  constructor laps    status                 Time
+    0      2018      1      5        1  ...      Ferrari   58  Finished  0 days 01:29:33.283
+    ...
+    """
+    fetch = _with_output(get_race_result, output)
+    if rounds is None:
+        return bulk.fan_out(fetch, bulk.seasons(years), max_workers, errors, output)
+    items = bulk.season_rounds(years, rounds, _schedule(output), max_workers)
+    return bulk.fan_out(fetch, items, max_workers, errors, output)
+
+
+@metrics.traced
+def get_qualifying_results(years, rounds=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                           output='frame'):
+    """
+    Fetches the qualifying results of many rounds concurrently and returns them in a single pandas dataframe.
+    When rounds is not specified, each season is fetched with a single season-wide query.
+    Seasons before 1996, for which there is no qualifying data, are skipped.
+
+    Parameters
+    ----------
+    years: int or list
+        The season or seasons to be queried.
+    rounds: int or list
+        An optional parameter that specifies the rounds of each season to be queried. Defaults to every round.
+    max_workers: int
+        An optional parameter that specifies how many rounds are fetched concurrently.
+    errors: str
+        What to do when a round fails: 'raise' the error, 'warn' and skip it, or 'ignore' it silently.
+        The failed rounds are listed in `result.attrs['failures']`.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+
+    Index:
+        RangeIndex
+
+    Columns:
+        season: int
+        round: int
+        and the columns of `get_qualifying_result`
+
+    See Also
+    --------
+    pyergast.ratelimit : the hourly request budget that bounds bulk queries
+    """
+    years = [year for year, race in bulk.seasons(years) if year >= 1996]
+    fetch = _with_output(get_qualifying_result, output)
+    if rounds is None:
+        return bulk.fan_out(fetch, bulk.seasons(years), max_workers, errors, output)
+    items = bulk.season_rounds(years, rounds, _schedule(output), max_workers)
+    return bulk.fan_out(fetch, items, max_workers, errors, output)
+
+
+@metrics.traced
+def driver_standings_history(years, rounds=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                             output='frame'):
+    """
+    Fetches the driver standings after many rounds concurrently and returns them in a single pandas dataframe.
+    By default, the standings after every round of each season are returned.
+
+    Parameters
+    ----------
+    years: int or list
+        The season or seasons to be queried.
+    rounds: int or list
+        An optional parameter that specifies the rounds of each season to be queried. Defaults to every round.
+    max_workers: int
+        An optional parameter that specifies how many rounds are fetched concurrently.
+    errors: str
+        What to do when a round fails: 'raise' the error, 'warn' and skip it, or 'ignore' it silently.
+        The failed rounds are listed in `result.attrs['failures']`.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+
+    Index:
+        RangeIndex
+
+    Columns:
+        season: int
+        round: int
+        and the columns of `driver_standings`
+
+    See Also
+    --------
+    pyergast.ratelimit : the hourly request budget that bounds bulk queries
+    """
+    items = bulk.season_rounds(years, rounds, _schedule(output), max_workers)
+    return bulk.fan_out(_with_output(driver_standings, output), items, max_workers, errors, output)
+
+
+@metrics.traced
+def lap_times_history(years, rounds=None, driver=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                      output='frame'):
+    """
+    Fetches the lap times of many races concurrently and returns them in a single compact pandas dataframe.
+    Seasons before 1996, for which there is no lap data, are skipped.
+
+    Parameters
+    ----------
+    years: int or list
+        The season or seasons to be queried.
+    rounds: int or list
+        An optional parameter that specifies the rounds of each season to be queried. Defaults to every round.
+    driver: str
+        An optional parameter that specifies the driver id of a single driver.
+    max_workers: int
+        An optional parameter that specifies how many races are fetched concurrently.
+    errors: str
+        What to do when a race fails: 'raise' the error, 'warn' and skip it, or 'ignore' it silently.
+        The failed races are listed in `result.attrs['failures']`.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+
+    Index:
+        RangeIndex
+
+    Columns:
+        season: int
+        round: int
+        and the columns of `get_lap_times`
+
+    See Also
+    --------
+    pyergast.ratelimit : the hourly request budget that bounds bulk queries
+    """
+    years = [year for year, race in bulk.seasons(years) if year >= 1996]
+    items = bulk.season_rounds(years, rounds, _schedule(output), max_workers)
+    fetch = _with_output(functools.partial(get_lap_times, driver=driver), output)
+    return bulk.fan_out(fetch, items, max_workers, errors, output)
+
+
+@metrics.traced
+def pit_stops_history(years, rounds=None, driver=None, max_workers=bulk.MAX_WORKERS, errors='warn', *,
+                      output='frame'):
+    """
+    Fetches the pit stops of many races concurrently and returns them in a single pandas dataframe.
+    Seasons before 2011, for which there is no pit stop data, are skipped.
+
+    Parameters
+    ----------
+    years: int or list
+        The season or seasons to be queried, e.g. `range(2012, 2021)`.
+    rounds: int or list
+        An optional parameter that specifies the rounds of each season to be queried. Defaults to every round.
+    driver: str
+        An optional parameter that specifies the driver id of a single driver.
+    max_workers: int
+        An optional parameter that specifies how many races are fetched concurrently.
+    errors: str
+        What to do when a race fails: 'raise' the error, 'warn' and skip it, or 'ignore' it silently.
+        The failed races are listed in `result.attrs['failures']`.
+    output: str
+        An optional parameter that specifies 'records' to return a list of dicts of plain Python values
+        instead of a dataframe, without importing pandas.
+        'arrow' or 'polars' return a pyarrow.Table or a polars.DataFrame, built without a dataframe in between.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+
+    Index:
+        RangeIndex
+
+    Columns:
+        season: int
+        round: int
+        and the columns of `get_pit_stops`
+
+    See Also
+    --------
+    pyergast.ratelimit : the hourly request budget that bounds bulk queries
+
+    Example
+    -------
+    >>> stops = pyergast.pit_stops_history(range(2012, 2021))
+    >>> results = pyergast.get_race_results(range(2012, 2021))
+    >>> stops.merge(results, on=['season', 'round', 'driverID'])
+    """
+    years = [year for year, race in bulk.seasons(years) if year >= 2011]
+    items = bulk.season_rounds(years, rounds, _schedule(output), max_workers)
+    fetch = _with_output(functools.partial(get_pit_stops, driver=driver), output)
+    return bulk.fan_out(fetch, items, max_workers, errors, output)
 
 
 def unpack_lists(driver):
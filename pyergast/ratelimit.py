@@ -0,0 +1,239 @@
+"""
+Client-side rate limiting, so that large or parallel queries stay within the request quotas of the API
+instead of running into 429 responses.
+
+Every request sent to the API, from any thread or coroutine, first takes a token from a set of token buckets:
+by default a burst of 4 requests refilled at 4 per second, and 200 requests refilled over an hour.
+
+The hourly budget is what bounds bulk queries: `get_race_results`, `get_qualifying_results`,
+`driver_standings_history`, `lap_times_history` and `pit_stops_history` over many seasons, and
+`pyergast.warehouse.sync`. Their workers share the limiter, so once the 200 requests of the hour are used up
+they slow down to one request every 18 seconds, however many workers run. Mirroring the full history takes
+several thousand requests, about a day.
+
+Buckets are kept in memory and shared by the threads of a process. Worker processes can share a single budget
+by keeping the buckets in a file instead, locked on every request, e.g. the per-user file of `default_path`.
+
+Example
+-------
+>>> from pyergast import ratelimit
+>>> ratelimit.configure(path=ratelimit.default_path())
+{'per_second': 4, 'burst': 4, 'per_hour': 200, 'path': '/home/user/.cache/pyergast/limits'}
+"""
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def default_path():
+    """
+    Returns a location of the current user for the file the buckets are shared in, inside `$XDG_CACHE_HOME`
+    or `~/.cache`, see `configure`.
+
+    Returns
+    -------
+    str
+    """
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'pyergast', 'limits')
+
+
+# Settings of the shared limiter, changed through `configure`. The quotas published by Ergast are the defaults.
+_settings = {
+    'per_second': 4,
+    'burst': 4,
+    'per_hour': 200,
+    'path': None,
+}
+
+_limiter = None
+_lock = threading.Lock()
+
+
+class Limiter:
+    """
+    Token buckets shared by every request. A request takes a token from each bucket, and waits until
+    the emptiest bucket has refilled enough to cover it.
+
+    Parameters
+    ----------
+    buckets: dict
+        The rate, in tokens per second, and the capacity of each bucket, by name.
+    path: str
+        An optional file the buckets are kept in, to share them with other processes. Requires `fcntl`.
+    """
+
+    def __init__(self, buckets, path=None):
+        assert path is None or fcntl is not None, 'Sharing a rate limit between processes requires fcntl'
+        self.buckets = dict(buckets)
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+
+    def reserve(self):
+        """
+        Takes a token from every bucket, possibly ahead of time.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait before sending the request.
+        """
+        return self._update(1)
+
+    def refund(self):
+        """
+        Gives back the tokens taken by `reserve` for a request that was not sent after all,
+        e.g. one cancelled while waiting for them.
+        """
+        self._update(-1)
+
+    def _update(self, count):
+        # Takes `count` tokens from every bucket, or gives them back when negative
+        if not self.buckets:
+            return 0
+        with self._lock:
+            if self.path is None:
+                state, delay = self._take(self._state, time.monotonic(), count)
+                self._state = state
+                return delay
+            return self._take_shared(count)
+
+    def _take_shared(self, count):
+        # The file is locked for the read-modify-write of the buckets, and released before waiting
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a+') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                text = file.read()
+                state, delay = self._take(json.loads(text) if text else {}, time.time(), count)
+                file.seek(0)
+                file.truncate()
+                json.dump(state, file)
+                # Flushed before the lock is released; other processes read it from the page cache, so no fsync
+                file.flush()
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+        return delay
+
+    def _take(self, state, now, count=1):
+        # Refills each bucket for the time elapsed since it was last used, then takes tokens from it.
+        # Tokens can go below zero: the debt is the wait of the requests that reserved them.
+        result = {}
+        delay = 0
+        for name, (rate, capacity) in self.buckets.items():
+            tokens, stamp = state.get(name, (capacity, now))
+            tokens = min(capacity, min(capacity, tokens + max(now - stamp, 0) * rate) - count)
+            result[name] = (tokens, now)
+            delay = max(delay, -tokens / rate)
+        return result, delay
+
+    def acquire(self):
+        """
+        Waits until a request can be sent.
+
+        Returns
+        -------
+        float
+            The number of seconds waited.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+def configure(per_second=None, burst=None, per_hour=None, path=False):
+    """
+    Changes the limits of the requests sent to the API. The buckets are emptied and refilled from scratch.
+
+    Parameters
+    ----------
+    per_second: float
+        An optional parameter that specifies the sustained number of requests per second. `0` turns it off.
+    burst: int
+        An optional parameter that specifies how many requests can be sent at once after a pause.
+    per_hour: float
+        An optional parameter that specifies the number of requests per hour. `0` turns it off.
+    path: str
+        An optional file shared by processes to keep a single budget, e.g. `default_path()`.
+        `None`, the default, keeps it in memory for the current process only.
+
+    Returns
+    -------
+    dict
+        The settings now in effect.
+
+    Example
+    -------
+    >>> pyergast.ratelimit.configure(per_hour=0)
+    {'per_second': 4, 'burst': 4, 'per_hour': 0, 'path': None}
+    """
+    global _limiter
+    updates = {'per_second': per_second, 'burst': burst, 'per_hour': per_hour}
+    with _lock:
+        for key, value in updates.items():
+            if value is not None:
+                _settings[key] = value
+        if path is not False:
+            _settings['path'] = path
+        _limiter = None
+        return dict(_settings)
+
+
+def get_limiter():
+    """
+    Returns the `Limiter` shared by every request, creating it from the settings on first use.
+
+    Returns
+    -------
+    Limiter
+    """
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            buckets = {}
+            if _settings['per_second']:
+                buckets['second'] = (_settings['per_second'], max(_settings['burst'], 1))
+            if _settings['per_hour']:
+                buckets['hour'] = (_settings['per_hour'] / 3600, _settings['per_hour'])
+            _limiter = Limiter(buckets, _settings['path'])
+        return _limiter
+
+
+def reserve():
+    """
+    Takes a token for a request from the shared limiter, see `Limiter.reserve`.
+
+    Returns
+    -------
+    float
+        The number of seconds to wait before sending the request.
+    """
+    return get_limiter().reserve()
+
+
+def acquire():
+    """
+    Waits until the shared limiter allows a request to be sent, see `Limiter.acquire`.
+
+    Returns
+    -------
+    float
+        The number of seconds waited.
+    """
+    return get_limiter().acquire()
+
+
+def refund():
+    """
+    Gives back to the shared limiter the tokens of a request that was not sent, see `Limiter.refund`.
+    """
+    get_limiter().refund()
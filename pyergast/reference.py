@@ -0,0 +1,168 @@
+import threading
+import time
+
+# Seconds a reference table is kept before it is loaded again
+DEFAULT_TTL = 86400
+
+_tables = {}
+
+
+class ReferenceTable:
+    """
+    A table that is loaded once per process on first use and shared by every caller.
+
+    Loading is thread-safe: concurrent callers wait for the single load in progress instead of
+    starting their own. The table is loaded again once it is older than `ttl` seconds.
+
+    Parameters
+    ----------
+    loader: callable
+        A function without arguments returning the table, e.g. `get_drivers`.
+    ttl: float
+        Seconds the table is kept before it is loaded again. None keeps it until `refresh` is called.
+    """
+
+    def __init__(self, loader, ttl=DEFAULT_TTL):
+        self.loader = loader
+        self.ttl = ttl
+        self._value = None
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    def _fresh(self):
+        if self._value is None:
+            return False
+        return self.ttl is None or time.monotonic() - self._loaded < self.ttl
+
+    def get(self):
+        """
+        Returns the table, loading it if it has not been loaded yet or has expired.
+        The returned table is shared and should not be modified in place.
+        """
+        if self._fresh():
+            return self._value
+        with self._lock:
+            if not self._fresh():
+                self._load()
+            return self._value
+
+    def refresh(self):
+        """
+        Loads the table again and returns it.
+        """
+        with self._lock:
+            self._load()
+            return self._value
+
+    def loaded(self):
+        """
+        Tells whether the table is loaded and has not expired.
+        """
+        return self._fresh()
+
+    def set(self, value):
+        """
+        Stores a table loaded elsewhere, e.g. by `pyergast.aio`, as if it had just been loaded.
+        """
+        with self._lock:
+            self._value = value
+            self._loaded = time.monotonic()
+
+    def clear(self):
+        """
+        Drops the loaded table so that the next `get` loads it again.
+        """
+        with self._lock:
+            self._value = None
+            self._loaded = None
+
+    def _load(self):
+        self._value = self.loader()
+        self._loaded = time.monotonic()
+
+
+def register(name, loader, ttl=DEFAULT_TTL):
+    """
+    Registers a reference table under a name.
+
+    Parameters
+    ----------
+    name: str
+        The name of the table, e.g. 'drivers'.
+    loader: callable
+        A function without arguments returning the table.
+    ttl: float
+        Seconds the table is kept before it is loaded again.
+
+    Returns
+    -------
+    ReferenceTable
+    """
+    _tables[name] = ReferenceTable(loader, ttl)
+    return _tables[name]
+
+
+def table(name):
+    """
+    Returns the `ReferenceTable` registered under a name.
+    """
+    assert name in _tables, 'Unknown reference table {}'.format(name)
+    return _tables[name]
+
+
+def get(name):
+    """
+    Returns a registered reference table, loading it on first use.
+
+    Parameters
+    ----------
+    name: str
+        One of 'drivers', 'constructors' or 'circuits', or 'drivers.records', 'constructors.records' or
+        'circuits.records' for the same tables as lists of dicts, loaded without pandas.
+
+    Returns
+    -------
+    pandas.DataFrame or list of dict
+
+    Example
+    -------
+    >>> pyergast.reference.get('constructors').shape
+    (211, 4)
+    """
+    assert name in _tables, 'Unknown reference table {}'.format(name)
+    return _tables[name].get()
+
+
+def refresh(name=None):
+    """
+    Loads a registered reference table again, or every loaded table if `name` is None.
+
+    Parameters
+    ----------
+    name: str
+        An optional parameter that specifies the table to be refreshed.
+    """
+    if name is not None:
+        assert name in _tables, 'Unknown reference table {}'.format(name)
+        _tables[name].refresh()
+        return
+    for table in _tables.values():
+        if table._value is not None:
+            table.refresh()
+
+
+def clear():
+    """
+    Drops every loaded reference table so that each one is loaded again on next use.
+    """
+    for table in _tables.values():
+        table.clear()
+
+
+def set_ttl(ttl):
+    """
+    Changes how long every registered reference table is kept, in seconds.
+    None keeps the tables until `refresh` is called.
+    """
+    for table in _tables.values():
+        table.ttl = ttl
@@ -0,0 +1,330 @@
+"""
+A local stand-in for the Ergast API, replaying recorded responses over HTTP so that pyergast can be
+tested and benchmarked without network access.
+
+Each recorded response is a JSON file holding every row of a query, stored under the path of its URL,
+e.g. `2014/1/results.json`. The server pages it by `limit` and `offset` like the API does, and can delay
+or fail responses on demand. Responses carry an `ETag`, and conditional requests for a response that has not
+changed are answered with a 304. A small recording of the 2014 season is bundled with pyergast.
+
+Example
+-------
+>>> from pyergast import replay
+>>> with replay.serve(latency=0.05):
+...     pyergast.get_race_result(2014, 1)
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from pyergast import pagination, ratelimit, transport
+
+# The recording bundled with pyergast
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Rows per page when a request gives no limit, as in the API
+DEFAULT_LIMIT = 30
+
+# Lists whose items are counted as rows when paging, e.g. the results of each race
+ROW_KEYS = ('Results', 'QualifyingResults', 'Laps', 'Timings', 'PitStops', 'DriverStandings', 'ConstructorStandings')
+
+
+class ReplayServer:
+    """
+    An HTTP server replaying recorded responses, in a background thread.
+
+    Parameters
+    ----------
+    directory: str
+        The root of the recorded responses. Defaults to the bundled recording.
+    latency: float
+        An optional parameter that specifies the delay of every response, in seconds.
+    errors: dict
+        An optional parameter that maps paths, e.g. '2014/2/results.json', to the status code they fail with.
+    error_rate: float
+        An optional parameter that specifies the share of the other requests failing with a 503.
+    seed: int
+        An optional seed of the random failures, to replay them identically.
+    port: int
+        An optional port to listen on. Defaults to any free port.
+
+    Attributes
+    ----------
+    url: str
+        The base URL of the server, see `pyergast.transport.configure`.
+    requests: list
+        The path and query of every request received, in order.
+    """
+
+    def __init__(self, directory=None, latency=0, errors=None, error_rate=0, seed=None, port=0):
+        self.directory = directory or FIXTURES
+        self.latency = latency
+        self.errors = dict(errors or {})
+        self.error_rate = error_rate
+        self.requests = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+        self.url = 'http://127.0.0.1:{}'.format(self._server.server_address[1])
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+
+        Returns
+        -------
+        ReplayServer
+            The server itself.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """
+        Stops the server and frees its port.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def respond(self, target, etag=None):
+        """
+        Answers a request.
+
+        Parameters
+        ----------
+        target: str
+            The path and query of the request, e.g. '/2014/results.json?limit=30&offset=0'.
+        etag: str
+            An optional `If-None-Match` header, answered with a 304 and no body when the response has this ETag.
+
+        Returns
+        -------
+        tuple
+            The status code and the body.
+        """
+        parts = urlsplit(target)
+        path = parts.path.strip('/')
+        with self._lock:
+            self.requests.append(target)
+            failing = self.error_rate and self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if path in self.errors:
+            return self.errors[path], b''
+        if failing:
+            return 503, b''
+        file = os.path.join(self.directory, *path.split('/'))
+        if not path.endswith('.json') or not os.path.isfile(file):
+            return 404, b''
+        with open(file, 'rb') as recorded:
+            payload = json.load(recorded)
+        query = dict(parse_qsl(parts.query))
+        limit = int(query.get('limit', DEFAULT_LIMIT))
+        offset = int(query.get('offset', 0))
+        body = json.dumps(page(payload, limit, offset)).encode()
+        if etag is not None and etag == entity_tag(body):
+            return 304, b''
+        return 200, body
+
+
+def _handler(replay):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, body = replay.respond(self.path, self.headers.get('If-None-Match'))
+            self.send_response(status)
+            if status == 200:
+                self.send_header('ETag', entity_tag(body))
+            if status != 304:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+    return Handler
+
+
+def entity_tag(body):
+    """
+    Returns the ETag of a response body, which changes with its content.
+
+    Parameters
+    ----------
+    body: bytes
+        The body.
+
+    Returns
+    -------
+    str
+    """
+    return '"{}"'.format(hashlib.sha1(body).hexdigest())
+
+
+def page(payload, limit, offset):
+    """
+    Cuts a page out of a response holding every row, the way the API pages its responses.
+
+    Parameters
+    ----------
+    payload: dict
+        The full response.
+    limit: int
+        The number of rows of the page.
+    offset: int
+        The number of rows before the page.
+
+    Returns
+    -------
+    dict
+        A response with the rows of the page, and the `total` of the full response.
+    """
+    table = pagination._table(payload)
+    rows = _split(table or [])
+    mrdata = dict(payload['MRData'], limit=str(limit), offset=str(offset), total=str(len(rows)))
+    for name, value in mrdata.items():
+        if name.endswith('Table'):
+            mrdata[name] = {key: (_join(rows[offset:offset + limit]) if items is table else items)
+                            for key, items in value.items()}
+    return {'MRData': mrdata}
+
+
+def _split(items):
+    # One entry per row: the parents leading to it, as (identity, record without the rows, key of the rows)
+    rows = []
+    for item in items:
+        key = next((key for key in ROW_KEYS if isinstance(item.get(key), list)), None)
+        if key is None:
+            rows.append(((), item))
+            continue
+        shell = {name: value for name, value in item.items() if name != key}
+        if not item[key]:
+            continue
+        for parents, row in _split(item[key]):
+            rows.append((((id(item), shell, key),) + parents, row))
+    return rows
+
+
+def _join(rows):
+    # The inverse of `_split`: consecutive rows of the same parent are nested back under a copy of it
+    top = []
+    opened = []
+    for parents, row in rows:
+        level = top
+        for depth, (identity, shell, key) in enumerate(parents):
+            if depth < len(opened) and opened[depth][0] == identity:
+                record = opened[depth][1]
+            else:
+                record = dict(shell, **{key: []})
+                level.append(record)
+                del opened[depth:]
+                opened.append((identity, record))
+            level = record[key]
+        level.append(row)
+    return top
+
+
+@contextlib.contextmanager
+def serve(directory=None, latency=0, errors=None, error_rate=0, seed=None):
+    """
+    Points every pyergast function at a `ReplayServer` for the duration of a `with` block.
+    Rate limits are lifted meanwhile, as the stand-in has no quota.
+
+    Parameters
+    ----------
+    directory: str
+        The root of the recorded responses. Defaults to the bundled recording.
+    latency: float
+        An optional parameter that specifies the delay of every response, in seconds.
+    errors: dict
+        An optional parameter that maps paths to the status code they fail with.
+    error_rate: float
+        An optional parameter that specifies the share of requests failing with a 503.
+    seed: int
+        An optional seed of the random failures.
+
+    Yields
+    ------
+    ReplayServer
+    """
+    limits = ratelimit.configure()
+    base_url = transport.settings()['base_url']
+    with ReplayServer(directory, latency, errors, error_rate, seed) as server:
+        transport.configure(base_url=server.url)
+        ratelimit.configure(per_second=0, per_hour=0)
+        try:
+            yield server
+        finally:
+            transport.configure(base_url=base_url)
+            ratelimit.configure(**limits)
+
+
+def record(paths, directory):
+    """
+    Records the full responses of the API to a set of queries, to be replayed by a `ReplayServer`.
+
+    Parameters
+    ----------
+    paths: list of str
+        The paths of the queries, relative to the base URL, e.g. '2014/1/results.json'.
+    directory: str
+        The root of the recording. Existing responses are overwritten.
+    """
+    for path in paths:
+        payload = pagination.get_all(transport.api_url(path))
+        file = os.path.join(directory, *path.strip('/').split('/'))
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        with open(file, 'w', encoding='utf-8') as recorded:
+            json.dump(payload, recorded, ensure_ascii=False, indent=1)
+
+
+def main(argv=None):
+    """
+    Command line entry point: `python -m pyergast.replay serve [DIRECTORY]` and
+    `python -m pyergast.replay record DIRECTORY PATH...`.
+    """
+    parser = argparse.ArgumentParser(prog='pyergast.replay', description='Replay recorded Ergast API responses')
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('serve', help='serve the responses recorded in DIRECTORY')
+    command.add_argument('directory', nargs='?', default=FIXTURES)
+    command.add_argument('--port', type=int, default=8000)
+    command.add_argument('--latency', type=float, default=0, help='delay of every response, in seconds')
+    command.add_argument('--error-rate', type=float, default=0, help='share of requests failing with a 503')
+    command = commands.add_parser('record', help='record the responses of the API to PATHs into DIRECTORY')
+    command.add_argument('directory')
+    command.add_argument('paths', nargs='+', metavar='PATH')
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        record(args.paths, args.directory)
+        return
+    server = ReplayServer(args.directory, args.latency, error_rate=args.error_rate, port=args.port)
+    print('Serving {} at {}'.format(args.directory, server.url))
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Conditional requests for live queries, such as `current`/`last` URLs and the running season, which are
+polled over and over while their responses rarely change.
+
+The `ETag` and `Last-Modified` validators of their responses are kept in memory with the decoded payload.
+The next request for the same URL sends them back as `If-None-Match` and `If-Modified-Since`, and a
+`304 Not Modified` answer reuses the stored payload without downloading or decoding anything. Frames built
+from a stored payload are kept as well, so polling an unchanged query costs one empty response. Queries of
+several pages get the payload merged from them the first time for as long as every page is unchanged,
+see `merged`, and so their frames are kept too.
+
+Example
+-------
+>>> pyergast.get_race_result()  # downloaded, decoded and built
+>>> pyergast.get_race_result()  # 304 Not Modified, a copy of the frame built above
+>>> pyergast.revalidate.configure(enabled=False)
+{'enabled': False, 'max_entries': 128}
+"""
+import collections
+import functools
+import threading
+
+from pyergast import cache
+
+# Settings of the validators store, changed through `configure`
+_settings = {
+    'enabled': True,
+    'max_entries': 128,
+}
+
+# Stored responses, by normalized URL, least recently used first, and by the identity of their payload.
+# Payloads merged from stored pages, by the validators of the pages, least recently used first.
+_entries = collections.OrderedDict()
+_merged = collections.OrderedDict()
+_payloads = {}
+_lock = threading.Lock()
+
+
+class _Entry:
+    # The validators of a response, its decoded payload, and the frames built from it by builder and arguments.
+    # The key identifies the content of the payload: the URL and validators of the response, or of its pages.
+    def __init__(self, etag, modified, payload, key):
+        self.etag = etag
+        self.modified = modified
+        self.payload = payload
+        self.key = key
+        self.frames = {}
+
+
+def configure(enabled=None, max_entries=None):
+    """
+    Changes how responses of live queries are revalidated.
+
+    Parameters
+    ----------
+    enabled: bool
+        An optional parameter that specifies whether validators are stored and conditional requests sent.
+        Turning it off forgets every stored response.
+    max_entries: int
+        An optional parameter that specifies how many responses are kept, the least recently used are dropped.
+
+    Returns
+    -------
+    dict
+        The settings now in effect.
+
+    Example
+    -------
+    >>> pyergast.revalidate.configure(max_entries=32)
+    {'enabled': True, 'max_entries': 32}
+    """
+    with _lock:
+        if enabled is not None:
+            _settings['enabled'] = enabled
+        if max_entries is not None:
+            _settings['max_entries'] = max_entries
+        _evict(_settings['max_entries'] if _settings['enabled'] else 0)
+        return dict(_settings)
+
+
+def clear():
+    """
+    Forgets every stored response, so that the next requests are unconditional.
+    """
+    with _lock:
+        _evict(0)
+
+
+def conditional(url):
+    """
+    Returns the headers making a request conditional on the stored response of a URL, and its payload.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the request.
+
+    Returns
+    -------
+    tuple
+        The headers, empty when nothing is stored, and the payload to be reused on a 304, or None.
+    """
+    key = cache.normalize_url(url)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return {}, None
+        _entries.move_to_end(key)
+    headers = {}
+    if entry.etag is not None:
+        headers['If-None-Match'] = entry.etag
+    if entry.modified is not None:
+        headers['If-Modified-Since'] = entry.modified
+    return headers, entry.payload
+
+
+def store(url, headers, payload):
+    """
+    Keeps the validators and the payload of a response of a live query, see `pyergast.cache.is_live`.
+    Responses without validators, or of queries that do not change, are not kept.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the request.
+    headers: mapping
+        The headers of the response.
+    payload: dict
+        The decoded response, which must not be modified afterwards.
+    """
+    etag, modified = headers.get('ETag'), headers.get('Last-Modified')
+    if not _settings['enabled'] or (etag is None and modified is None) or not cache.is_live(url):
+        return
+    key = cache.normalize_url(url)
+    with _lock:
+        old = _entries.pop(key, None)
+        if old is not None:
+            del _payloads[id(old.payload)]
+        _entries[key] = _payloads[id(payload)] = _Entry(etag, modified, payload, ((key, etag, modified),))
+        _evict(_settings['max_entries'])
+
+
+def merged(pages, merge):
+    """
+    Returns the payload merged from the pages of a query. When every page is a stored payload, the result is
+    kept by the validators of the pages, and the same payload is returned for as long as none of them changes,
+    so that the frames built from it are kept as well, see `memo`.
+
+    Parameters
+    ----------
+    pages: list of dict
+        The decoded pages, first page first.
+    merge: callable
+        The function merging the pages into a new payload, see `pyergast.pagination.merge`.
+
+    Returns
+    -------
+    dict
+        The merged payload, which must not be modified when it is stored, see `stored`.
+    """
+    with _lock:
+        entries = [_payloads.get(id(page)) for page in pages]
+    if not all(entry is not None and entry.payload is page for entry, page in zip(entries, pages)):
+        return merge(pages)
+    key = tuple(validators for entry in entries for validators in entry.key)
+    with _lock:
+        entry = _merged.get(key)
+        if entry is not None:
+            _merged.move_to_end(key)
+            return entry.payload
+    payload = merge(pages)
+    with _lock:
+        if _settings['enabled'] and key not in _merged:
+            _merged[key] = _payloads[id(payload)] = _Entry(None, None, payload, key)
+            _evict(_settings['max_entries'])
+        return _merged[key].payload if key in _merged else payload
+
+
+def stored(payload):
+    """
+    Returns whether a payload is kept for revalidation, and so is shared and must not be modified.
+    """
+    entry = _payloads.get(id(payload))
+    return entry is not None and entry.payload is payload
+
+
+def memo(builder):
+    """
+    Decorator keeping the frames a builder makes from stored payloads, e.g. `_race_result_frame`.
+    The same payload returned for a 304 then gets a copy of the frame built the first time.
+    """
+    @functools.wraps(builder)
+    def wrapper(payload, *args, **kwargs):
+        with _lock:
+            entry = _payloads.get(id(payload))
+        if entry is None or entry.payload is not payload:
+            return builder(payload, *args, **kwargs)
+        key = (builder.__name__, args, tuple(sorted(kwargs.items())))
+        frame = entry.frames.get(key)
+        if frame is None:
+            frame = entry.frames[key] = builder(payload, *args, **kwargs)
+        return _copy(frame)
+    return wrapper
+
+
+def _copy(frame):
+    # Records and pandas frames can be modified by the caller, Arrow tables cannot
+    if isinstance(frame, list):
+        return [dict(row) for row in frame]
+    return frame.copy() if hasattr(frame, 'copy') else frame
+
+
+def _evict(max_entries):
+    for entries in (_entries, _merged):
+        while len(entries) > max_entries:
+            _, entry = entries.popitem(last=False)
+            del _payloads[id(entry.payload)]
@@ -0,0 +1,363 @@
+import datetime
+
+from pyergast import lazy
+
+# Imported on first use, see `pyergast.lazy`
+np = lazy.module('numpy')
+pd = lazy.module('pandas')
+pa = lazy.module('pyarrow')
+pl = lazy.module('polars')
+
+# Types of the columns of each dataset. Columns not listed, such as names and urls, are kept as strings.
+#   'Int64', 'Float64': nullable numbers, missing values become <NA>
+#   'int64', 'int16': numbers that are never missing, e.g. season and round
+#   'category': values repeated across rows, e.g. driver and constructor IDs
+#   'datetime': dates such as '2014-03-16'
+#   'duration': lap times such as '1:32.478' or '1:32:58.710', as timedelta
+#   'millis': durations given in milliseconds, as timedelta
+#   'milliseconds': durations such as '1:32.478', as nullable 32-bit integer milliseconds
+_RACE = {'season': 'int64', 'round': 'int64'}
+_DRIVER = {'driverID': 'category', 'driver': 'category', 'nationality': 'category'}
+_CONSTRUCTOR = {'constructorID': 'category', 'constructor': 'category'}
+_STANDING = {'position': 'Int64', 'positionText': 'category', 'points': 'Float64', 'wins': 'Int64'}
+
+SCHEMAS = {
+    'drivers': {'permanentNumber': 'Int64', 'dateOfBirth': 'datetime', 'nationality': 'category'},
+    'constructors': {'nationality': 'category'},
+    'circuits': {'Latitude': 'Float64', 'Longtitude': 'Float64', 'Locality': 'category', 'Country': 'category'},
+    'schedule': {**_RACE, 'date': 'datetime', 'circuitID': 'category', 'locality': 'category',
+                 'country': 'category'},
+    'results': {**_RACE, 'number': 'Int64', 'position': 'Int64', 'positionText': 'category', 'grid': 'Int64',
+                'points': 'Float64', **_DRIVER, **_CONSTRUCTOR, 'laps': 'Int64', 'status': 'category',
+                'Time': 'millis'},
+    'qualifying': {**_RACE, 'number': 'Int64', 'position': 'Int64', **_DRIVER, **_CONSTRUCTOR,
+                   'Q1': 'duration', 'Q2': 'duration', 'Q3': 'duration'},
+    'driver_standings': {**_RACE, **_STANDING, **_DRIVER, **_CONSTRUCTOR},
+    'constructor_standings': {**_RACE, **_STANDING, 'constructorID': 'category', 'name': 'category',
+                              'constructor': 'category', 'nationality': 'category'},
+    'laps': {**_RACE, 'driverID': 'category', 'lap': 'int16', 'position': 'int16', 'milliseconds': 'milliseconds'},
+    'pit_stops': {**_RACE, 'driverID': 'category', 'stop': 'int16', 'lap': 'int16', 'time': 'duration',
+                  'milliseconds': 'milliseconds'},
+}
+
+
+def milliseconds(values):
+    """
+    Parses durations such as '1:32.478', '1:32:58.710' or '22.190' into integer milliseconds,
+    in a single vectorized pass. Values that are missing or not durations become <NA>.
+
+    Parameters
+    ----------
+    values: list or pandas.Series
+        The durations as text.
+
+    Returns
+    -------
+    pandas.Series
+        Of dtype Int64.
+
+    Examples
+    --------
+    >>> milliseconds(['1:32.478', '1:32:58.710', None]).tolist()
+    [92478, 5578710, <NA>]
+    """
+    text = pd.Series(values, dtype=object)
+    try:
+        parts = text.str.split(':', expand=True)
+    except AttributeError:
+        # No value is text
+        parts = pd.DataFrame(index=text.index)
+    if parts.empty:
+        return pd.Series(pd.NA, index=text.index, dtype='Int64')
+    # Fields are left aligned: the first one is hours or minutes or seconds, each following one adds a base 60 digit
+    total = pd.to_numeric(parts[0], errors='coerce')
+    for column in parts.columns[1:]:
+        field = pd.to_numeric(parts[column], errors='coerce')
+        total = total.where(field.isna(), total * 60 + field)
+    return (total * 1000).round().astype('Int64').rename(text.name)
+
+
+def convert(values, kind):
+    """
+    Converts the values of a column to one of the kinds of `SCHEMAS`. Values already converted are returned as they are.
+
+    Parameters
+    ----------
+    values: list or pandas.Series
+        The values, as text.
+    kind: str
+        The kind of the column, e.g. 'Int64' or 'category'.
+
+    Returns
+    -------
+    array-like
+        Of the same length as `values`.
+    """
+    dtype = getattr(values, 'dtype', None)
+    if kind == 'category':
+        return values if isinstance(dtype, pd.CategoricalDtype) else pd.Categorical(values)
+    if kind == 'datetime':
+        return values if pd.api.types.is_datetime64_any_dtype(dtype) else pd.to_datetime(values, errors='coerce')
+    if kind in ('duration', 'millis') and pd.api.types.is_timedelta64_dtype(dtype):
+        return values
+    if kind == 'duration':
+        return pd.to_timedelta(milliseconds(values).to_numpy('float64', na_value=np.nan), unit='ms')
+    if kind == 'milliseconds':
+        if pd.api.types.is_numeric_dtype(dtype):
+            return pd.array(values, dtype='Int32')
+        return milliseconds(values).astype('Int32').array
+    numbers = _numbers(values)
+    if kind == 'millis':
+        return pd.to_timedelta(numbers, unit='ms')
+    if kind.islower():
+        return numbers.astype(kind)
+    return pd.array(numbers, dtype='Float64').astype(kind)
+
+
+def _numbers(values):
+    # Text to float64, with a fast path for columns holding only numbers and missing values
+    try:
+        return np.asarray(values, dtype='float64')
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy('float64', na_value=np.nan)
+
+
+def columns(data, dataset):
+    """
+    Converts columns to the types of a dataset before a frame is built from them, see `SCHEMAS`.
+
+    Parameters
+    ----------
+    data: dict
+        The values of each column, e.g. from `pyergast.flatten.columns`.
+    dataset: str
+        The name of the dataset, e.g. 'results'.
+
+    Returns
+    -------
+    dict
+    """
+    types = SCHEMAS[dataset]
+    return {column: convert(values, types[column]) if column in types else values for column, values in data.items()}
+
+
+def apply(frame, dataset):
+    """
+    Converts the columns of a frame to the types of a dataset, see `SCHEMAS`.
+    Columns already converted are left as they are, so it is safe to apply a schema twice.
+
+    Parameters
+    ----------
+    frame: pandas.DataFrame
+        A frame with the columns returned by the API, as text.
+    dataset: str
+        The name of the dataset, e.g. 'results'.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    types = SCHEMAS[dataset]
+    converted = {column: convert(frame[column], types[column]) for column in frame.columns if column in types}
+    return frame.assign(**converted) if converted else frame
+
+
+def plain(data, dataset=None):
+    """
+    Converts columns to the plain Python values of the types of a dataset, without pandas:
+    numbers become int or float, 'datetime' columns datetime.date, 'duration' and 'millis' columns
+    datetime.timedelta and 'milliseconds' columns int. Missing values, and values that are not of their type,
+    become None.
+
+    Parameters
+    ----------
+    data: dict
+        The values of each column, e.g. from `pyergast.flatten.columns`.
+    dataset: str
+        An optional dataset whose types the columns are converted to, e.g. 'results'.
+
+    Returns
+    -------
+    dict
+        A list of values per column.
+    """
+    types = SCHEMAS[dataset] if dataset is not None else {}
+    return {name: [_plain(value, _PLAIN.get(types.get(name))) for value in values] for name, values in data.items()}
+
+
+def build(data, dataset=None, output='frame'):
+    """
+    Builds the result of a query from columns, in the form asked for with its `output` parameter.
+
+    Parameters
+    ----------
+    data: dict
+        The values of each column, e.g. from `pyergast.flatten.columns`.
+    dataset: str
+        An optional dataset whose types the columns are converted to, e.g. 'results'.
+    output: str
+        'frame' for a pandas.DataFrame, 'records' for a list of dicts, see `records`,
+        'arrow' for a pyarrow.Table, see `arrow`, or 'polars' for a polars.DataFrame, see `to_polars`.
+
+    Returns
+    -------
+    pandas.DataFrame, list of dict, pyarrow.Table or polars.DataFrame
+    """
+    if output == 'records':
+        return records(data, dataset)
+    if output == 'arrow':
+        return arrow(data, dataset)
+    if output == 'polars':
+        return to_polars(arrow(data, dataset))
+    return pd.DataFrame(columns(data, dataset) if dataset is not None else data)
+
+
+def records(data, dataset=None):
+    """
+    Converts columns to plain Python values, see `plain`, and returns them as one dict per row.
+
+    Parameters
+    ----------
+    data: dict
+        The values of each column, e.g. from `pyergast.flatten.columns`.
+    dataset: str
+        An optional dataset whose types the columns are converted to, e.g. 'results'.
+
+    Returns
+    -------
+    list of dict
+
+    Example
+    -------
+    >>> records({'round': ['1'], 'Q1': ['1:32.478']}, 'qualifying')
+    [{'round': 1, 'Q1': datetime.timedelta(seconds=92, microseconds=478000)}]
+    """
+    columns = plain(data, dataset)
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def frame_records(frame):
+    """
+    Converts the rows of a typed frame, e.g. read from a local source, to the plain Python values of `records`:
+    dates become datetime.date, durations datetime.timedelta, numpy scalars Python numbers and missing values None,
+    so that records have the same types whichever way they were built.
+
+    Parameters
+    ----------
+    frame: pandas.DataFrame
+        A frame typed with `apply`.
+
+    Returns
+    -------
+    list of dict
+    """
+    columns = {name: [_python(value) for value in frame[name].tolist()] for name in frame.columns}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def _python(value):
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    if isinstance(value, pd.Timedelta):
+        return value.to_pytimedelta()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA or value is pd.NaT or value != value:
+        return None
+    return value
+
+
+def arrow(data, dataset=None):
+    """
+    Builds an Arrow table from columns, with the Arrow types of a dataset and without a pandas.DataFrame in between.
+    Category columns, such as driver and constructor IDs, are dictionary encoded; durations are
+    `duration[ms]` and dates `date32`. Requires pyarrow.
+
+    Parameters
+    ----------
+    data: dict
+        The values of each column, e.g. from `pyergast.flatten.columns`.
+    dataset: str
+        An optional dataset whose types the columns are converted to, e.g. 'results'.
+
+    Returns
+    -------
+    pyarrow.Table
+    """
+    assert lazy.available('pyarrow'), "output='arrow' requires pyarrow, install it with `pip install pyarrow`"
+    types = SCHEMAS[dataset] if dataset is not None else {}
+    return pa.table({name: _arrow_array(values, types.get(name)) for name, values in plain(data, dataset).items()})
+
+
+def to_polars(table):
+    """
+    Hands an Arrow table over to Polars, without copying its columns. Requires polars.
+
+    Parameters
+    ----------
+    table: pyarrow.Table
+        A table, e.g. from `arrow`.
+
+    Returns
+    -------
+    polars.DataFrame
+    """
+    assert lazy.available('polars'), "output='polars' requires polars, install it with `pip install polars`"
+    return pl.from_arrow(table)
+
+
+def _arrow_array(values, kind):
+    if kind == 'category':
+        return pa.array(values, type=pa.string()).dictionary_encode()
+    if kind in _ARROW:
+        return pa.array(values, type=getattr(pa, _ARROW[kind][0])(*_ARROW[kind][1:]))
+    array = pa.array(values)
+    # Text columns where every value is missing are still text
+    return array.cast(pa.string()) if pa.types.is_null(array.type) else array
+
+
+def _plain(value, convert):
+    # Missing values are None or NaN, the only value not equal to itself
+    if value is None or value != value:
+        return None
+    if convert is None:
+        return value
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_milliseconds(text):
+    # Pure Python equivalent of `milliseconds` for one value
+    if not isinstance(text, str):
+        return int(text)
+    total = 0.0
+    for field in text.split(':'):
+        total = total * 60 + float(field)
+    return round(total * 1000)
+
+
+# Conversion of one value of each kind to a plain Python value, see `records`
+_PLAIN = {
+    'Int64': int,
+    'int64': int,
+    'int16': int,
+    'Float64': float,
+    'datetime': lambda value: datetime.date.fromisoformat(value[:10]),
+    'duration': lambda value: datetime.timedelta(milliseconds=_parse_milliseconds(value)),
+    'millis': lambda value: datetime.timedelta(milliseconds=int(value)),
+    'milliseconds': _parse_milliseconds,
+}
+
+# Arrow type of each kind, as the name of its pyarrow factory and its arguments, see `arrow`
+_ARROW = {
+    'Int64': ('int64',),
+    'int64': ('int64',),
+    'int16': ('int16',),
+    'Float64': ('float64',),
+    'datetime': ('date32',),
+    'duration': ('duration', 'ms'),
+    'millis': ('duration', 'ms'),
+    'milliseconds': ('int32',),
+}
@@ -0,0 +1,250 @@
+import re
+import threading
+import unicodedata
+
+from pyergast import reference
+
+# Fields indexed for each reference table, each one made of one or more columns joined by a space
+FIELDS = {
+    'drivers': {
+        'driverId': ('driverId',),
+        'name': ('givenName', 'familyName'),
+        'familyName': ('familyName',),
+        'code': ('code',),
+    },
+    'constructors': {
+        'constructorId': ('constructorId',),
+        'name': ('name',),
+    },
+    'circuits': {
+        'circuitId': ('circuitId',),
+        'circuitName': ('circuitName',),
+        'Locality': ('Locality',),
+        'Country': ('Country',),
+    },
+}
+
+ID_COLUMNS = {'drivers': 'driverId', 'constructors': 'constructorId', 'circuits': 'circuitId'}
+
+# Letters that Unicode decomposition does not reduce to plain ASCII
+_TRANSLATE = str.maketrans({'ø': 'o', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'þ': 'th'})
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def fold(text):
+    """
+    Folds a name for matching: accents are removed, letters are lowercased and
+    punctuation is collapsed into single spaces.
+
+    Parameters
+    ----------
+    text: str
+        The text to be folded.
+
+    Returns
+    -------
+    str
+
+    Example
+    -------
+    >>> pyergast.search.fold('Räikkönen')
+    'raikkonen'
+    >>> pyergast.search.fold('Lotus-Pratt &amp; Whitney')
+    'lotus pratt amp whitney'
+    """
+    text = unicodedata.normalize('NFKD', str(text).lower().translate(_TRANSLATE))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^0-9a-z]+', ' ', text).strip()
+
+
+def collate(text):
+    """
+    Returns the sort key of a name in the order of the API, which ignores accents and case
+    but, unlike `fold`, keeps punctuation, e.g. 'Lotus F1' sorts before 'Lotus-Borgward'.
+
+    Parameters
+    ----------
+    text: str
+        The name to be sorted.
+
+    Returns
+    -------
+    str
+
+    Example
+    -------
+    >>> pyergast.search.collate('Räikkönen')
+    'raikkonen'
+    """
+    text = unicodedata.normalize('NFKD', str(text).lower().translate(_TRANSLATE))
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def trigrams(text):
+    """
+    Returns the set of three letter substrings of a folded text.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _similarity(a, b):
+    # Dice coefficient of the trigram sets, falling back to equality for very short texts
+    if a == b:
+        return 1.0
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2.0 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class SearchIndex:
+    """
+    Token and trigram index over the names of a table, built once and queried many times.
+
+    Parameters
+    ----------
+    frame: pandas.DataFrame or list of dict
+        The table to be indexed, e.g. the output of `get_drivers`, as a frame or as records.
+    fields: dict
+        Maps a field name to the tuple of columns joined to build it.
+    """
+
+    def __init__(self, frame, fields):
+        self.frame = frame
+        self.fields = list(fields)
+        self._texts = []
+        self._tokens = {}
+        self._trigrams = {}
+        columns = {name: [self.column(c) for c in cols] for name, cols in fields.items()}
+        for row in range(len(frame)):
+            texts = []
+            for name in self.fields:
+                values = [v for v in (column[row] for column in columns[name]) if isinstance(v, str)]
+                text = fold(' '.join(values))
+                texts.append(text)
+                for token in text.split():
+                    self._tokens.setdefault(token, set()).add(row)
+                for gram in trigrams(text):
+                    self._trigrams.setdefault(gram, set()).add(row)
+            self._texts.append(texts)
+
+    def column(self, name):
+        """
+        Returns the values of a column of the table, in order, or None for every row when it has no such column.
+        """
+        if isinstance(self.frame, list):
+            return [row.get(name) for row in self.frame]
+        return self.frame[name].tolist() if name in self.frame else [None] * len(self.frame)
+
+    def rows(self, positions):
+        """
+        Returns the rows of the table at some positions: a slice of a frame, keeping the positions as its index,
+        or copies of the records of a list.
+
+        Parameters
+        ----------
+        positions: list
+            The positions of the rows, e.g. from `contains`.
+
+        Returns
+        -------
+        pandas.DataFrame or list of dict
+        """
+        if isinstance(self.frame, list):
+            return [dict(self.frame[position]) for position in positions]
+        return self.frame.iloc[list(positions)]
+
+    def _positions(self, fields):
+        if fields is None:
+            return range(len(self.fields))
+        return [self.fields.index(f) for f in fields]
+
+    def contains(self, query, fields=None):
+        """
+        Finds the rows where one of the fields contains the folded query.
+
+        Parameters
+        ----------
+        query: str
+            The text to look for.
+        fields: list
+            An optional parameter that restricts the search to some of the fields.
+
+        Returns
+        -------
+        set
+            Positions of the matching rows.
+        """
+        q = fold(query)
+        grams = trigrams(q)
+        if grams:
+            candidates = set.intersection(*(self._trigrams.get(g, set()) for g in grams))
+        else:
+            candidates = range(len(self._texts))
+        positions = self._positions(fields)
+        return {row for row in candidates if any(q in self._texts[row][p] for p in positions)}
+
+    def match(self, query, limit=5):
+        """
+        Ranks the rows by how closely one of their fields matches the query, tolerating typos.
+
+        Parameters
+        ----------
+        query: str
+            The text to look for.
+        limit: int
+            The maximum number of matches returned.
+
+        Returns
+        -------
+        list of tuple
+            (position, score) pairs, best match first. Scores range from 0 to 1.
+        """
+        q = fold(query)
+        candidates = set()
+        for gram in trigrams(q):
+            candidates |= self._trigrams.get(gram, set())
+        for token in q.split():
+            candidates |= self._tokens.get(token, set())
+        scored = []
+        for row in candidates:
+            score = max(_similarity(q, text) for text in self._texts[row])
+            scored.append((row, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def resolve(self, query, threshold=0.5):
+        """
+        Returns the position of the best match of the query, or None if no match scores above `threshold`.
+        """
+        matches = self.match(query, limit=1)
+        if matches and matches[0][1] >= threshold:
+            return matches[0]
+        return None
+
+
+def index(name):
+    """
+    Returns the search index of a reference table, building it on first use and
+    again whenever the table is refreshed, see `pyergast.reference`.
+
+    Parameters
+    ----------
+    name: str
+        One of 'drivers', 'constructors' or 'circuits', or their plain records, e.g. 'drivers.records'.
+
+    Returns
+    -------
+    SearchIndex
+    """
+    fields = FIELDS.get(name.partition('.')[0])
+    assert fields is not None, 'Unknown reference table {}'.format(name)
+    frame = reference.get(name)
+    with _lock:
+        built = _indexes.get(name)
+        if built is None or built.frame is not frame:
+            built = SearchIndex(frame, fields)
+            _indexes[name] = built
+        return built
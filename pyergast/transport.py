@@ -0,0 +1,301 @@
+import copy
+import datetime
+import email.utils
+import threading
+import time
+
+from pyergast import cache, decode, lazy, metrics, ratelimit, revalidate
+
+# Imported on first use, see `pyergast.lazy`
+requests = lazy.module('requests')
+adapters = lazy.module('requests.adapters')
+
+# Settings of the shared session, changed through `configure`
+_settings = {
+    'pool_size': 10,
+    'timeout': 30,
+    'max_retries': 5,
+    'backoff_factor': 0.5,
+    'base_url': 'http://ergast.com/api/f1',
+}
+
+# Status codes that are worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_lock = threading.Lock()
+
+# Requests in flight, by normalized URL, see `get_json`
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def configure(pool_size=None, timeout=None, max_retries=None, backoff_factor=None, base_url=None):
+    """
+    Changes the settings of the HTTP session shared by every pyergast function.
+    The current session is closed and a new one is created on the next request.
+
+    Parameters
+    ----------
+    pool_size: int
+        An optional parameter that specifies the number of keep-alive connections kept per host.
+    timeout: float
+        An optional parameter that specifies the number of seconds to wait for the API to respond.
+    max_retries: int
+        An optional parameter that specifies how many times a failed request is retried.
+    backoff_factor: float
+        An optional parameter that specifies the exponential backoff between retries, in seconds.
+    base_url: str
+        An optional parameter that specifies the root of the API every URL is built from,
+        e.g. the address of a `pyergast.replay` server.
+
+    Returns
+    -------
+    dict
+        The settings now in effect.
+
+    Example
+    -------
+    >>> pyergast.transport.configure(pool_size=20, max_retries=8)
+    {'pool_size': 20, 'timeout': 30, 'max_retries': 8, 'backoff_factor': 0.5, 'base_url': 'http://ergast.com/api/f1'}
+    """
+    global _session
+    updates = {'pool_size': pool_size, 'timeout': timeout,
+               'max_retries': max_retries, 'backoff_factor': backoff_factor, 'base_url': base_url}
+    with _lock:
+        for key, value in updates.items():
+            if value is not None:
+                _settings[key] = value
+        if _session is not None:
+            _session.close()
+            _session = None
+        return dict(_settings)
+
+
+def settings():
+    """
+    Returns the settings of the shared session, see `configure`.
+
+    Returns
+    -------
+    dict
+    """
+    return dict(_settings)
+
+
+def api_url(path=''):
+    """
+    Returns the URL of a path of the API, under the base URL set with `configure`.
+
+    Parameters
+    ----------
+    path: str
+        The path, relative to the root of the API.
+
+    Returns
+    -------
+    str
+
+    Example
+    -------
+    >>> pyergast.transport.api_url('2014/results.json')
+    'http://ergast.com/api/f1/2014/results.json'
+    """
+    return _settings['base_url'].rstrip('/') + '/' + path
+
+
+def get_session():
+    """
+    Returns the pooled `requests.Session` shared by every pyergast function, creating it on first use.
+
+    The session itself never retries: failed requests are retried by `get_json`, so that every attempt
+    takes a token from the rate limiter, see `pyergast.ratelimit`.
+
+    Returns
+    -------
+    requests.Session
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            adapter = adapters.HTTPAdapter(pool_connections=_settings['pool_size'],
+                                           pool_maxsize=_settings['pool_size'])
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def get_json(url):
+    """
+    Fetches a URL through the shared session and decodes the JSON body, see `pyergast.decode`.
+    The response cache is checked first when it is enabled, see `pyergast.cache.enable`.
+    Large responses that are not cached are parsed as they arrive, without buffering the body.
+    Requests that fail with a connection error or one of `RETRY_STATUSES` are retried with exponential
+    backoff, honouring the `Retry-After` header sent along with a 429, and every attempt waits for the
+    rate limiter, see `pyergast.ratelimit`.
+    Live queries are revalidated, and get the payload decoded before when they have not changed,
+    see `pyergast.revalidate`.
+
+    Threads asking for the same URL at the same time share a single request: the first one fetches it,
+    the others wait for its response and each get their own decoded copy.
+    Every call is recorded, see `pyergast.metrics`.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the API to be queried.
+
+    Returns
+    -------
+    dict
+    """
+    body = cache.get(url)
+    if body is not None:
+        start = time.perf_counter()
+        payload = decode.loads(body)
+        metrics.request(url, 200, len(body), decode=time.perf_counter() - start, cache='hit')
+        return payload
+    key = cache.normalize_url(url)
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+        else:
+            flight.waiters += 1
+    if leader:
+        return _lead(flight, key, url)
+    flight.done.wait()
+    if flight.error is not None:
+        raise flight.error
+    start = time.perf_counter()
+    payload = decode.loads(flight.body) if flight.body is not None else copy.deepcopy(flight.payload)
+    metrics.request(url, 200, len(flight.body or b''), decode=time.perf_counter() - start,
+                    cache='off' if cache.active() is None else 'miss', coalesced=True)
+    return payload
+
+
+class _Flight:
+    # A request in flight, and the outcome shared with the threads waiting for it
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.body = None
+        self.payload = None
+        self.error = None
+
+
+def _lead(flight, key, url):
+    payload = None
+    try:
+        flight.body, payload = _fetch(url)
+        return payload
+    except BaseException as error:
+        flight.error = error
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        # A streamed payload has no body to decode again, so waiters get copies of it taken before it is returned
+        if flight.error is None and flight.body is None and flight.waiters:
+            flight.payload = copy.deepcopy(payload)
+        flight.done.set()
+
+
+def retry_delay(attempt, retry_after, backoff_factor):
+    """
+    Returns the number of seconds to wait before retrying a failed request.
+
+    Parameters
+    ----------
+    attempt: int
+        The number of the attempt that failed, from 0.
+    retry_after: str
+        The `Retry-After` header of the response, in seconds or as an HTTP date, or None.
+    backoff_factor: float
+        The exponential backoff between retries, in seconds, see `configure`.
+
+    Returns
+    -------
+    float
+    """
+    delay = backoff_factor * (2 ** attempt)
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    elif retry_after:
+        try:
+            date = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return delay
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        # A date already past does not wait any longer than the backoff
+        wait = (date - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+        delay = max(delay, wait, 0)
+    return delay
+
+
+def _send(url, headers, outcome):
+    # Returns the response to the last attempt at a request and the time it was sent, updating its outcome.
+    # Every attempt takes a token from the rate limiter, so that retries count against the quotas.
+    max_retries = _settings['max_retries']
+    for attempt in range(max_retries + 1):
+        outcome['wait'] += ratelimit.acquire() or 0
+        start = time.perf_counter()
+        retry_after = None
+        outcome.update(status=None, retries=attempt)
+        try:
+            r = get_session().get(url, timeout=_settings['timeout'], stream=True, headers=headers)
+        except Exception as error:
+            retryable = isinstance(error, (requests.ConnectionError, requests.Timeout))
+            if attempt == max_retries or not retryable:
+                metrics.request(url, latency=time.perf_counter() - start, **outcome)
+                raise
+        else:
+            outcome['status'] = r.status_code
+            if attempt == max_retries or r.status_code not in RETRY_STATUSES:
+                return r, start
+            retry_after = r.headers.get('Retry-After')
+            r.close()
+        time.sleep(retry_delay(attempt, retry_after, _settings['backoff_factor']))
+
+
+def _fetch(url):
+    # Returns the body of a response and its decoded payload, without the body when it was streamed or not modified
+    outcome = {'cache': 'off' if cache.active() is None else 'miss', 'wait': 0}
+    headers, stored = revalidate.conditional(url)
+    if cache.active() is None and decode.streaming():
+        # A compressed body has no known size, and would always be decoded whole
+        headers = dict(headers, **{'Accept-Encoding': 'identity'})
+    r, start = _send(url, headers, outcome)
+    if r.status_code == 304 and stored is not None:
+        r.close()
+        metrics.request(url, latency=time.perf_counter() - start, **outcome)
+        return None, stored
+    if r.status_code != 200:
+        metrics.request(url, latency=time.perf_counter() - start, **outcome)
+    assert r.status_code == 200, 'Cannot connect to Ergast API. Check your inputs.'
+    length = r.headers.get('Content-Length')
+    # The Content-Length of a compressed body is not the size of the JSON, which is then unknown
+    encoded = r.headers.get('Content-Encoding', 'identity') != 'identity'
+    if cache.active() is None and decode.should_stream(int(length) if length and not encoded else None):
+        r.raw.decode_content = True
+        # The body is parsed as it is downloaded, so the latency only runs until the headers arrive
+        latency = time.perf_counter() - start
+        try:
+            payload = decode.stream(r.raw)
+        finally:
+            r.close()
+        metrics.request(url, size=int(length or 0), latency=latency, decode=time.perf_counter() - start - latency,
+                        **outcome)
+        revalidate.store(url, r.headers, payload)
+        return None, payload
+    body = r.content
+    latency = time.perf_counter() - start
+    cache.put(url, body)
+    payload = decode.loads(body)
+    metrics.request(url, size=len(body), latency=latency, decode=time.perf_counter() - start - latency, **outcome)
+    revalidate.store(url, r.headers, payload)
+    return body, payload
@@ -0,0 +1,406 @@
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import tempfile
+
+import pandas as pd
+
+from pyergast import bulk, local, pyergast
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# File recording the high-water mark, i.e. the last season and round synced, of each dataset
+STATE_FILE = '_state.json'
+
+# Schema metadata key listing the columns of dicts stored as JSON text, e.g. `Time` of the race results
+_JSON_COLUMNS = b'pyergast.json_columns'
+_PARTITION = re.compile(r'season=(\d+)(?:/round=(\d+))?$')
+
+FIRST_SEASON = 1950
+
+# How long after its start a race is expected to have finished and been published
+RACE_DURATION = datetime.timedelta(hours=3)
+
+
+class Warehouse(local.LocalSource):
+    """
+    Local Parquet dataset mirroring the Ergast history, partitioned by season and round.
+
+    The layout is `<path>/<dataset>/season=<season>/round=<round>/part.parquet`, readable by any Parquet tool.
+    Reference datasets ('drivers', 'constructors', 'circuits') are stored in `<path>/<dataset>/part.parquet`
+    and the schedule in `<path>/schedule/season=<season>/part.parquet`.
+
+    Parameters
+    ----------
+    path: str
+        The root directory of the dataset.
+    """
+
+    def __init__(self, path):
+        assert pa is not None, 'pyergast.warehouse requires pyarrow, install it with `pip install pyarrow`'
+        self.path = os.path.abspath(os.path.expanduser(path))
+
+    def _directory(self, dataset, season=None, round=None):
+        parts = [self.path, dataset]
+        if season is not None:
+            parts.append('season={}'.format(season))
+        if round is not None:
+            parts.append('round={}'.format(round))
+        return os.path.join(*parts)
+
+    def partitions(self, dataset):
+        keys = []
+        root = self._directory(dataset)
+        for file in glob.glob(os.path.join(root, '**', 'part.parquet'), recursive=True):
+            match = _PARTITION.search(os.path.dirname(file)[len(root):].replace(os.sep, '/'))
+            if match:
+                keys.append((int(match.group(1)), int(match.group(2)) if match.group(2) else None))
+        return sorted(keys, key=lambda key: (key[0], key[1] or 0))
+
+    def read(self, dataset, season=None, round=None):
+        if dataset in local.REFERENCE_DATASETS:
+            files = [os.path.join(self._directory(dataset), 'part.parquet')]
+        else:
+            files = [os.path.join(self._directory(dataset, *key), 'part.parquet') for key in self.partitions(dataset)
+                     if (season is None or key[0] == season) and (round is None or key[1] == round)]
+        frames = [_read_file(file) for file in files if os.path.exists(file)]
+        assert frames, 'No {} stored locally for season {} round {}'.format(dataset, season, round)
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def write(self, dataset, frame, season=None, round=None):
+        """
+        Stores the rows of a partition, atomically replacing the ones stored before.
+        """
+        directory = self._directory(dataset, season, round)
+        _atomic_write(os.path.join(directory, 'part.parquet'), lambda file: pq.write_table(_to_table(frame), file))
+
+    def marks(self):
+        """
+        Returns the high-water mark of each dataset: the last (season, round) synced.
+
+        Returns
+        -------
+        dict
+        """
+        file = os.path.join(self.path, STATE_FILE)
+        if not os.path.exists(file):
+            return {}
+        with open(file) as state:
+            return {dataset: tuple(mark) for dataset, mark in json.load(state).items()}
+
+    def set_mark(self, dataset, season, round):
+        """
+        Records the last (season, round) synced for a dataset, if it is past its current high-water mark.
+        """
+        marks = self.marks()
+        if dataset in marks and marks[dataset] >= (season, round):
+            return
+        marks[dataset] = (int(season), int(round))
+
+        def dump(file):
+            with open(file, 'w') as state:
+                json.dump(marks, state, indent=2, sort_keys=True)
+        _atomic_write(os.path.join(self.path, STATE_FILE), dump)
+
+    def write_rounds(self, dataset, frame):
+        """
+        Stores a frame with `season` and `round` columns, one partition per round.
+        """
+        for (season, race), rows in frame.groupby(['season', 'round'], sort=False):
+            self.write(dataset, rows.reset_index(drop=True), int(season), int(race))
+
+
+def _atomic_write(path, write):
+    # Writes to a temporary file next to `path`, then renames it, so readers never see a partial file
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(handle)
+    try:
+        write(temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def _to_table(frame):
+    # Dicts are not a Parquet type, so columns holding them are stored as JSON text
+    frame = frame.copy()
+    json_columns = []
+    for column in frame.columns:
+        if frame[column].dtype == object and frame[column].map(lambda v: isinstance(v, dict)).any():
+            frame[column] = frame[column].map(lambda v: json.dumps(v) if isinstance(v, dict) else None)
+            json_columns.append(column)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_JSON_COLUMNS] = json.dumps(json_columns).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def _read_file(file):
+    table = pq.read_table(file)
+    frame = table.to_pandas()
+    for column in json.loads((table.schema.metadata or {}).get(_JSON_COLUMNS, b'[]')):
+        frame[column] = frame[column].map(lambda v: json.loads(v) if isinstance(v, str) else float('nan'))
+    return frame
+
+
+def _seasons(years):
+    if years is None:
+        return list(range(FIRST_SEASON, datetime.date.today().year + 1))
+    return [years] if isinstance(years, int) else list(years)
+
+
+def sync_season(store, year, max_workers=bulk.MAX_WORKERS):
+    """
+    Fetches the schedule, results, qualifying, lap times, pit stops and standings of a season from the API into a
+    warehouse. Lap times, pit stops and standings are fetched for every round with results.
+
+    Parameters
+    ----------
+    store: Warehouse
+        The warehouse to write to.
+    year: int
+        The season to be fetched.
+    max_workers: int
+        The number of rounds fetched concurrently.
+
+    Returns
+    -------
+    list
+        The rounds stored.
+    """
+    store.write('schedule', pyergast.get_schedule(year), year)
+    results = pyergast.get_race_result(year)
+    if results.empty:
+        return []
+    _store_rounds(store, 'results', results)
+    rounds = sorted(results['round'].unique().tolist())
+    items = [(year, race) for race in rounds]
+    if year >= 1996:
+        _store_rounds(store, 'qualifying', pyergast.get_qualifying_result(year))
+        _store_rounds(store, 'laps', bulk.fan_out(pyergast.get_lap_times, items, max_workers, 'raise'))
+    if year >= 2011:
+        _store_rounds(store, 'pit_stops', bulk.fan_out(pyergast.get_pit_stops, items, max_workers, 'raise'))
+    _store_rounds(store, 'driver_standings', bulk.fan_out(pyergast.driver_standings, items, max_workers, 'raise'))
+    if year >= 1958:
+        _store_rounds(store, 'constructor_standings',
+                      bulk.fan_out(pyergast.constructor_standings, items, max_workers, 'raise'))
+    return rounds
+
+
+def _store_rounds(store, dataset, frame):
+    # Writes the rounds first and moves the high-water mark after, so that a crash never skips a round
+    if frame.empty:
+        return
+    store.write_rounds(dataset, frame)
+    store.set_mark(dataset, *max(zip(frame['season'], frame['round'])))
+
+
+def sync(path, years=None, max_workers=bulk.MAX_WORKERS):
+    """
+    Mirrors drivers, constructors, circuits, schedules, results, qualifying, lap times, pit stops and standings
+    from the API into a local Parquet dataset, using the pyergast functions as the ingest path.
+
+    A first sync is bound by the hourly rate limit; building the dataset from the database dump is much faster,
+    see `pyergast.dump.DumpStore.export`.
+
+    Parameters
+    ----------
+    path: str
+        The root directory of the dataset.
+    years: int or list
+        An optional parameter that specifies the seasons to be mirrored. Defaults to every season since 1950.
+    max_workers: int
+        An optional parameter that specifies how many rounds are fetched concurrently.
+
+    Returns
+    -------
+    Warehouse
+
+    See Also
+    --------
+    pyergast.ratelimit : the hourly request budget that bounds a sync
+
+    Example
+    -------
+    >>> store = pyergast.warehouse.sync('~/ergast')
+    >>> pyergast.use_source(store)
+    """
+    store = Warehouse(path)
+    assert pyergast._source is None, 'Cannot sync while answering from a local source, call use_source(None)'
+    store.write('drivers', pyergast.get_drivers())
+    store.write('constructors', pyergast.get_constructors())
+    store.write('circuits', pyergast.get_circuits())
+    for year in _seasons(years):
+        sync_season(store, year, max_workers)
+    return store
+
+
+# Fetcher of a single round of each dataset, and the first season it is available for
+ROUND_FETCHERS = {
+    'results': ('get_race_result', FIRST_SEASON),
+    'qualifying': ('get_qualifying_result', 1996),
+    'laps': ('get_lap_times', 1996),
+    'pit_stops': ('get_pit_stops', 2011),
+    'driver_standings': ('driver_standings', FIRST_SEASON),
+    'constructor_standings': ('constructor_standings', 1958),
+}
+
+
+def finished_rounds(schedule, now=None):
+    """
+    Returns the rounds of a schedule whose race has finished, assuming it lasts `RACE_DURATION`.
+
+    Parameters
+    ----------
+    schedule: pandas.DataFrame
+        The output of `get_schedule`.
+    now: datetime.datetime
+        An optional parameter that specifies the current UTC time.
+
+    Returns
+    -------
+    list of int
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    times = schedule['time'] if 'time' in schedule else [None] * len(schedule)
+    rounds = []
+    for race, date, time in zip(schedule['round'], schedule['date'], times):
+        start = datetime.datetime.strptime('{:%Y-%m-%d} {}'.format(pd.Timestamp(date),
+                                                                   (time if isinstance(time, str) else '12:00:00')[:8]),
+                                           '%Y-%m-%d %H:%M:%S')
+        if start + RACE_DURATION <= now:
+            rounds.append(int(race))
+    return rounds
+
+
+def _refresh_reference(store, dataset, key, ids):
+    # Fetches a reference table again only when new drivers, constructors or circuits show up
+    if not len(ids):
+        return
+    known = set(store.read(dataset)[key])
+    if not set(ids) <= known:
+        store.write(dataset, getattr(pyergast, 'get_' + dataset)())
+
+
+def update(path, max_workers=bulk.MAX_WORKERS, now=None):
+    """
+    Brings a local Parquet dataset up to date, fetching only the rounds finished since its high-water marks.
+    A post-race refresh costs a handful of requests. The dataset is fully synced first if it has no marks yet,
+    which is slow under the hourly rate limit, see `sync`.
+
+    Parameters
+    ----------
+    path: str
+        The root directory of the dataset.
+    max_workers: int
+        An optional parameter that specifies how many rounds are fetched concurrently.
+    now: datetime.datetime
+        An optional parameter that specifies the current UTC time, used to tell which rounds have finished.
+
+    Returns
+    -------
+    dict
+        The rounds fetched for each dataset.
+
+    Example
+    -------
+    >>> pyergast.warehouse.update('~/ergast')
+    {'results': [(2020, 17)], 'qualifying': [(2020, 17)], 'driver_standings': [(2020, 17)], ...}
+    """
+    store = Warehouse(path)
+    assert pyergast._source is None, 'Cannot update while answering from a local source, call use_source(None)'
+    marks = store.marks()
+    if not marks:
+        sync(path, max_workers=max_workers)
+        return {}
+    current = pyergast.get_schedule()
+    current_season = int(current['season'].iloc[0])
+    first = min(mark[0] for mark in marks.values())
+    schedules = {season: pyergast.get_schedule(season) for season in range(first, current_season)}
+    schedules[current_season] = current
+    finished = {season: finished_rounds(schedule, now) for season, schedule in schedules.items()}
+    for season, schedule in schedules.items():
+        store.write('schedule', schedule, season)
+    _refresh_reference(store, 'circuits', 'circuitId', current['circuitID'])
+
+    fetched = {}
+    for dataset, (name, since) in ROUND_FETCHERS.items():
+        mark = marks.get(dataset, (since - 1, 0))
+        items = [(season, race) for season in sorted(finished) if season >= since
+                 for race in finished[season] if (season, race) > mark]
+        if not items:
+            continue
+        frame = bulk.fan_out(getattr(pyergast, name), items, max_workers, 'ignore')
+        done = set(zip(frame['season'], frame['round'])) if not frame.empty else set()
+        # Only the rounds up to the first one missing upstream are kept, so the mark never skips a round
+        contiguous = []
+        for item in items:
+            if item not in done:
+                break
+            contiguous.append(item)
+        if not contiguous:
+            continue
+        keep = set(contiguous)
+        frame = frame[[key in keep for key in zip(frame['season'], frame['round'])]]
+        if dataset == 'results':
+            _refresh_reference(store, 'drivers', 'driverId', frame['driverID'].unique())
+            _refresh_reference(store, 'constructors', 'constructorId', frame['constructorID'].unique())
+        _store_rounds(store, dataset, frame)
+        fetched[dataset] = contiguous
+    return fetched
+
+
+def use(path):
+    """
+    Makes every pyergast function answer from a local Parquet dataset, see `pyergast.use_source`.
+
+    Parameters
+    ----------
+    path: str
+        The root directory of the dataset.
+
+    Returns
+    -------
+    Warehouse
+    """
+    store = Warehouse(path)
+    pyergast.use_source(store)
+    return store
+
+
+def main(argv=None):
+    """
+    Command line entry point: `pyergast sync PATH [--years FIRST LAST]` and `pyergast update PATH`.
+    """
+    parser = argparse.ArgumentParser(prog='pyergast', description='Mirror the Ergast API into a local Parquet dataset')
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('sync', help='mirror the API into PATH')
+    command.add_argument('path')
+    command.add_argument('--years', nargs=2, type=int, metavar=('FIRST', 'LAST'),
+                         help='seasons to be mirrored, defaults to every season since 1950')
+    command.add_argument('--workers', type=int, default=bulk.MAX_WORKERS, help='rounds fetched concurrently')
+    command = commands.add_parser('update', help='fetch the rounds finished since the last sync into PATH')
+    command.add_argument('path')
+    command.add_argument('--workers', type=int, default=bulk.MAX_WORKERS, help='rounds fetched concurrently')
+    args = parser.parse_args(argv)
+    if args.command == 'update':
+        update(args.path, args.workers)
+        return
+    years = range(args.years[0], args.years[1] + 1) if args.years else None
+    sync(args.path, years, args.workers)
+
+
+if __name__ == '__main__':
+    main()
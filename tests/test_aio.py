@@ -0,0 +1,149 @@
+from pyergast import aio, pyergast, ratelimit, reference, replay, transport
+import asyncio
+import json
+import pandas as pd
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web  # noqa: E402
+
+DRIVERS = [{'driverId': 'hamilton', 'givenName': 'Lewis', 'familyName': 'Hamilton'},
+           {'driverId': 'raikkonen', 'givenName': 'Kimi', 'familyName': 'Räikkönen'}]
+
+
+async def drivers_page(request):
+    limit, offset = int(request.query['limit']), int(request.query['offset'])
+    payload = {'MRData': {'limit': str(limit), 'offset': str(offset), 'total': str(len(DRIVERS)),
+                          'DriverTable': {'Drivers': DRIVERS[offset:offset + limit]}}}
+    return web.Response(body=json.dumps(payload), content_type='application/json')
+
+
+async def serve(handler, coroutine):
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await coroutine('http://127.0.0.1:{}'.format(port))
+    finally:
+        await aio.close()
+        await runner.cleanup()
+
+
+def test_get_all_concurrent_pages():
+    async def fetch(base):
+        return await aio.get_all(base + '/drivers.json', limit=1)
+
+    payload = asyncio.run(serve(drivers_page, fetch))
+    assert [d['driverId'] for d in payload['MRData']['DriverTable']['Drivers']] == ['hamilton', 'raikkonen']
+
+
+def test_retries_429():
+    calls = []
+    defaults = transport.configure(backoff_factor=0)
+
+    async def flaky(request):
+        calls.append(1)
+        if len(calls) == 1:
+            return web.Response(status=429, headers={'Retry-After': '0'})
+        return await drivers_page(request)
+
+    async def fetch(base):
+        return await aio.get_json(base + '/drivers.json?limit=10&offset=0')
+
+    try:
+        payload = asyncio.run(serve(flaky, fetch))
+    finally:
+        transport.configure(**defaults)
+    assert len(calls) == 2
+    assert payload['MRData']['total'] == '2'
+
+
+def test_find_driverid_loads_reference(monkeypatch):
+    original = reference.table('drivers')
+    reference.register('drivers', None)
+
+    async def get_all(url, limit=None):
+        return {'MRData': {'DriverTable': {'Drivers': DRIVERS}}}
+
+    monkeypatch.setattr(aio, 'get_all', get_all)
+    try:
+        result = asyncio.run(aio.find_driverid('Kimi', 'Raikkonen'))
+    finally:
+        reference._tables['drivers'] = original
+    assert result['driverId'].tolist() == ['raikkonen']
+
+
+def test_concurrent_requests_are_coalesced():
+    calls = []
+
+    async def slow(request):
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return await drivers_page(request)
+
+    async def fetch(base):
+        url = base + '/drivers.json?limit=10&offset=0'
+        return await asyncio.gather(*(aio.get_json(url) for _ in range(5)))
+
+    payloads = asyncio.run(serve(slow, fetch))
+    assert len(calls) == 1
+    assert len({id(payload) for payload in payloads}) == 5
+    assert aio._flights == {}
+
+
+def run(coroutine):
+    async def closing():
+        try:
+            return await coroutine
+        finally:
+            await aio.close()
+    return asyncio.run(closing())
+
+
+def test_history_functions():
+    with replay.serve():
+        results = run(aio.get_race_results(2014, rounds=[1, 2], max_workers=1))
+        pd.testing.assert_frame_equal(results, pyergast.get_race_results(2014, rounds=[1, 2]))
+        standings = run(aio.driver_standings_history(2014))
+        pd.testing.assert_frame_equal(standings, pyergast.driver_standings_history(2014))
+        laps = run(aio.lap_times_history(2014, rounds=1, output='records'))
+        assert laps == pyergast.lap_times_history(2014, rounds=1, output='records')
+    assert results.attrs['failures'] == []
+
+
+def test_history_failures():
+    defaults = transport.configure(max_retries=0)
+    try:
+        with replay.serve(errors={'2014/2/results.json': 500}):
+            with pytest.warns(UserWarning, match='season 2014 round 2'):
+                results = run(aio.get_race_results(2014, rounds=[1, 2]))
+            assert results['round'].unique().tolist() == [1]
+            assert [failure[:2] for failure in results.attrs['failures']] == [(2014, 2)]
+            with pytest.raises(AssertionError):
+                run(aio.get_race_results(2014, rounds=[1, 2], errors='raise'))
+    finally:
+        transport.configure(**defaults)
+
+
+def test_cancelled_wait_refunds_token():
+    defaults = ratelimit.configure()
+    ratelimit.configure(per_second=1, burst=1, per_hour=0, path=None)
+
+    async def cancel():
+        assert ratelimit.reserve() == 0
+        task = asyncio.ensure_future(aio.get_json('http://127.0.0.1:9/drivers.json'))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The cancelled request gave its token back, so the next one only waits for the first
+        return ratelimit.reserve()
+
+    try:
+        assert run(cancel()) == pytest.approx(1, abs=0.1)
+    finally:
+        ratelimit.configure(**defaults)
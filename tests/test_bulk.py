@@ -0,0 +1,100 @@
+from pyergast import bulk, pagination, pyergast
+import pandas as pd
+import pytest
+
+
+def fake_schedule(year):
+    return pd.DataFrame({'season': [str(year)] * 3, 'round': ['1', '2', '3']})
+
+
+def fake_result(year, race):
+    if (year, race) in ((2019, 2), (2017, None)):
+        raise AssertionError('Cannot connect to Ergast API. Check your inputs.')
+    if race is None:
+        return pd.DataFrame({'season': [year] * 4, 'round': [1, 1, 2, 2], 'position': ['1', '2', '1', '2']})
+    return pd.DataFrame({'position': ['1', '2'], 'driverID': ['hamilton', 'bottas']})
+
+
+def result(driverid, position):
+    return {'number': position, 'position': position, 'Driver': {'driverId': driverid, 'givenName': driverid,
+            'familyName': driverid, 'nationality': 'British'},
+            'Constructor': {'constructorId': 'mercedes', 'name': 'Mercedes'}}
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setattr(pyergast, 'get_schedule', fake_schedule)
+    monkeypatch.setattr(pyergast, 'get_race_result', fake_result)
+    monkeypatch.setattr(pyergast, 'get_qualifying_result', fake_result)
+
+
+def test_season_rounds():
+    assert bulk.season_rounds(2019, [1, 2], fake_schedule) == [(2019, 1), (2019, 2)]
+    assert bulk.season_rounds([2018], None, fake_schedule) == [(2018, 1), (2018, 2), (2018, 3)]
+
+
+def test_get_race_results(fake_api):
+    with pytest.warns(UserWarning):
+        result = pyergast.get_race_results([2018, 2019], rounds=[1, 2, 3])
+    assert result.shape == (10, 4)
+    assert list(result.columns[:2]) == ['season', 'round']
+    assert result[['season', 'round']].drop_duplicates().values.tolist() == [
+        [2018, 1], [2018, 2], [2018, 3], [2019, 1], [2019, 3]]
+    assert [failure[:2] for failure in result.attrs['failures']] == [(2019, 2)]
+
+
+def test_get_race_results_season_wide(fake_api):
+    with pytest.warns(UserWarning):
+        result = pyergast.get_race_results(range(2016, 2019))
+    assert result[['season', 'round']].drop_duplicates().values.tolist() == [
+        [2016, 1], [2016, 2], [2018, 1], [2018, 2]]
+    assert [failure[:2] for failure in result.attrs['failures']] == [(2017, None)]
+
+
+def test_errors_raise(fake_api):
+    with pytest.raises(AssertionError):
+        pyergast.get_race_results(2019, rounds=[1, 2], errors='raise')
+
+
+def test_season_race_result(monkeypatch):
+    calls = []
+
+    def get_all(url):
+        calls.append(url)
+        races = [{'season': '2014', 'round': '1', 'Results': [result('rosberg', '1'), result('hamilton', '2')]},
+                 {'season': '2014', 'round': '2', 'Results': [result('hamilton', '1')]}]
+        return {'MRData': {'RaceTable': {'Races': races}}}
+
+    monkeypatch.setattr(pagination, 'get_all', get_all)
+    frame = pyergast.get_race_result(2014)
+    assert calls == ['http://ergast.com/api/f1/2014/results.json']
+    assert frame[['season', 'round', 'driverID']].values.tolist() == [
+        [2014, 1, 'rosberg'], [2014, 1, 'hamilton'], [2014, 2, 'hamilton']]
+
+
+def test_qualifying_skips_early_seasons(fake_api):
+    result = pyergast.get_qualifying_results(range(1994, 1997), rounds=1)
+    assert result['season'].unique().tolist() == [1996]
+
+
+def test_lap_times_history(fake_api, monkeypatch):
+    calls = []
+
+    def get_lap_times(year, race, driver=None):
+        calls.append((year, race, driver))
+        return pd.DataFrame({'driverID': [driver], 'lap': [1]})
+
+    monkeypatch.setattr(pyergast, 'get_lap_times', get_lap_times)
+    laps = pyergast.lap_times_history(range(1995, 1997), rounds=[1, 2], driver='hill')
+    assert sorted(calls) == [(1996, 1, 'hill'), (1996, 2, 'hill')]
+    assert laps[['season', 'round']].values.tolist() == [[1996, 1], [1996, 2]]
+
+
+def test_pit_stops_history(fake_api, monkeypatch):
+    def get_pit_stops(year, race, driver=None):
+        return pd.DataFrame({'driverID': ['hamilton'], 'stop': [1], 'milliseconds': [21000 + race]})
+
+    monkeypatch.setattr(pyergast, 'get_pit_stops', get_pit_stops)
+    stops = pyergast.pit_stops_history(range(2010, 2012))
+    assert stops[['season', 'round', 'milliseconds']].values.tolist() == [[2011, 1, 21001], [2011, 2, 21002],
+                                                                         [2011, 3, 21003]]
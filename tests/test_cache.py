@@ -0,0 +1,65 @@
+from pyergast import cache, transport
+import datetime
+import pytest
+
+
+@pytest.fixture
+def store(tmp_path):
+    c = cache.ResponseCache(str(tmp_path / 'responses.sqlite'))
+    yield c
+    c.close()
+
+
+def test_normalize_url():
+    expected = 'http://ergast.com/api/f1/2014/4/results.json?limit=30&offset=0'
+    actual = cache.normalize_url('HTTP://Ergast.com/api/f1/2014/4/results.json/?offset=0&limit=30')
+    assert expected == actual
+
+
+def test_ttl_for():
+    this_year = datetime.date.today().year
+    assert cache.ttl_for('http://ergast.com/api/f1/2014/4/results.json') is None
+    assert cache.ttl_for('http://ergast.com/api/f1/current/last/results.json', live_ttl=60) == 60
+    assert cache.ttl_for('http://ergast.com/api/f1/{}.json'.format(this_year), live_ttl=60) == 60
+    assert cache.ttl_for('http://ergast.com/api/f1/drivers.json', default_ttl=10) == 10
+
+
+def test_round_trip(store):
+    url = 'http://ergast.com/api/f1/2014/4/results.json'
+    assert store.get(url) is None
+    store.put(url, b'{"MRData": {}}')
+    assert store.get(url) == b'{"MRData": {}}'
+    assert store.info()['entries'] == 1
+    assert (store.info()['hits'], store.info()['misses']) == (1, 1)
+
+
+def test_expiry(store):
+    store.live_ttl = -1
+    store.put('http://ergast.com/api/f1/current.json', b'{}')
+    assert store.get('http://ergast.com/api/f1/current.json') is None
+    assert store.info()['entries'] == 0
+
+
+def test_invalidate(store):
+    store.put('http://ergast.com/api/f1/current.json', b'{}')
+    store.put('http://ergast.com/api/f1/2010.json', b'{}')
+    assert store.invalidate('/current') == 1
+    assert [e['url'] for e in store.entries()] == ['http://ergast.com/api/f1/2010.json']
+
+
+def test_lru_eviction(store):
+    store.put('http://ergast.com/api/f1/2010.json', b'x' * 10)
+    store.put('http://ergast.com/api/f1/2011.json', b'x' * 10)
+    store.get('http://ergast.com/api/f1/2010.json')
+    store.resize(15)
+    assert [e['url'] for e in store.entries()] == ['http://ergast.com/api/f1/2010.json']
+
+
+def test_get_json_reads_cache(tmp_path, monkeypatch):
+    cache.enable(str(tmp_path / 'responses.sqlite'))
+    try:
+        cache.put('http://ergast.com/api/f1/2014/4/results.json', b'{"MRData": {"total": "20"}}')
+        monkeypatch.setattr(transport.get_session(), 'get', None)
+        assert transport.get_json('http://ergast.com/api/f1/2014/4/results.json') == {'MRData': {'total': '20'}}
+    finally:
+        cache.disable()
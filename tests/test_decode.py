@@ -0,0 +1,123 @@
+from pyergast import decode, replay, transport
+import glob
+import io
+import json
+import os
+import pytest
+
+PAYLOAD = {'MRData': {'limit': '2', 'offset': '0', 'total': '2',
+                      'RaceTable': {'Races': [{'season': '2014', 'round': '1', 'lat': 1.5},
+                                              {'season': '2014', 'round': '2', 'lat': -2.25}]}}}
+BODY = json.dumps(PAYLOAD).encode()
+
+
+@pytest.fixture(autouse=True)
+def defaults():
+    settings = decode.configure()
+    yield
+    decode._settings.update(settings)
+
+
+def test_loads_with_every_decoder():
+    for name in decode.DECODERS:
+        decode.configure(decoder=name)
+        assert decode.loads(BODY) == PAYLOAD
+
+
+def test_custom_decoder():
+    calls = []
+
+    def counting(body):
+        calls.append(len(body))
+        return json.loads(body)
+
+    assert decode.configure(decoder=counting)['decoder'] == 'counting'
+    assert decode.loads(BODY) == PAYLOAD
+    assert calls == [len(BODY)]
+    with pytest.raises(AssertionError):
+        decode.configure(decoder='simdjson')
+    del decode.DECODERS['counting']
+
+
+def test_should_stream(monkeypatch):
+    monkeypatch.setattr(decode, 'ijson', object())
+    decode.configure(stream_threshold=100)
+    assert decode.should_stream(101)
+    # Chunked and compressed responses have no known size, and are decoded whole
+    assert not decode.should_stream(100) and not decode.should_stream(None)
+    decode.configure(stream_threshold=None)
+    assert not decode.should_stream(None)
+
+
+def test_stream():
+    pytest.importorskip('ijson')
+    assert decode.stream(io.BytesIO(BODY)) == PAYLOAD
+    for path in glob.glob(os.path.join(replay.FIXTURES, '**', '*.json'), recursive=True):
+        with open(path, 'rb') as recorded:
+            body = recorded.read()
+        assert decode.stream(io.BytesIO(body)) == json.loads(body), path
+    empty = {'MRData': {'total': '0', 'RaceTable': {'season': '1900', 'Races': []}}}
+    assert decode.stream(io.BytesIO(json.dumps(empty).encode())) == empty
+    with pytest.raises(ValueError):
+        decode.stream(io.BytesIO(b'[]'))
+
+
+def test_stream_builds_rows_one_at_a_time(monkeypatch):
+    ijson = pytest.importorskip('ijson')
+    built = []
+
+    class Builder(ijson.ObjectBuilder):
+        def __init__(self):
+            super().__init__()
+            built.append(self)
+
+    monkeypatch.setattr(ijson, 'ObjectBuilder', Builder)
+    assert decode.stream(io.BytesIO(BODY)) == PAYLOAD
+    # One builder per row, none for the envelope
+    assert len(built) == len(PAYLOAD['MRData']['RaceTable']['Races'])
+
+
+class StreamedResponse:
+    status_code = 200
+
+    def __init__(self, headers=None):
+        self.headers = dict({'Content-Length': str(len(BODY))}, **(headers or {}))
+        self.raw = io.BytesIO(BODY)
+
+    @property
+    def content(self):
+        raise AssertionError('The body should not be buffered')
+
+    def close(self):
+        self.raw.close()
+
+
+def test_get_json_streams_large_responses(monkeypatch):
+    pytest.importorskip('ijson')
+    decode.configure(stream_threshold=0)
+    sent = []
+    monkeypatch.setattr(transport.get_session(), 'get',
+                        lambda url, timeout, stream, headers=None: sent.append(headers) or StreamedResponse())
+    assert transport.get_json('http://ergast.com/api/f1/2014/results.json') == PAYLOAD
+    # Asked uncompressed, so that the size of the body is known
+    assert sent[0]['Accept-Encoding'] == 'identity'
+
+    class Buffered(StreamedResponse):
+        content = BODY
+
+    # Without streaming, the API is free to compress
+    decode.configure(stream_threshold=None)
+    monkeypatch.setattr(transport.get_session(), 'get',
+                        lambda url, timeout, stream, headers=None: sent.append(headers) or Buffered())
+    assert transport.get_json('http://ergast.com/api/f1/2014/results.json') == PAYLOAD
+    assert 'Accept-Encoding' not in sent[1]
+
+
+def test_compressed_responses_are_not_streamed(monkeypatch):
+    pytest.importorskip('ijson')
+    decode.configure(stream_threshold=0)
+    response = StreamedResponse({'Content-Encoding': 'gzip'})
+    monkeypatch.setattr(type(response), 'content', BODY)
+    monkeypatch.setattr(transport.get_session(), 'get', lambda url, timeout, stream, headers=None: response)
+    assert transport.get_json('http://ergast.com/api/f1/2014/results.json') == PAYLOAD
+    assert response.raw.tell() == 0
@@ -0,0 +1,173 @@
+from pyergast import dump, pyergast, replay
+import datetime
+import json
+import os
+import zipfile
+import pandas as pd
+import pytest
+
+CSV = {
+    'drivers': ['driverId,driverRef,number,code,forename,surname,dob,nationality,url',
+                '1,hamilton,44,HAM,Lewis,Hamilton,1985-01-07,British,http://hamilton',
+                '3,rosberg,6,ROS,Nico,Rosberg,1985-06-27,German,http://rosberg',
+                '4,alonso,14,ALO,Fernando,Alonso,1981-07-29,Spanish,http://alonso',
+                '8,raikkonen,7,RAI,Kimi,Räikkönen,1979-10-17,Finnish,http://raikkonen',
+                '500,fangio,\\N,\\N,Juan,Fangio,1911-06-24,Argentine,http://fangio'],
+    'constructors': ['constructorId,constructorRef,name,nationality,url',
+                     '6,ferrari,Ferrari,Italian,http://ferrari',
+                     '131,mercedes,Mercedes,German,http://mercedes',
+                     '191,team_lotus,Team Lotus,British,http://team_lotus',
+                     '9,red_bull,Red Bull,Austrian,http://red_bull',
+                     '113,lotus-borgward,Lotus-Borgward,British,http://lotus-borgward',
+                     '112,lotus_f1,Lotus F1,British,http://lotus_f1',
+                     '111,lotus_racing,Lotus,Malaysian,http://lotus_racing'],
+    'circuits': ['circuitId,circuitRef,name,location,country,lat,lng,alt,url',
+                 '1,albert_park,Albert Park Grand Prix Circuit,Melbourne,Australia,-37.8497,144.968,10,http://ap',
+                 '3,bahrain,Bahrain International Circuit,Sakhir,Bahrain,26.0325,50.5106,\\N,http://bh',
+                 '2,sepang,Sepang International Circuit,Kuala Lumpur,Malaysia,2.76083,101.738,\\N,http://sp'],
+    'races': ['raceId,year,round,circuitId,name,date,time,url',
+              '901,2014,2,3,Bahrain Grand Prix,2014-04-06,15:00:00,http://2014-2',
+              '900,2014,1,1,Australian Grand Prix,2014-03-16,06:00:00,http://2014-1'],
+    'status': ['statusId,status', '1,Finished', '4,Collision'],
+    'results': ['resultId,raceId,driverId,constructorId,number,grid,position,positionText,positionOrder,points,laps,'
+                'time,milliseconds,fastestLap,rank,fastestLapTime,fastestLapSpeed,statusId',
+                '2,900,4,6,14,5,2,2,2,18,57,+26.777,5419333,19,6,1:32.616,206.1,1',
+                '1,900,3,131,6,3,1,1,1,25,57,1:32:58.710,5578710,19,1,1:32.478,206.4,1',
+                '3,900,1,131,44,1,\\N,R,3,0,2,\\N,\\N,\\N,\\N,\\N,\\N,4',
+                '4,901,1,131,44,2,1,1,1,25,57,1:39:42.743,5982743,\\N,\\N,\\N,\\N,1'],
+    'qualifying': ['qualifyId,raceId,driverId,constructorId,number,position,q1,q2,q3',
+                   '2,900,3,131,6,2,1:43.000,1:42.500,\\N',
+                   '1,900,1,131,44,1,1:44.231,1:42.890,\\N'],
+    'driver_standings': ['driverStandingsId,raceId,driverId,points,position,positionText,wins',
+                         '1,900,3,25,1,1,1', '2,900,4,18,2,2,0', '3,900,1,0,3,3,0',
+                         '4,901,3,25,2,2,1', '5,901,1,25,1,1,1', '6,901,4,18,3,3,0'],
+    'constructor_standings': ['constructorStandingsId,raceId,constructorId,points,position,positionText,wins',
+                              '1,900,131,25,1,1,1', '2,900,6,18,2,2,0',
+                              '3,901,131,50,1,1,2', '4,901,6,18,2,2,0'],
+    'lap_times': ['raceId,driverId,lap,position,time,milliseconds',
+                  '900,1,1,2,1:45.001,105001', '900,3,1,1,1:44.500,104500', '900,3,2,1,1:33.100,93100',
+                  '901,1,1,1,1:40.000,100000'],
+    'pit_stops': ['raceId,driverId,stop,lap,time,duration,milliseconds',
+                  '900,3,1,20,17:32:10,22.105,22105', '900,4,1,18,17:29:01,21.950,21950',
+                  '901,1,1,25,16:01:00,23.000,23000'],
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / 'f1db_csv.zip'
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, lines in CSV.items():
+            archive.writestr(name + '.csv', '\n'.join(lines) + '\n')
+    return dump.load(str(path))
+
+
+def test_reference(store):
+    drivers = store.get_drivers()
+    # Sorted by family name ignoring accents, and missing values left out, like the API does,
+    # so the columns of missing values come last
+    assert list(drivers['driverId']) == ['alonso', 'fangio', 'hamilton', 'raikkonen', 'rosberg']
+    assert list(drivers.columns) == ['driverId', 'permanentNumber', 'code', 'url', 'givenName', 'familyName',
+                                     'dateOfBirth', 'nationality']
+    assert pd.isna(drivers.loc[1, 'code'])
+    circuits = store.get_circuits()
+    assert list(circuits.columns) == ['circuitId', 'url', 'circuitName', 'Latitude', 'Longtitude', 'Locality',
+                                      'Country']
+    assert circuits.loc[0, 'Latitude'] == -37.8497
+    assert list(store.get_drivers(2014, 2)['driverId']) == ['hamilton']
+
+
+def test_reference_order(store):
+    # Ordered like the API: constructors by name, 'Lotus F1' before 'Lotus-Borgward', and circuits by ID
+    constructors = store.get_constructors()['constructorId'].tolist()
+    assert constructors == ['ferrari', 'lotus_racing', 'lotus_f1', 'lotus-borgward', 'mercedes', 'red_bull',
+                            'team_lotus']
+    # The same relative order as the recorded responses of the API
+    for name, key, rows, column in (('constructors', 'ConstructorTable', 'Constructors', 'constructorId'),
+                                    ('circuits', 'CircuitTable', 'Circuits', 'circuitId'),
+                                    ('drivers', 'DriverTable', 'Drivers', 'driverId')):
+        with open(os.path.join(replay.FIXTURES, name + '.json'), encoding='utf-8') as file:
+            recorded = [row[column] for row in json.load(file)['MRData'][key][rows]]
+        ours = getattr(store, 'get_' + name)()[column].tolist()
+        assert [value for value in ours if value in recorded] == [value for value in recorded if value in ours]
+
+
+def test_race_result(store):
+    result = store.get_race_result(2014, 1)
+    assert list(result.columns) == ['number', 'position', 'positionText', 'grid', 'points', 'driverID', 'driver',
+                                    'nationality', 'constructorID', 'constructor', 'laps', 'status', 'Time']
+    assert list(result['driverID']) == ['rosberg', 'alonso', 'hamilton']
+    assert list(result['position']) == [1, 2, 3]
+    assert result.loc[0, 'Time'] == pd.Timedelta(milliseconds=5578710)
+    assert pd.isna(result.loc[2, 'Time'])
+    assert result.loc[2, 'status'] == 'Collision'
+    assert result.loc[0, 'driver'] == 'Nico Rosberg'
+    season = store.get_race_result(2014)
+    assert list(season['round']) == [1, 1, 1, 2]
+    assert list(store.get_race_result()['driverID']) == ['hamilton']
+
+
+def test_qualifying_and_schedule(store):
+    qualifying = store.get_qualifying_result(2014, 1)
+    assert list(qualifying['driverID']) == ['hamilton', 'rosberg']
+    assert 'Q2' in qualifying and 'Q3' not in qualifying
+    schedule = store.get_schedule(2014)
+    assert list(schedule.columns) == ['season', 'round', 'url', 'raceName', 'date', 'time', 'circuitID',
+                                      'circuitName', 'locality', 'country']
+    assert list(schedule['round']) == [1, 2]
+    assert schedule.loc[0, 'date'] == pd.Timestamp('2014-03-16')
+    assert schedule.loc[0, 'time'] == '06:00:00Z'
+
+
+def test_lap_times(store):
+    laps = store.get_lap_times(2014, 1)
+    assert list(laps.columns) == ['driverID', 'lap', 'position', 'milliseconds']
+    assert list(laps['driverID']) == ['rosberg', 'hamilton', 'rosberg']
+    assert list(laps['milliseconds']) == [104500, 105001, 93100]
+    assert list(store.get_lap_times(2014, 1, 'hamilton')['lap']) == [1]
+
+
+def test_pit_stops(store):
+    stops = store.get_pit_stops(2014, 1)
+    assert list(stops.columns) == ['driverID', 'stop', 'lap', 'time', 'milliseconds']
+    assert list(stops['driverID']) == ['alonso', 'rosberg']
+    assert stops.loc[0, 'time'] == pd.Timedelta(hours=17, minutes=29, seconds=1)
+    assert list(stops.merge(store.get_race_result(2014, 1), on='driverID')['position']) == [2, 1]
+
+
+def test_standings(store):
+    standings = store.driver_standings(2014, 2)
+    assert list(standings.columns) == ['position', 'positionText', 'points', 'wins', 'driverID', 'driver',
+                                       'nationality', 'constructorID', 'constructor']
+    assert list(standings['driverID']) == ['hamilton', 'rosberg', 'alonso']
+    # Alonso has no result in round 2, he keeps the constructor of round 1
+    assert list(standings['constructorID']) == ['mercedes', 'mercedes', 'ferrari']
+    assert list(store.constructor_standings(2014)['points']) == [50, 18]
+    history = store.query_driver('rosberg')
+    assert list(history['season']) == [2014] and list(history['position']) == [2]
+
+
+def test_use(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(pyergast, '_source', None)
+    path = tmp_path / 'f1db_csv.zip'
+    loaded = dump.use(str(path))
+    assert pyergast._source is loaded
+    assert list(pyergast.get_race_result(2014, 2)['driverID']) == ['hamilton']
+    records = pyergast.get_race_result(2014, 1, output='records')
+    assert [record['driverID'] for record in records] == ['rosberg', 'alonso', 'hamilton']
+    assert records[2]['Time'] is None
+    # The same plain types as records built from the API, not pandas scalars
+    assert type(records[0]['Time']) is datetime.timedelta and type(records[0]['position']) is int
+    schedule = pyergast.get_schedule(2014, output='records')
+    assert type(schedule[0]['date']) is datetime.date
+    pytest.importorskip('pyarrow')
+    table = pyergast.get_race_result(2014, 1, output='arrow')
+    assert table['driverID'].to_pylist() == ['rosberg', 'alonso', 'hamilton']
+
+
+def test_export(store, tmp_path):
+    pytest.importorskip('pyarrow')
+    exported = store.export(str(tmp_path / 'warehouse'))
+    assert exported.marks()['results'] == (2014, 2)
+    pd.testing.assert_frame_equal(exported.get_race_result(2014, 1), store.get_race_result(2014, 1))
+    pd.testing.assert_frame_equal(exported.driver_standings(2014, 2), store.driver_standings(2014, 2))
@@ -0,0 +1,92 @@
+from pyergast import flatten, pyergast
+import pandas as pd
+
+RESULTS = [{'number': '6', 'position': '1', 'Driver': {'driverId': 'rosberg', 'givenName': 'Nico',
+                                                      'familyName': 'Rosberg', 'nationality': 'German'},
+            'Constructors': [{'name': 'Mercedes'}], 'Time': {'millis': '5578710'}},
+           {'number': '14', 'position': '2', 'Driver': {'driverId': 'alonso', 'givenName': 'Fernando',
+                                                       'familyName': 'Alonso', 'nationality': 'Spanish'},
+            'Constructors': []}]
+
+
+def test_parse_path():
+    assert flatten.parse_path('Constructors[0].name') == ('Constructors', 0, 'name')
+    assert flatten.parse_path('a[1][2]') == ('a', 1, 2)
+    assert flatten.parse_path('status') == ('status',)
+
+
+def test_columns():
+    spec = {'driverID': 'Driver.driverId', 'driver': ('Driver.givenName', 'Driver.familyName'),
+            'constructor': 'Constructors[0].name', 'millis': 'Time.millis', 'grid': 'grid'}
+    columns = flatten.columns(RESULTS, spec)
+    assert list(columns) == list(spec)
+    assert columns['driverID'] == ['rosberg', 'alonso']
+    assert columns['driver'] == ['Nico Rosberg', 'Fernando Alonso']
+    # Missing keys, indices and parents all give missing values
+    assert columns['constructor'][0] == 'Mercedes' and columns['constructor'][1] is flatten.MISSING
+    assert columns['millis'][1] is flatten.MISSING
+    assert all(value is flatten.MISSING for value in columns['grid'])
+
+
+def test_prefix():
+    spec = flatten.prefix({'driver': ('Driver.givenName', 'Driver.familyName'), 'wins': 'wins'}, 'Standings[0]')
+    assert spec == {'driver': ('Standings[0].Driver.givenName', 'Standings[0].Driver.familyName'),
+                    'wins': 'Standings[0].wins'}
+
+
+def test_frame_optional():
+    frame = flatten.frame(RESULTS, {'number': 'number', 'Q2': 'Q2', 'Q1': 'Q1'}, optional=('Q2',))
+    assert list(frame.columns) == ['number', 'Q1']
+    assert list(flatten.frame([], {'number': 'number'}).columns) == ['number']
+
+
+def test_nested():
+    races = [{'season': '2014', 'round': '1', 'Results': RESULTS}, {'season': '2014', 'round': '2', 'Results': []},
+             {'season': '2014', 'round': '3', 'Results': RESULTS[:1]}]
+    frame = flatten.nested(races, 'Results', {'number': 'number'}, {'season': 'season', 'round': 'round'},
+                           {'round': int})
+    assert list(frame.columns) == ['season', 'round', 'number']
+    assert list(frame['round']) == [1, 1, 3]
+    assert list(frame['season']) == ['2014'] * 3
+    assert list(frame['number']) == ['6', '14', '6']
+
+
+def test_race_result_frame():
+    payload = {'MRData': {'RaceTable': {'Races': [{'season': '2014', 'round': '1', 'Results': [
+        dict(RESULTS[0], Constructor={'constructorId': 'mercedes', 'name': 'Mercedes'}, grid='3', laps='57',
+             status='Finished', positionText='1', points='25')]}]}}}
+    frame = pyergast._race_result_frame(payload, season=True)
+    assert list(frame.columns) == ['season', 'round', 'number', 'position', 'positionText', 'grid', 'points',
+                                   'driverID', 'driver', 'nationality', 'constructorID', 'constructor', 'laps',
+                                   'status', 'Time']
+    assert frame.loc[0, 'season'] == 2014 and frame.loc[0, 'driver'] == 'Nico Rosberg'
+    assert frame.loc[0, 'Time'] == pd.Timedelta(milliseconds=5578710)
+
+
+def test_pit_stops_frame():
+    payload = {'MRData': {'RaceTable': {'Races': [{'season': '2019', 'round': '1', 'PitStops': [
+        {'driverId': 'hulkenberg', 'lap': '9', 'stop': '1', 'time': '16:28:48', 'duration': '20.914'},
+        {'driverId': 'kubica', 'lap': '30', 'stop': '2', 'time': '16:58:01', 'duration': '16:52.188'}]}]}}}
+    frame = pyergast._pit_stops_frame(payload)
+    assert list(frame.columns) == ['driverID', 'stop', 'lap', 'time', 'milliseconds']
+    assert frame['milliseconds'].tolist() == [20914, 1012188]
+    assert frame.loc[0, 'time'] == pd.Timedelta(hours=16, minutes=28, seconds=48)
+    assert str(frame['lap'].dtype) == 'int16' and frame['driverID'].dtype == 'category'
+
+
+def test_query_frames():
+    standing = {'position': '2', 'positionText': '2', 'points': '317', 'wins': '5', 'Driver': RESULTS[0]['Driver'],
+                'Constructors': [{'constructorId': 'mercedes', 'name': 'Mercedes'}]}
+    payload = {'MRData': {'StandingsTable': {'StandingsLists': [
+        {'season': '2014', 'round': '19', 'DriverStandings': [standing]}]}}}
+    frame = pyergast._query_driver_frame(payload)
+    assert list(frame.columns) == ['season', 'round', 'position', 'positionText', 'points', 'wins', 'driver',
+                                   'nationality', 'constructorID', 'constructor']
+    standing = {'position': '1', 'positionText': '1', 'points': '701', 'wins': '16',
+                'Constructor': {'constructorId': 'mercedes', 'name': 'Mercedes', 'nationality': 'German'}}
+    payload = {'MRData': {'StandingsTable': {'StandingsLists': [
+        {'season': '2014', 'round': '19', 'ConstructorStandings': [standing]}]}}}
+    frame = pyergast._query_constructor_frame(payload)
+    assert list(frame.columns) == ['season', 'round', 'position', 'positionText', 'points', 'wins',
+                                   'constructorID', 'constructor', 'nationality']
+    assert frame['constructor'].tolist() == ['Mercedes'] and frame['season'].tolist() == [2014]
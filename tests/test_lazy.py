@@ -0,0 +1,57 @@
+from pyergast import lazy
+import subprocess
+import sys
+import textwrap
+
+
+def run(code):
+    # In a fresh interpreter, as the test session has imported pandas already
+    result = subprocess.run([sys.executable, '-c', textwrap.dedent(code)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_module():
+    assert lazy.module('json') is sys.modules['json']
+    stand_in = lazy.module('pyergast_missing_module')
+    assert isinstance(stand_in, lazy.LazyModule)
+    try:
+        stand_in.anything
+    except ImportError:
+        pass
+    else:
+        raise AssertionError('importing a missing module should fail on first use')
+
+
+def test_import_is_light():
+    loaded = run("""
+        import sys
+        from pyergast import aio, pyergast
+        print(*(name for name in ('pandas', 'numpy', 'requests') if name in sys.modules))
+    """)
+    assert loaded == []
+
+
+def test_records_without_pandas():
+    loaded = run("""
+        import datetime
+        import sys
+        from pyergast import pyergast, replay
+        with replay.serve():
+            assert pyergast.get_race_result(2014, 1, output='records')[0]['driverID'] == 'rosberg'
+            assert len(pyergast.get_lap_times(2014, 1, output='records')) == 60
+            assert pyergast.get_schedule(2014, output='records')[1]['round'] == 2
+            assert len(pyergast.get_race_results(2014, output='records')) == 12
+            driver = pyergast.find_driverid('Lewis', 'Hamilton', output='records')[0]
+            assert driver['driverId'] == 'hamilton' and type(driver['dateOfBirth']) is datetime.date
+            assert pyergast.find_circuitid('melbourne', output='records')[0]['circuitId'] == 'albert_park'
+            assert pyergast.resolve_many(['Hamiltn'], output='records')[0]['id'] == 'hamilton'
+        print('requests' in sys.modules, 'pandas' in sys.modules, 'numpy' in sys.modules)
+    """)
+    assert loaded == ['True', 'False', 'False']
+
+
+def test_available():
+    assert lazy.available('json')
+    assert not lazy.available('pyergast_missing_module')
+
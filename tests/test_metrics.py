@@ -0,0 +1,139 @@
+from pyergast import aio, cache, metrics, pyergast, reference, replay, transport
+import asyncio
+import pytest
+
+
+@pytest.fixture
+def events():
+    metrics.reset()
+    recorded = []
+    metrics.add_hook(recorded.append)
+    yield recorded
+    metrics.remove_hook(recorded.append)
+    metrics.reset()
+
+
+@pytest.fixture
+def server():
+    reference.clear()
+    with replay.serve() as server:
+        yield server
+    reference.clear()
+
+
+def test_request_and_normalize_events(events, server):
+    frame = pyergast.get_race_result(2014, 1)
+    request, normalize, call = events
+    assert request['kind'] == 'request'
+    assert request['url'].startswith(server.url + '/2014/1/results.json')
+    assert (request['status'], request['cache'], request['coalesced'], request['retries']) == (200, 'off', False, 0)
+    assert request['bytes'] > 0 and request['latency'] > 0 and request['decode'] > 0
+    assert request['path'] == ('get_race_result',)
+    assert (normalize['kind'], normalize['function'], normalize['rows']) == ('normalize', 'race_result', len(frame))
+    assert 0 < normalize['flatten'] < normalize['seconds']
+    assert (call['kind'], call['function'], call['path']) == ('call', 'get_race_result', ('get_race_result',))
+    assert call['seconds'] > request['latency'] + normalize['seconds']
+
+
+def test_cache_hits(events, server, tmp_path):
+    cache.enable(str(tmp_path / 'responses.sqlite'))
+    try:
+        pyergast.get_schedule(2014)
+        pyergast.get_schedule(2014)
+    finally:
+        cache.disable()
+    assert [event['cache'] for event in events if event['kind'] == 'request'] == ['miss', 'hit']
+    counters = metrics.snapshot()['counters']
+    assert counters['pyergast_requests_total{cache="hit",status="200"}'] == 1
+    # Only the request sent to the server is timed
+    assert metrics.snapshot()['histograms']['pyergast_request_seconds']['count'] == 1
+
+
+def test_failures_are_recorded(events):
+    defaults = transport.configure(max_retries=0)
+    try:
+        with replay.serve(errors={'2014/2/results.json': 500}):
+            with pytest.raises(AssertionError):
+                pyergast.get_race_result(2014, 2)
+    finally:
+        transport.configure(**defaults)
+    assert [(event['status'], event['bytes']) for event in events if event['kind'] == 'request'] == [(500, 0)]
+
+
+def test_snapshot_buckets_are_cumulative(events):
+    for seconds in (0.002, 0.02, 3):
+        metrics.normalize('schedule', seconds, 10)
+    histogram = metrics.snapshot()['histograms']['pyergast_normalize_seconds{function="schedule"}']
+    assert (histogram['count'], histogram['sum']) == (3, pytest.approx(3.022))
+    assert (histogram['buckets'][0.005], histogram['buckets'][0.025], histogram['buckets'][5]) == (1, 2, 3)
+    assert metrics.snapshot()['counters']['pyergast_rows_total{function="schedule"}'] == 30
+
+
+def test_prometheus(events):
+    metrics.request('http://ergast.com/api/f1/2014.json', 200, 512, latency=0.2, decode=0.003)
+    text = metrics.prometheus()
+    assert '# TYPE pyergast_requests_total counter\npyergast_requests_total{cache="off",status="200"} 1\n' in text
+    assert 'pyergast_response_bytes_total 512\n' in text
+    assert '# TYPE pyergast_request_seconds histogram\n' in text
+    assert 'pyergast_request_seconds_bucket{le="0.1"} 0\n' in text
+    assert 'pyergast_request_seconds_bucket{le="0.25"} 1\n' in text
+    assert 'pyergast_request_seconds_bucket{le="+Inf"} 1\n' in text
+    assert 'pyergast_request_seconds_count 1\n' in text
+
+
+def test_reset_keeps_hooks(events):
+    metrics.normalize('drivers', 0.01, 5)
+    metrics.reset()
+    assert metrics.snapshot() == {'counters': {}, 'histograms': {}}
+    metrics.normalize('drivers', 0.01, 5)
+    assert len(events) == 2
+
+
+def test_failing_hook_warns(events):
+    def broken(event):
+        raise ValueError('broken')
+
+    metrics.add_hook(broken)
+    try:
+        with pytest.warns(UserWarning, match='broken'):
+            metrics.normalize('drivers', 0.01, 5)
+    finally:
+        metrics.remove_hook(broken)
+    assert len(events) == 1
+
+
+def test_timed():
+    @metrics.timed
+    def _race_result_frame(payload):
+        return payload
+
+    seen = []
+    metrics.add_hook(seen.append)
+    try:
+        assert _race_result_frame([1, 2, 3]) == [1, 2, 3]
+    finally:
+        metrics.remove_hook(seen.append)
+        metrics.reset()
+    assert (seen[0]['function'], seen[0]['rows']) == ('race_result', 3)
+
+
+def test_path_follows_worker_threads(events, server):
+    pyergast.get_race_results(2014, rounds=[1, 2], max_workers=2)
+    paths = {event['path'] for event in events if event['kind'] == 'request'}
+    assert paths == {('get_race_results', 'get_race_result')}
+
+
+def test_aio_coalesced(events, server):
+    pytest.importorskip('aiohttp')
+    url = transport.api_url('2014.json')
+
+    async def fetch():
+        try:
+            return await asyncio.gather(*(aio.get_json(url) for _ in range(3)))
+        finally:
+            await aio.close()
+
+    asyncio.run(fetch())
+    assert len(server.requests) == 1
+    assert sorted(event['coalesced'] for event in events if event['kind'] == 'request') == [False, True, True]
+    assert metrics.snapshot()['counters']['pyergast_coalesced_total'] == 2
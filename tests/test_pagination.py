@@ -0,0 +1,100 @@
+from pyergast import pagination, pyergast, transport
+from urllib.parse import parse_qs, urlsplit
+import pytest
+
+# 2 races of 3 results each, flattened the way Ergast pages them
+RESULTS = [('1', str(position)) for position in range(1, 4)] + [('2', str(position)) for position in range(1, 4)]
+
+
+def fake_results_page(url):
+    query = parse_qs(urlsplit(url).query)
+    limit, offset = int(query['limit'][0]), int(query['offset'][0])
+    races = []
+    for race, position in RESULTS[offset:offset + limit]:
+        if not races or races[-1]['round'] != race:
+            races.append({'season': '2014', 'round': race, 'Results': []})
+        races[-1]['Results'].append({'number': position, 'position': position})
+    return {'MRData': {'limit': str(limit), 'offset': str(offset), 'total': str(len(RESULTS)),
+                       'RaceTable': {'season': '2014', 'Races': races}}}
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    calls = []
+
+    def get_json(url):
+        calls.append(url)
+        return fake_results_page(url)
+
+    monkeypatch.setattr(transport, 'get_json', get_json)
+    return calls
+
+
+def test_page_url():
+    expected = 'http://ergast.com/api/f1/2014/results.json?limit=30&offset=60'
+    actual = pagination.page_url('http://ergast.com/api/f1/2014/results.json?limit=1000', 60, 30)
+    assert expected == actual
+
+
+def test_get_all_stitches_pages(fake_api):
+    payload = pagination.get_all('http://ergast.com/api/f1/2014/results.json', limit=2, max_workers=2)
+    races = payload['MRData']['RaceTable']['Races']
+    assert len(fake_api) == 3
+    assert [race['round'] for race in races] == ['1', '2']
+    assert [[r['position'] for r in race['Results']] for race in races] == [['1', '2', '3'], ['1', '2', '3']]
+
+
+def test_get_all_single_page(fake_api):
+    pagination.get_all('http://ergast.com/api/f1/2014/results.json', limit=10)
+    assert len(fake_api) == 1
+
+
+def test_iter_pages(fake_api):
+    pages = pagination.iter_pages('http://ergast.com/api/f1/2014/results.json', limit=4)
+    offsets = [page['MRData']['offset'] for page in pages]
+    assert offsets == ['0', '4']
+
+
+def test_iter_pages_prefetch(fake_api):
+    pages = pagination.iter_pages('http://ergast.com/api/f1/2014/results.json', limit=2, max_workers=2)
+    assert [page['MRData']['offset'] for page in pages] == ['0', '2', '4']
+
+
+# 2 laps of 2 drivers, with the timings of lap 2 split across the pages
+TIMINGS = [('1', 'hamilton', '1', '1:35.123'), ('1', 'rosberg', '2', '1:35.870'),
+           ('2', 'hamilton', '1', '1:32.478'), ('2', 'rosberg', '2', '1:32.900')]
+
+
+def fake_laps_page(url):
+    query = parse_qs(urlsplit(url).query)
+    limit, offset = int(query['limit'][0]), int(query['offset'][0])
+    laps = []
+    for lap, driver, position, time in TIMINGS[offset:offset + limit]:
+        if not laps or laps[-1]['number'] != lap:
+            laps.append({'number': lap, 'Timings': []})
+        laps[-1]['Timings'].append({'driverId': driver, 'position': position, 'time': time})
+    return {'MRData': {'limit': str(limit), 'offset': str(offset), 'total': str(len(TIMINGS)),
+                       'RaceTable': {'Races': [{'season': '2014', 'round': '1', 'Laps': laps}]}}}
+
+
+def test_lap_times_span_pages(monkeypatch):
+    monkeypatch.setattr(transport, 'get_json', fake_laps_page)
+    monkeypatch.setattr(pagination, '_settings', dict(pagination._settings, limit=3))
+    laps = pyergast.get_lap_times(2014, 1)
+    assert list(laps.columns) == ['driverID', 'lap', 'position', 'milliseconds']
+    assert laps['lap'].tolist() == [1, 1, 2, 2]
+    assert laps['milliseconds'].tolist() == [95123, 95870, 92478, 92900]
+    assert str(laps['milliseconds'].dtype) == 'Int32' and str(laps['lap'].dtype) == 'int16'
+    assert laps['driverID'].dtype == 'category'
+
+
+def test_urls_are_not_truncated(monkeypatch):
+    calls = []
+
+    def get_all(url):
+        calls.append(url)
+        return {'MRData': {'DriverTable': {'Drivers': []}}}
+
+    monkeypatch.setattr(pagination, 'get_all', get_all)
+    pyergast.get_drivers(2016)
+    assert calls == ['http://ergast.com/api/f1/2016/drivers.json']
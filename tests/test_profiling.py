@@ -0,0 +1,77 @@
+from pyergast import metrics, profiling, pyergast, reference, replay
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+
+@pytest.fixture
+def server():
+    reference.clear()
+    with replay.serve() as server:
+        yield server
+    reference.clear()
+
+
+def event(kind, path, **values):
+    return dict(values, kind=kind, path=path)
+
+
+def test_report_splits_stages():
+    profile = profiling.Profile()
+    profile.record(event('request', ('get_race_result',), latency=0.5, wait=0.25, decode=0.125))
+    profile.record(event('normalize', ('get_race_result',), seconds=0.5, flatten=0.125))
+    profile.record(event('call', ('get_race_result',), seconds=2.0))
+    report = profile.report()
+    assert report.loc['get_race_result'].to_dict() == {
+        'calls': 1, 'total': 2.0, 'network': 0.5, 'ratelimit': 0.25, 'decode': 0.125,
+        'flatten': 0.125, 'frame': 0.375, 'other': 0.625}
+
+
+def test_nested_calls():
+    profile = profiling.Profile()
+    for _ in range(2):
+        profile.record(event('request', ('get_race_results', 'get_race_result'), latency=1.0, wait=0, decode=0))
+        profile.record(event('call', ('get_race_results', 'get_race_result'), seconds=1.0))
+    profile.record(event('call', ('get_race_results',), seconds=1.5))
+    profile.record(event('request', (), latency=0.25, wait=0, decode=0))
+    report = profile.report()
+    assert report.index.tolist() == ['get_race_result', 'get_race_results', profiling.UNTRACED]
+    assert report['calls'].tolist() == [2, 1, 0]
+    # Concurrent children take longer than their parent, which has no time of its own left
+    assert report.loc['get_race_results', 'other'] == 0
+    assert profile.flamegraph() == ('<untraced>;network 250000\n'
+                                    'get_race_results;get_race_result;network 2000000\n')
+
+
+def test_profile(server, tmp_path):
+    hooks = list(metrics._hooks)
+    with pyergast.profile() as profile:
+        pyergast.get_race_results(2014, rounds=[1, 2], max_workers=2)
+        pyergast.get_schedule(2014)
+    pyergast.get_schedule(2014)
+    report = profile.report()
+    assert report['calls'].to_dict() == {'get_race_results': 1, 'get_race_result': 2, 'get_schedule': 1}
+    assert report['total'].is_monotonic_decreasing
+    assert (report.loc['get_race_result', ['network', 'decode', 'flatten', 'frame']] > 0).all()
+    assert (report.loc['get_schedule', ['network', 'decode', 'frame']] > 0).all()
+    assert report.loc['get_race_results', 'total'] >= report.loc['get_race_results', 'other']
+    profile.flamegraph(str(tmp_path / 'profile.folded'))
+    lines = (tmp_path / 'profile.folded').read_text().splitlines()
+    assert 'get_race_results;get_race_result;network' in [line.rsplit(' ', 1)[0] for line in lines]
+    assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+    assert 'get_schedule' in str(profile)
+    assert metrics._hooks == hooks
+
+
+def test_other_threads_are_left_out(server):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pyergast.profile() as profile:
+            executor.submit(pyergast.get_schedule, 2014).result()
+            executor.submit(metrics.in_context(pyergast.get_race_result), 2014, 1).result()
+    assert profile.report()['calls'].to_dict() == {'get_race_result': 1}
+
+
+def test_empty_profile():
+    with profiling.profile() as profile:
+        pass
+    assert profile.report().empty
+    assert profile.flamegraph() == ''
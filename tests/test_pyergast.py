@@ -36,12 +36,12 @@ def test_find_circuitid():
     assert expected == actual, 'Should have 4 rows and 7 columns'
 
 def test_get_race_result():
-    expected = '44'
+    expected = 44
     actual = pyergast.get_race_result(2014, 4)['number'][0]
     assert expected == actual, 'Number 44 should have won'
 
 def test_get_qualifying_result():
-    expected = '44'
+    expected = 44
     actual = pyergast.get_qualifying_result(2014, 4)['number'][0]
     assert expected == actual, 'Number 44 should have qualified first'
 
@@ -0,0 +1,81 @@
+from pyergast import ratelimit, transport
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def defaults():
+    settings = ratelimit.configure()
+    yield
+    ratelimit.configure(**settings)
+
+
+def test_burst_then_sustained_rate(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ratelimit.time, 'monotonic', lambda: now[0])
+    limiter = ratelimit.Limiter({'second': (4, 4)})
+    assert [limiter.reserve() for _ in range(4)] == [0, 0, 0, 0]
+    # Later requests are spaced at the sustained rate
+    assert [limiter.reserve() for _ in range(3)] == [0.25, 0.5, 0.75]
+    now[0] += 10
+    assert limiter.reserve() == 0
+
+
+def test_refund(monkeypatch):
+    monkeypatch.setattr(ratelimit.time, 'monotonic', lambda: 0.0)
+    limiter = ratelimit.Limiter({'second': (4, 4)})
+    assert [limiter.reserve() for _ in range(5)] == [0, 0, 0, 0, 0.25]
+    limiter.refund()
+    assert limiter.reserve() == 0.25
+    # Never beyond the capacity of a bucket
+    for _ in range(10):
+        limiter.refund()
+    assert [limiter.reserve() for _ in range(5)] == [0, 0, 0, 0, 0.25]
+
+
+def test_slowest_bucket_wins(monkeypatch):
+    monkeypatch.setattr(ratelimit.time, 'monotonic', lambda: 0.0)
+    limiter = ratelimit.Limiter({'second': (4, 4), 'hour': (2 / 3600, 2)})
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 1800]
+
+
+def test_shared_file(tmp_path, monkeypatch):
+    pytest.importorskip('fcntl')
+    monkeypatch.setattr(ratelimit.time, 'time', lambda: 50.0)
+    path = str(tmp_path / 'limits')
+    # Two limiters on the same file, as in two processes, share one budget
+    first, second = (ratelimit.Limiter({'second': (1, 2)}, path) for _ in range(2))
+    assert [first.reserve(), second.reserve(), first.reserve()] == [0, 0, 1]
+
+
+def test_configure():
+    settings = ratelimit.configure(per_second=10, burst=20, per_hour=0, path=None)
+    assert settings == {'per_second': 10, 'burst': 20, 'per_hour': 0, 'path': None}
+    assert ratelimit.get_limiter().buckets == {'second': (10, 20)}
+    assert ratelimit.get_limiter() is ratelimit.get_limiter()
+
+
+def test_default_path(tmp_path, monkeypatch):
+    pytest.importorskip('fcntl')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    path = ratelimit.default_path()
+    assert path == str(tmp_path / 'pyergast' / 'limits')
+    # Sharing the budget through the file is opt-in
+    assert ratelimit.configure()['path'] is None
+    # The directory is created with the file, on the first request
+    assert ratelimit.Limiter({'second': (1, 2)}, path).reserve() == 0
+    assert (tmp_path / 'pyergast' / 'limits').exists()
+
+
+def test_requests_are_limited(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ratelimit, 'acquire', lambda: calls.append('acquire'))
+
+    class Response:
+        status_code = 200
+        headers = {}
+        content = b'{"MRData": {}}'
+
+    monkeypatch.setattr(transport.get_session(), 'get',
+                        lambda url, timeout, stream, headers=None: calls.append('get') or Response())
+    transport.get_json('http://ergast.com/api/f1/drivers.json')
+    assert calls == ['acquire', 'get']
@@ -0,0 +1,55 @@
+from pyergast import pyergast, reference
+import threading
+import time
+import pandas as pd
+import pytest
+
+
+def counting_loader(calls):
+    def loader():
+        calls.append(1)
+        time.sleep(0.01)
+        return pd.DataFrame({'driverId': ['raikkonen', 'hamilton', 'alonso']})
+    return loader
+
+
+@pytest.fixture
+def drivers_table():
+    original = reference._tables['drivers']
+    calls = []
+    reference.register('drivers', counting_loader(calls))
+    yield calls
+    reference._tables['drivers'] = original
+
+
+def test_loaded_once():
+    calls = []
+    table = reference.ReferenceTable(counting_loader(calls))
+    threads = [threading.Thread(target=table.get) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    table.get()
+    assert len(calls) == 1
+
+
+def test_ttl_and_refresh():
+    calls = []
+    table = reference.ReferenceTable(counting_loader(calls), ttl=0)
+    table.get()
+    table.get()
+    assert len(calls) == 2
+    table.ttl = None
+    table.refresh()
+    table.get()
+    assert len(calls) == 3
+
+
+def test_find_driverid_reuses_table(drivers_table):
+    pyergast.find_driverid('Kimi', 'Raikkonen')
+    actual = pyergast.find_driverid('Lewis', 'Hamilton')['driverId'].tolist()
+    assert actual == ['hamilton']
+    assert len(drivers_table) == 1
+    reference.refresh('drivers')
+    assert len(drivers_table) == 2
@@ -0,0 +1,92 @@
+from pyergast import aio, pagination, pyergast, reference, replay, transport
+import asyncio
+import json
+import os
+import time
+import pytest
+
+
+@pytest.fixture
+def server():
+    reference.clear()
+    with replay.serve() as server:
+        yield server
+    reference.clear()
+
+
+def test_page_and_merge_round_trip():
+    with open(os.path.join(replay.FIXTURES, '2014', '1', 'laps.json'), encoding='utf-8') as recorded:
+        payload = json.load(recorded)
+    pages = [replay.page(payload, 25, offset) for offset in (0, 25, 50)]
+    assert [page['MRData']['total'] for page in pages] == ['60'] * 3
+    # The 5th lap is split between the first two pages
+    assert pages[1]['MRData']['RaceTable']['Races'][0]['Laps'][0]['number'] == '5'
+    assert pagination.merge(pages)['MRData']['RaceTable'] == payload['MRData']['RaceTable']
+
+
+def test_base_url(server):
+    assert transport.api_url('2014.json') == server.url + '/2014.json'
+    assert pyergast._race_result_url(2014, 1) == server.url + '/2014/1/results.json'
+
+
+def test_every_function(server):
+    pagination.configure(limit=25)
+    try:
+        assert pyergast.get_lap_times(2014, 1).shape == (60, 4)
+    finally:
+        pagination.configure(limit=1000)
+    assert pyergast.get_race_result(2014, 1)['driverID'][0] == 'rosberg'
+    assert pyergast.get_race_result()['driverID'][0] == 'hamilton'
+    assert pyergast.get_race_results(2014)['round'].tolist() == [1] * 6 + [2] * 6
+    assert 'Q3' in pyergast.get_qualifying_result(2014, 1)
+    assert pyergast.get_pit_stops(2014, 2).shape == (9, 5)
+    assert pyergast.get_schedule(2014)['circuitID'].tolist() == ['albert_park', 'sepang']
+    assert pyergast.driver_standings(2014)['driverID'][0] == 'rosberg'
+    assert pyergast.constructor_standings(2014, 1)['constructorID'][0] == 'ferrari'
+    assert pyergast.query_driver('hamilton')['points'].tolist() == [25]
+    assert pyergast.query_constructor('mercedes')['wins'].tolist() == [2]
+    assert pyergast.find_driverid('Kimi', 'Raikkonen')['driverId'].tolist() == ['raikkonen']
+    assert pyergast.get_circuits(2014, 1)['circuitId'].tolist() == ['albert_park']
+
+
+def test_injected_errors():
+    defaults = transport.configure(max_retries=0)
+    try:
+        with replay.serve(errors={'2014/2/results.json': 500}):
+            assert pyergast.get_race_result(2014, 1).shape == (6, 13)
+            with pytest.raises(AssertionError):
+                pyergast.get_race_result(2014, 2)
+            with pytest.raises(AssertionError):
+                pyergast.get_race_result(1900, 1)
+    finally:
+        transport.configure(**defaults)
+
+
+def test_random_errors_are_reproducible():
+    def statuses():
+        with replay.ReplayServer(error_rate=0.5, seed=7) as server:
+            return [server.respond('/2014.json')[0] for _ in range(20)]
+
+    first = statuses()
+    assert first == statuses()
+    assert set(first) == {200, 503}
+
+
+def test_latency():
+    with replay.serve(latency=0.05):
+        start = time.perf_counter()
+        pyergast.get_schedule(2014)
+        assert time.perf_counter() - start >= 0.05
+
+
+def test_aio(server):
+    pytest.importorskip('aiohttp')
+
+    async def fetch():
+        try:
+            return await aio.gather(*(aio.get_race_result(2014, race) for race in (1, 2)))
+        finally:
+            await aio.close()
+
+    first, second = asyncio.run(fetch())
+    assert (first['driverID'][0], second['driverID'][0]) == ('rosberg', 'hamilton')
@@ -0,0 +1,145 @@
+from pyergast import aio, metrics, pagination, pyergast, reference, replay, revalidate
+import asyncio
+import shutil
+import pytest
+
+
+@pytest.fixture
+def events():
+    revalidate.clear()
+    recorded = []
+    metrics.add_hook(recorded.append)
+    yield recorded
+    metrics.remove_hook(recorded.append)
+    revalidate.clear()
+
+
+@pytest.fixture
+def server(events):
+    reference.clear()
+    with replay.serve() as server:
+        yield server
+    reference.clear()
+
+
+def statuses(events):
+    return [event['status'] for event in events if event['kind'] == 'request']
+
+
+def test_conditional_headers():
+    revalidate.clear()
+    url = 'http://ergast.com/api/f1/current/last/results.json'
+    assert revalidate.conditional(url) == ({}, None)
+    payload = {'MRData': {}}
+    revalidate.store(url, {'ETag': '"abc"', 'Last-Modified': 'Sun, 16 Mar 2014 08:00:00 GMT'}, payload)
+    headers, stored = revalidate.conditional('HTTP://Ergast.com/api/f1/current/last/results.json/')
+    assert headers == {'If-None-Match': '"abc"', 'If-Modified-Since': 'Sun, 16 Mar 2014 08:00:00 GMT'}
+    assert stored is payload and revalidate.stored(payload)
+    # Completed seasons never change, and responses without validators cannot be revalidated
+    revalidate.store('http://ergast.com/api/f1/2014.json', {'ETag': '"abc"'}, {})
+    revalidate.store('http://ergast.com/api/f1/current.json', {}, {})
+    assert revalidate.conditional('http://ergast.com/api/f1/2014.json') == ({}, None)
+    assert revalidate.conditional('http://ergast.com/api/f1/current.json') == ({}, None)
+    revalidate.clear()
+    assert not revalidate.stored(payload)
+
+
+def test_max_entries():
+    defaults = revalidate.configure()
+    revalidate.configure(max_entries=2)
+    try:
+        for race in (1, 2, 3):
+            revalidate.store('http://ergast.com/api/f1/current/{}/results.json'.format(race), {'ETag': '"a"'}, {})
+        assert revalidate.conditional('http://ergast.com/api/f1/current/1/results.json') == ({}, None)
+        assert revalidate.conditional('http://ergast.com/api/f1/current/3/results.json')[0]
+    finally:
+        revalidate.configure(**defaults)
+        revalidate.clear()
+
+
+def test_not_modified_reuses_frame(server, events):
+    first = pyergast.get_race_result()
+    first.loc[0, 'driverID'] = 'rosberg'
+    second = pyergast.get_race_result()
+    assert statuses(events) == [200, 304]
+    assert [event['function'] for event in events if event['kind'] == 'normalize'] == ['race_result']
+    # Every call gets its own copy of the frame
+    assert second['driverID'][0] == 'hamilton' and second is not first
+    assert pyergast.get_race_result(output='records')[0]['driverID'] == 'hamilton'
+    assert len(server.requests) == 3
+
+
+def test_completed_seasons_are_not_revalidated(server, events):
+    pyergast.get_race_result(2014, 1)
+    pyergast.get_race_result(2014, 1)
+    assert statuses(events) == [200, 200]
+
+
+def test_changed_response(events, tmp_path):
+    directory = tmp_path / 'fixtures'
+    shutil.copytree(replay.FIXTURES, str(directory))
+    with replay.serve(str(directory)):
+        assert pyergast.get_schedule()['round'].tolist()[-1] == 2
+        schedule = directory / 'current.json'
+        schedule.write_text(schedule.read_text().replace('"round": "2"', '"round": "3"'))
+        assert pyergast.get_schedule()['round'].tolist()[-1] == 3
+        assert pyergast.get_schedule()['round'].tolist()[-1] == 3
+    assert statuses(events) == [200, 200, 304]
+
+
+def test_pages_are_left_untouched(server, events):
+    defaults = pagination.configure()
+    pagination.configure(limit=5)
+    try:
+        first = pyergast.driver_standings()
+        assert pyergast.driver_standings().equals(first)
+        assert pyergast.driver_standings().equals(first)
+    finally:
+        pagination.configure(**defaults)
+    assert set(statuses(events)[len(statuses(events)) // 3:]) == {304}
+    # The pages are unchanged, so is the payload merged from them, and the frame is built once
+    assert [event['function'] for event in events if event['kind'] == 'normalize'] == ['driver_standings']
+
+
+def test_merged_pages():
+    revalidate.clear()
+    pages = [{'MRData': {'page': page}} for page in (1, 2)]
+    for page, etag in zip(pages, ('"a"', '"b"')):
+        revalidate.store('http://ergast.com/api/f1/current.json?offset={}'.format(page['MRData']['page']),
+                         {'ETag': etag}, page)
+    first = revalidate.merged(pages, lambda pages: {'pages': len(pages)})
+    assert revalidate.merged(pages, lambda pages: {'pages': len(pages)}) is first and revalidate.stored(first)
+    # A page that changed gives a new merge, and pages that are not stored are merged every time
+    revalidate.store('http://ergast.com/api/f1/current.json?offset=2', {'ETag': '"c"'}, pages[1])
+    assert revalidate.merged(pages, lambda pages: {'pages': len(pages)}) is not first
+    unstored = [{}, {}]
+    assert revalidate.merged(unstored, lambda pages: {}) is not revalidate.merged(unstored, lambda pages: {})
+    revalidate.clear()
+    assert not revalidate.stored(first)
+
+
+def test_disabled(server, events):
+    defaults = revalidate.configure()
+    revalidate.configure(enabled=False)
+    try:
+        pyergast.get_race_result()
+        pyergast.get_race_result()
+    finally:
+        revalidate.configure(**defaults)
+    assert statuses(events) == [200, 200]
+
+
+def test_aio_not_modified(server, events):
+    pytest.importorskip('aiohttp')
+
+    async def fetch():
+        try:
+            first = await aio.get_race_result()
+            return first, await asyncio.gather(*(aio.get_race_result() for _ in range(2)))
+        finally:
+            await aio.close()
+
+    first, (second, third) = asyncio.run(fetch())
+    assert first.equals(second) and second.equals(third)
+    assert statuses(events) == [200, 304, 304]
+    assert len(server.requests) == 2
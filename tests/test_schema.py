@@ -0,0 +1,126 @@
+from pyergast import bulk, pyergast, reference, replay, schema
+import datetime
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def server():
+    reference.clear()
+    with replay.serve() as server:
+        yield server
+    reference.clear()
+
+
+def test_milliseconds():
+    values = ['1:32.478', '1:32:58.710', '22.190', '', None, float('nan')]
+    assert schema.milliseconds(values).tolist() == [92478, 5578710, 22190, pd.NA, pd.NA, pd.NA]
+    assert schema.milliseconds(pd.Series([None, None])).dtype == 'Int64'
+    assert schema.milliseconds([]).empty
+
+
+def test_apply():
+    frame = pd.DataFrame({'season': ['2014', '2014'], 'round': ['1', '1'], 'position': ['1', '2'],
+                          'points': ['25', '0.5'], 'grid': ['1', None], 'driverID': ['rosberg', 'hamilton'],
+                          'driver': ['Nico Rosberg', 'Lewis Hamilton'], 'Time': ['5578710', None]})
+    typed = schema.apply(frame, 'results')
+    assert typed['season'].dtype == 'int64'
+    assert typed['position'].dtype == 'Int64' and typed['grid'].isna().tolist() == [False, True]
+    assert typed['points'].tolist() == [25, 0.5]
+    assert isinstance(typed['driverID'].dtype, pd.CategoricalDtype)
+    assert typed['Time'][0] == pd.Timedelta(milliseconds=5578710) and pd.isna(typed['Time'][1])
+    # Applying a schema again changes nothing
+    pd.testing.assert_frame_equal(schema.apply(typed, 'results'), typed)
+
+
+def test_apply_durations_and_dates():
+    qualifying = schema.apply(pd.DataFrame({'Q1': ['1:44.231', ''], 'Q3': [None, None]}), 'qualifying')
+    assert qualifying['Q1'][0] == pd.Timedelta(minutes=1, seconds=44.231)
+    assert qualifying['Q3'].isna().all()
+    schedule = schema.apply(pd.DataFrame({'date': ['2014-03-16'], 'time': ['06:00:00Z']}), 'schedule')
+    assert schedule['date'][0] == pd.Timestamp('2014-03-16') and schedule['time'][0] == '06:00:00Z'
+
+
+def test_records():
+    data = {'season': ['2014', '2014'], 'position': ['1', None], 'points': ['25', 'x'],
+            'driverID': ['rosberg', float('nan')], 'Time': ['5578710', None]}
+    assert schema.records(data, 'results') == [
+        {'season': 2014, 'position': 1, 'points': 25.0, 'driverID': 'rosberg',
+         'Time': datetime.timedelta(milliseconds=5578710)},
+        {'season': 2014, 'position': None, 'points': None, 'driverID': None, 'Time': None}]
+    qualifying = schema.records({'Q1': ['1:44.231', ''], 'date': ['2014-03-16', None]}, 'qualifying')
+    assert qualifying[0]['Q1'] == datetime.timedelta(minutes=1, seconds=44.231) and qualifying[1]['Q1'] is None
+    assert schema.records({'date': ['2014-03-16']}, 'schedule') == [{'date': datetime.date(2014, 3, 16)}]
+    assert schema.records({'milliseconds': ['1:32.478']}, 'laps') == [{'milliseconds': 92478}]
+    assert schema.records({}, 'laps') == []
+
+
+def test_records_match_frames():
+    data = {'season': ['2014'], 'position': ['3'], 'points': ['0.5'], 'Time': ['5578710']}
+    frame = schema.apply(pd.DataFrame(data), 'results')
+    assert frame.to_dict('records') == schema.records(data, 'results')
+
+
+def test_fan_out_keeps_categories():
+    def fetch(season, race):
+        return schema.apply(pd.DataFrame({'driverID': ['driver{}'.format(race)]}), 'results')
+    result = bulk.fan_out(fetch, [(2014, 1), (2014, 2)])
+    assert isinstance(result['driverID'].dtype, pd.CategoricalDtype)
+    assert result['driverID'].tolist() == ['driver1', 'driver2']
+
+
+def test_fan_out_records():
+    def fetch(season, race):
+        return [{'driverID': 'driver{}'.format(race)}]
+    result = bulk.fan_out(fetch, [(2014, 1), (2014, 2)], output='records')
+    assert result == [{'season': 2014, 'round': 1, 'driverID': 'driver1'},
+                      {'season': 2014, 'round': 2, 'driverID': 'driver2'}]
+
+
+def test_arrow():
+    pa = pytest.importorskip('pyarrow')
+    data = {'season': ['2014', '2014'], 'position': ['1', None], 'driverID': ['rosberg', 'rosberg'],
+            'Time': ['5578710', None], 'url': [None, None]}
+    table = schema.arrow(data, 'results')
+    assert table.schema.types == [pa.int64(), pa.int64(), pa.dictionary(pa.int32(), pa.string()),
+                                  pa.duration('ms'), pa.string()]
+    assert table['driverID'].chunk(0).dictionary.to_pylist() == ['rosberg']
+    assert table.to_pylist() == schema.records(data, 'results')
+    assert schema.arrow({'date': ['2014-03-16']}, 'schedule')['date'].type == pa.date32()
+    assert schema.arrow({}, 'laps').num_rows == 0
+
+
+def test_arrow_matches_frames(server):
+    pytest.importorskip('pyarrow')
+    for query in (lambda **kwargs: pyergast.get_race_result(2014, 1, **kwargs),
+                  lambda **kwargs: pyergast.get_lap_times(2014, 1, **kwargs),
+                  lambda **kwargs: pyergast.get_schedule(2014, **kwargs)):
+        frame, table = query(), query(output='arrow')
+        assert table.column_names == frame.columns.tolist()
+        assert table.to_pylist() == query(output='records')
+
+
+def test_fan_out_arrow():
+    pa = pytest.importorskip('pyarrow')
+
+    def fetch(season, race):
+        data = {'driverID': ['driver{}'.format(race)]}
+        if race == 2:
+            data['Q3'] = ['1:32.478']
+        return schema.arrow(data, 'qualifying')
+    table = bulk.fan_out(fetch, [(2014, 1), (2014, 2)], output='arrow')
+    assert table.column_names == ['season', 'round', 'driverID', 'Q3']
+    assert table.to_pylist() == [
+        {'season': 2014, 'round': 1, 'driverID': 'driver1', 'Q3': None},
+        {'season': 2014, 'round': 2, 'driverID': 'driver2', 'Q3': datetime.timedelta(seconds=92.478)}]
+    assert table['driverID'].chunk(0).dictionary.to_pylist() == ['driver1', 'driver2']
+    assert bulk.fan_out(fetch, [], output='arrow').column_names == ['season', 'round']
+    assert isinstance(table, pa.Table)
+
+
+def test_polars(server):
+    pl = pytest.importorskip('polars')
+    frame = pyergast.get_race_results(2014, rounds=[1, 2], output='polars')
+    assert isinstance(frame, pl.DataFrame)
+    assert frame['driverID'].dtype == pl.Categorical
+    assert len(frame) == len(pyergast.get_race_results(2014, rounds=[1, 2]))
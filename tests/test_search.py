@@ -0,0 +1,61 @@
+from pyergast import pyergast, reference, search
+import pandas as pd
+import pytest
+
+DRIVERS = pd.DataFrame({
+    'driverId': ['collins', 'gutierrez', 'hamilton', 'raikkonen', 'peter_walker', 'jolyon_palmer'],
+    'code': [None, 'GUT', 'HAM', 'RAI', None, 'PAL'],
+    'givenName': ['Peter', 'Esteban', 'Lewis', 'Kimi', 'Peter', 'Jolyon'],
+    'familyName': ['Collins', 'Gutiérrez', 'Hamilton', 'Räikkönen', 'Walker', 'Palmer'],
+})
+
+
+@pytest.fixture(autouse=True)
+def drivers_table():
+    original = reference._tables['drivers']
+    reference.register('drivers', DRIVERS.copy)
+    yield
+    reference._tables['drivers'] = original
+
+
+def test_fold():
+    assert search.fold('Räikkönen') == 'raikkonen'
+    assert search.fold('Lotus-Climax') == 'lotus climax'
+
+
+def test_contains():
+    index = search.index('drivers')
+    assert index.contains('GUTIÉRREZ') == {1}
+    assert index.contains('peter') == {0, 4}
+    assert index.contains('peter', ['driverId']) == {4}
+
+
+def test_index_rebuilt_on_refresh():
+    index = search.index('drivers')
+    assert search.index('drivers') is index
+    reference.refresh('drivers')
+    assert search.index('drivers') is not index
+
+
+def test_find_driverid_accents():
+    actual = pyergast.find_driverid('Kimi', 'Räikkönen')['driverId'].tolist()
+    assert actual == ['raikkonen']
+
+
+def test_resolve_many():
+    actual = pyergast.resolve_many(['Kimi Raikkonen', 'Gutierrez', 'Hamiltn', 'Nobody'])
+    assert actual['id'][:3].tolist() == ['raikkonen', 'gutierrez', 'hamilton']
+    assert actual['id'].isna()[3]
+    assert actual['score'][0] == 1.0
+
+
+def test_records(monkeypatch):
+    monkeypatch.setitem(reference._tables, 'drivers.records', reference._tables['drivers.records'])
+    reference.register('drivers.records', lambda: DRIVERS.to_dict('records'))
+    # Served from the records table, as the frame table is not loaded
+    assert pyergast.find_driverid('Kimi', 'Räikkönen', output='records') == [DRIVERS.to_dict('records')[3]]
+    assert pyergast.resolve_many(['Hamiltn'], output='records')[0]['id'] == 'hamilton'
+    # And from the frame once it is, with the same plain values
+    search.index('drivers')
+    assert pyergast.find_driverid('Jolyon', 'Palmer', output='records') == [DRIVERS.to_dict('records')[5]]
+    assert pyergast.find_driverid('Peter', 'Collins', output='records')[0]['code'] is None
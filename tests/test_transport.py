@@ -0,0 +1,150 @@
+from pyergast import metrics, ratelimit, transport
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import email.utils
+import json
+import pytest
+import threading
+import time
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+
+    @property
+    def content(self):
+        return json.dumps(self.payload).encode()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    defaults = transport.configure()
+    yield
+    transport.configure(**defaults)
+
+
+def test_session_is_shared():
+    assert transport.get_session() is transport.get_session()
+
+
+def test_configure_resets_session():
+    session = transport.get_session()
+    transport.configure(pool_size=3)
+    adapter = transport.get_session().get_adapter('http://ergast.com')
+    assert transport.get_session() is not session
+    assert adapter._pool_maxsize == 3
+
+
+def test_session_does_not_retry():
+    # Retries are sent by `get_json`, through the rate limiter
+    retry = transport.get_session().get_adapter('https://ergast.com').max_retries
+    assert retry.total == 0 and not retry.status_forcelist
+
+
+def test_retry_delay():
+    assert transport.retry_delay(0, None, 0.5) == 0.5
+    assert transport.retry_delay(3, None, 0.5) == 4
+    assert transport.retry_delay(0, '7', 0.5) == 7
+    assert transport.retry_delay(0, 'Sun, 16 Mar 2014 08:00:00 GMT', 0.5) == 0.5
+    assert transport.retry_delay(0, 'soon', 0.5) == 0.5
+    later = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    assert 25 < transport.retry_delay(0, email.utils.format_datetime(later, usegmt=True), 0.5) <= 30
+
+
+def test_retries_go_through_the_limiter(monkeypatch):
+    transport.configure(max_retries=7, backoff_factor=2)
+    responses = [FakeResponse(429, headers={'Retry-After': '5'}), FakeResponse(503), FakeResponse(200, {'MRData': {}})]
+    acquired, slept, events = [], [], []
+    monkeypatch.setattr(transport.get_session(), 'get', lambda url, timeout, stream, headers=None: responses.pop(0))
+    monkeypatch.setattr(ratelimit, 'acquire', lambda: acquired.append(1) or 0.25)
+    monkeypatch.setattr(transport.time, 'sleep', slept.append)
+    metrics.add_hook(events.append)
+    try:
+        assert transport.get_json('http://ergast.com/api/f1/1950.json') == {'MRData': {}}
+    finally:
+        metrics.remove_hook(events.append)
+    assert len(acquired) == 3
+    assert slept == [5, 4]
+    request, = [event for event in events if event['kind'] == 'request']
+    assert (request['status'], request['retries'], request['wait']) == (200, 2, 0.75)
+
+
+def test_retries_give_up(monkeypatch):
+    transport.configure(max_retries=2, backoff_factor=0)
+    calls = []
+    monkeypatch.setattr(transport.get_session(), 'get',
+                        lambda url, timeout, stream, headers=None: calls.append(url) or FakeResponse(500))
+    with pytest.raises(AssertionError):
+        transport.get_json('http://ergast.com/api/f1/1950.json')
+    assert len(calls) == 3
+
+
+def test_get_json(monkeypatch):
+    calls = []
+
+    def fake_get(url, timeout, stream, headers=None):
+        calls.append((url, timeout))
+        return FakeResponse(200, {'MRData': {}})
+
+    monkeypatch.setattr(transport.get_session(), 'get', fake_get)
+    assert transport.get_json('http://ergast.com/api/f1/drivers.json') == {'MRData': {}}
+    assert calls == [('http://ergast.com/api/f1/drivers.json', 30)]
+
+
+def test_get_json_assert(monkeypatch):
+    monkeypatch.setattr(transport.get_session(), 'get', lambda url, timeout, stream, headers=None: FakeResponse(400))
+    with pytest.raises(AssertionError):
+        transport.get_json('http://ergast.com/api/f1/1900.json')
+
+
+def test_concurrent_requests_are_coalesced(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def slow_get(url, timeout, stream, headers=None):
+        calls.append(url)
+        release.wait(5)
+        return FakeResponse(200, {'MRData': {'total': '1'}})
+
+    monkeypatch.setattr(transport.get_session(), 'get', slow_get)
+    url = 'http://ergast.com/api/f1/current/last/results.json'
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(transport.get_json, url) for _ in range(8)]
+        while not calls or transport._flights[url].waiters < 7:
+            time.sleep(0.01)
+        release.set()
+        payloads = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert all(payload == {'MRData': {'total': '1'}} for payload in payloads)
+    # Every caller gets its own copy, which it is free to change
+    assert len({id(payload) for payload in payloads}) == 8
+    assert transport._flights == {}
+
+
+def test_coalesced_failure_is_shared(monkeypatch):
+    transport.configure(max_retries=0)
+    calls = []
+    release = threading.Event()
+
+    def failing_get(url, timeout, stream, headers=None):
+        calls.append(url)
+        release.wait(5)
+        return FakeResponse(500)
+
+    monkeypatch.setattr(transport.get_session(), 'get', failing_get)
+    url = 'http://ergast.com/api/f1/1900.json'
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(transport.get_json, url) for _ in range(2)]
+        while not calls or transport._flights[url].waiters < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(AssertionError):
+                future.result()
+    assert len(calls) == 1
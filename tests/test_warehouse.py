@@ -0,0 +1,164 @@
+from pyergast import pyergast, schema, warehouse
+import datetime
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+DRIVERS = pd.DataFrame({'driverId': ['alonso', 'hamilton', 'rosberg'],
+                        'givenName': ['Fernando', 'Lewis', 'Nico'],
+                        'familyName': ['Alonso', 'Hamilton', 'Rosberg']})
+CONSTRUCTORS = pd.DataFrame({'constructorId': ['ferrari', 'mercedes'], 'name': ['Ferrari', 'Mercedes']})
+CIRCUITS = pd.DataFrame({'circuitId': ['albert_park', 'bahrain', 'monza'],
+                         'circuitName': ['Albert Park', 'Bahrain', 'Monza']})
+SCHEDULE = pd.DataFrame({'season': ['2014', '2014'], 'round': ['1', '2'], 'raceName': ['Australia', 'Bahrain'],
+                         'circuitID': ['albert_park', 'bahrain'], 'date': ['2014-03-16', '2014-04-06'],
+                         'time': ['06:00:00Z', '15:00:00Z']})
+RESULTS = pd.DataFrame({'season': [2014] * 4, 'round': [1, 1, 2, 2],
+                        'position': [1, 2, 1, 2],
+                        'driverID': ['rosberg', 'alonso', 'hamilton', 'rosberg'],
+                        'constructorID': ['mercedes', 'ferrari', 'mercedes', 'mercedes'],
+                        'Time': pd.to_timedelta([5392556, None, 5834911, None], unit='ms')})
+QUALIFYING = pd.DataFrame({'season': [2014] * 2, 'round': [1, 2], 'position': ['1', '1'],
+                           'driverID': ['hamilton', 'rosberg'], 'Q1': ['1:44.231', '1:34.171'],
+                           'Q2': ['1:42.890', None]})
+
+
+def fake_results(year, race=None):
+    if race is None:
+        return RESULTS
+    rows = RESULTS[RESULTS['round'] == race]
+    return rows.drop(columns=['season', 'round']).reset_index(drop=True)
+
+
+def fake_qualifying(year, race=None):
+    if race is None:
+        return QUALIFYING
+    rows = QUALIFYING[QUALIFYING['round'] == race]
+    return rows.drop(columns=['season', 'round']).reset_index(drop=True)
+
+
+def fake_lap_times(year, race):
+    return pd.DataFrame({'driverID': ['hamilton', 'rosberg', 'hamilton'], 'lap': [1, 1, 2],
+                         'position': [1, 2, 1], 'milliseconds': [95123, 95870, 92478 + race]})
+
+
+def fake_pit_stops(year, race):
+    return pd.DataFrame({'driverID': ['rosberg'], 'stop': [1], 'lap': [10 + race],
+                         'time': pd.to_timedelta(['16:28:48']), 'milliseconds': [21000]})
+
+
+def fake_driver_standings(year, race):
+    return pd.DataFrame({'position': [1, 2], 'points': [25.0 * race, 18.0],
+                         'driverID': ['rosberg', 'hamilton'], 'driver': ['Nico Rosberg', 'Lewis Hamilton']})
+
+
+def fake_constructor_standings(year, race):
+    return pd.DataFrame({'position': [1], 'points': [43.0 * race], 'constructorID': ['mercedes'],
+                         'name': ['Mercedes']})
+
+
+def fake_api(m, schedule=SCHEDULE):
+    m.setattr(pyergast, 'get_drivers', lambda: DRIVERS)
+    m.setattr(pyergast, 'get_constructors', lambda: CONSTRUCTORS)
+    m.setattr(pyergast, 'get_circuits', lambda: CIRCUITS)
+    m.setattr(pyergast, 'get_schedule', lambda year=None: schedule)
+    m.setattr(pyergast, 'get_race_result', fake_results)
+    m.setattr(pyergast, 'get_qualifying_result', fake_qualifying)
+    m.setattr(pyergast, 'get_lap_times', fake_lap_times)
+    m.setattr(pyergast, 'get_pit_stops', fake_pit_stops)
+    m.setattr(pyergast, 'driver_standings', fake_driver_standings)
+    m.setattr(pyergast, 'constructor_standings', fake_constructor_standings)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    with monkeypatch.context() as m:
+        fake_api(m)
+        warehouse.sync(str(tmp_path), years=[2014])
+    store = warehouse.use(str(tmp_path))
+    yield store
+    pyergast.use_source(None)
+
+
+def test_layout(store, tmp_path):
+    assert (tmp_path / 'results' / 'season=2014' / 'round=2' / 'part.parquet').exists()
+    assert store.partitions('results') == [(2014, 1), (2014, 2)]
+    assert store.partitions('schedule') == [(2014, None)]
+
+
+def test_race_result(store):
+    expected = RESULTS[RESULTS['round'] == 2].drop(columns=['season', 'round']).reset_index(drop=True)
+    expected = schema.apply(expected, 'results')
+    pd.testing.assert_frame_equal(pyergast.get_race_result(), expected, check_dtype=False)
+    assert pyergast.get_race_result(2014, 1)['Time'][0] == pd.Timedelta(milliseconds=5392556)
+    assert isinstance(pyergast.get_race_result(2014)['driverID'].dtype, pd.CategoricalDtype)
+    assert pyergast.get_race_result(2014).shape == (4, 6)
+
+
+def test_qualifying_drops_missing_sessions(store):
+    assert 'Q2' in pyergast.get_qualifying_result(2014, 1)
+    assert 'Q2' not in pyergast.get_qualifying_result(2014, 2)
+
+
+def test_lap_times(store):
+    laps = pyergast.get_lap_times(2014, 2)
+    assert laps['milliseconds'].tolist() == [95123, 95870, 92480]
+    assert str(laps['milliseconds'].dtype) == 'Int32' and str(laps['lap'].dtype) == 'int16'
+    assert pyergast.get_lap_times(2014, 1, 'rosberg')['lap'].tolist() == [1]
+
+
+def test_pit_stops(store):
+    stops = pyergast.get_pit_stops(2014, 2)
+    assert stops['lap'].tolist() == [12]
+    assert stops.loc[0, 'time'] == pd.Timedelta(hours=16, minutes=28, seconds=48)
+    assert pyergast.get_pit_stops(2014, 2, 'hamilton').empty
+
+
+def test_participants(store):
+    assert pyergast.get_drivers(2014, 1)['driverId'].tolist() == ['alonso', 'rosberg']
+    assert pyergast.get_circuits(2014, 2)['circuitId'].tolist() == ['bahrain']
+    assert pyergast.find_driverid('nico', 'rosberg')['driverId'].tolist() == ['rosberg']
+
+
+def test_standings(store):
+    assert pyergast.driver_standings(2014, 1)['points'][0] == 25
+    assert pyergast.driver_standings()['points'][0] == 50
+    assert pyergast.query_driver('rosberg')[['season', 'round', 'points']].values.tolist() == [[2014, 2, 50]]
+    assert pyergast.query_constructor('mercedes')['constructor'].tolist() == ['Mercedes']
+
+
+def test_sync_records_marks(store):
+    assert store.marks()['results'] == (2014, 2)
+    assert store.marks()['constructor_standings'] == (2014, 2)
+
+
+def test_update_fetches_new_rounds(store, monkeypatch):
+    pyergast.use_source(None)
+    schedule = pd.concat([SCHEDULE, pd.DataFrame({'season': ['2014'] * 2, 'round': ['3', '4'],
+                                                  'raceName': ['China', 'Spain'], 'circuitID': ['shanghai', 'catalunya'],
+                                                  'date': ['2014-04-20', '2014-05-11'], 'time': ['07:00:00Z', '12:00:00Z']})],
+                         ignore_index=True)
+    third = pd.DataFrame({'season': [2014], 'round': [3], 'position': [1], 'driverID': ['kobayashi'],
+                          'constructorID': ['caterham'], 'Time': [pd.NaT]})
+    fetched_rounds = []
+    with monkeypatch.context() as m:
+        fake_api(m, schedule)
+        m.setitem(globals(), 'RESULTS', pd.concat([RESULTS, third], ignore_index=True))
+        m.setattr(pyergast, 'get_drivers', lambda: fetched_rounds.append('drivers') or DRIVERS)
+        fetched = warehouse.update(store.path, now=datetime.datetime(2014, 4, 25))
+    assert fetched['results'] == [(2014, 3)]
+    assert fetched['driver_standings'] == [(2014, 3)]
+    assert fetched['laps'] == [(2014, 3)]
+    assert fetched['pit_stops'] == [(2014, 3)]
+    assert 'qualifying' not in fetched
+    assert store.marks()['results'] == (2014, 3)
+    assert store.marks()['qualifying'] == (2014, 2)
+    assert fetched_rounds == ['drivers']
+    assert store.read('results', 2014, 3)['driverID'].tolist() == ['kobayashi']
+
+
+def test_finished_rounds():
+    now = datetime.datetime(2014, 4, 6, 17)
+    assert warehouse.finished_rounds(SCHEDULE, now) == [1]
+    assert warehouse.finished_rounds(SCHEDULE, now + datetime.timedelta(hours=2)) == [1, 2]